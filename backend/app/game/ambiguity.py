@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Wordlist used when WORDLIST is not set, if the system has one
+SYSTEM_WORDLIST = '/usr/share/dict/words'
+# Trie node key holding the word that ends at that node
+END = '$'
+
+
+@lru_cache(maxsize=None)
+def grid_neighbors(rows: int, cols: int) -> Tuple[Tuple[int, ...], ...]:
+    """The 8-neighbor cell indices (r * cols + c) of every cell, computed once per shape."""
+    neighbors = []
+    for r in range(rows):
+        for c in range(cols):
+            neighbors.append(tuple(
+                nr * cols + nc
+                for nr in range(max(r - 1, 0), min(r + 2, rows))
+                for nc in range(max(c - 1, 0), min(c + 2, cols))
+                if (nr, nc) != (r, c)
+            ))
+    return tuple(neighbors)
+
+
+def build_trie(words: Iterable[str]) -> Dict:
+    """Nested dicts keyed by letter, with END holding the word that ends at a node."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for letter in word.lower():
+            node = node.setdefault(letter, {})
+        node[END] = word.lower()
+    return trie
+
+
+def load_wordlist(path: Optional[str] = None, min_length: int = 4) -> List[str]:
+    """
+    Read a wordlist, one word per line: path, else the WORDLIST environment
+    variable, else the system dictionary. Keeps lowercase a-z words of at least
+    min_length letters, so proper nouns and possessives are skipped. Returns an
+    empty list if no wordlist is found.
+    """
+    path = path or os.getenv("WORDLIST") or SYSTEM_WORDLIST
+    if not os.path.exists(path):
+        logger.warning(f"No wordlist at {path}, only theme words will be checked")
+        return []
+    with open(path) as f:
+        return [word for word in (line.strip() for line in f)
+                if len(word) >= min_length and word.isascii() and word.isalpha() and word.islower()]
+
+
+class BoardAnalyzer:
+    """
+    Finds unintended words on a finished board.
+
+    The dictionary is built into a trie once. analyze() starts a DFS at every
+    cell and follows 8-neighbors only while the letters so far are a prefix of
+    some word, tracking visited cells in an int bitmask. It reports theme words
+    that can also be spelled along a path other than their own (alternate
+    spellings, which make a board ambiguous) and dictionary words that are not
+    theme words (stray words).
+    """
+
+    def __init__(self, words: Iterable[str] = (), min_length: int = 4):
+        self.min_length = min_length
+        self.trie = build_trie(words)
+
+    def analyze(self, board: List[List[str]], placement_info: dict) -> dict:
+        """
+        Scan a generate_board result. Theme words go in a small per-board trie
+        that is walked before the dictionary one. Returns
+        {'alternate_paths': [...], 'stray_words': [...]}, each a list of
+        {'word': ..., 'path': [(row, col), ...]}, with one path per stray word.
+        """
+        rows, cols = len(board), len(board[0])
+        letters = [letter.lower() for row in board for letter in row]
+        neighbors = grid_neighbors(rows, cols)
+
+        placed = {placement_info['special_word']['word'].lower(): placement_info['special_word']['path']}
+        for entry in placement_info['words']:
+            placed[entry['word'].lower()] = entry['path']
+        theme_trie = build_trie(placed)
+        own_paths = {word: tuple(r * cols + c for (r, c) in path) for word, path in placed.items()}
+
+        alternates: List[Tuple[str, Tuple[int, ...]]] = []
+        found: Dict[str, Tuple[int, ...]] = {}
+        path: List[int] = []
+
+        def dfs(cell: int, node: Dict, visited: int, record):
+            for neighbor in neighbors[cell]:
+                if visited >> neighbor & 1:
+                    continue
+                child = node.get(letters[neighbor])
+                if child is None:
+                    continue
+                path.append(neighbor)
+                word = child.get(END)
+                if word is not None:
+                    record(word)
+                dfs(neighbor, child, visited | 1 << neighbor, record)
+                path.pop()
+
+        def record_theme_word(word: str):
+            # A word read backwards along its own path is the same answer
+            found_path = tuple(path)
+            if found_path != own_paths[word] and found_path[::-1] != own_paths[word]:
+                alternates.append((word, found_path))
+
+        def record_word(word: str):
+            if word not in found:
+                found[word] = tuple(path)
+
+        # The theme trie is tiny, so walking it separately keeps the dictionary walk lean
+        for trie, record in ((theme_trie, record_theme_word), (self.trie, record_word)):
+            for cell, letter in enumerate(letters):
+                node = trie.get(letter)
+                if node is not None:
+                    path.append(cell)
+                    dfs(cell, node, 1 << cell, record)
+                    path.pop()
+        strays = {word: cells for word, cells in found.items()
+                  if word not in own_paths and len(word) >= self.min_length}
+
+        def cells(found: Tuple[int, ...]) -> List[Tuple[int, int]]:
+            return [divmod(cell, cols) for cell in found]
+
+        return {
+            'alternate_paths': [{'word': word, 'path': cells(found)} for word, found in alternates],
+            'stray_words': [{'word': word, 'path': cells(found)} for word, found in strays.items()]
+        }
@@ -0,0 +1,197 @@
+"""
+Offline partition atlas: a library of pre-solved partitions in one binary file.
+
+Build it once with
+
+    python -m app.game.atlas partitions.atlas --profiles-per-size 20 --per-profile 64
+
+and point PARTITION_ATLAS at it. At runtime the file is memory-mapped, so every
+worker process shares the same page-cached records and nothing is parsed but
+the small index.
+
+File layout (little-endian):
+    header   HEADER: magic, version, number of index entries
+    index    per length key: INDEX_ENTRY (key length, rows, cols, record count,
+             offset of the first record), then the key's lengths, one byte each
+    records  fixed size per key, rows * cols bytes: the cell index (r * cols + c)
+             of every path cell, path after path in key order (longest first)
+
+Records store cells in path order rather than a grid of worm ids, since a grid
+alone does not say in which order a worm's cells spell its word.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import mmap
+import random
+import struct
+
+from .board_generator import BoardGenerator
+from .partition_cache import LengthKey, Path, unsort_partition
+from .symmetry import symmetries_for, transform_paths
+
+MAGIC = b'PATL'
+VERSION = 1
+HEADER = struct.Struct('<4sHxxI')
+INDEX_ENTRY = struct.Struct('<BBBxIQ')
+
+
+class PartitionAtlas:
+    """Read-only, memory-mapped view of an atlas file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        # length key -> (rows, cols, record count, offset of first record)
+        self._index: Dict[LengthKey, Tuple[int, int, int, int]] = self._read_index()
+
+    def _read_index(self) -> Dict[LengthKey, Tuple[int, int, int, int]]:
+        magic, version, entries = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} partition atlas")
+        index = {}
+        position = HEADER.size
+        for _ in range(entries):
+            key_length, rows, cols, count, offset = INDEX_ENTRY.unpack_from(self._mmap, position)
+            position += INDEX_ENTRY.size
+            key = tuple(self._mmap[position:position + key_length])
+            position += key_length
+            index[key] = (rows, cols, count, offset)
+        return index
+
+    def __len__(self) -> int:
+        return sum(count for _, _, count, _ in self._index.values())
+
+    def keys(self) -> Iterable[LengthKey]:
+        return self._index.keys()
+
+    def record(self, key: LengthKey, i: int) -> List[Path]:
+        """Decode record i of key into paths in key order, reading straight from the mapping."""
+        rows, cols, count, offset = self._index[key]
+        size = rows * cols
+        cells = self._view[offset + i * size:offset + (i + 1) * size]
+        paths = []
+        start = 0
+        for length in key:
+            paths.append([divmod(cell, cols) for cell in cells[start:start + length]])
+            start += length
+        return paths
+
+    def sample(self, lengths: List[int]) -> Optional[Tuple[List[List[int]], dict]]:
+        """
+        Pick a random stored partition for lengths, in O(1), as a
+        generate_board_with_lengths result. Returns None if the atlas has no
+        partition for this length multiset.
+        """
+        key = tuple(sorted(lengths, reverse=True))
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        rows, cols, count, _ = entry
+        return unsort_partition(lengths, self.record(key, random.randrange(count)), rows, cols)
+
+    def close(self):
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    # Pickled as its path so process pool workers map the file themselves
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+
+def realistic_profile(size: int, rng: random.Random) -> LengthKey:
+    """
+    A length multiset summing to size that looks like a generated word set:
+    one special word of 8-15 letters plus 5-7 words of 3-8 letters (more words
+    when the board is too large for seven).
+    """
+    while True:
+        special = rng.randint(8, 15)
+        remaining = size - special
+        count = min(max(rng.randint(5, 7), -(-remaining // 8)), remaining // 3)
+        extra = remaining - 3 * count
+        if count < 1 or not 0 <= extra <= 5 * count:
+            continue
+        words = [3] * count
+        for _ in range(extra):
+            words[rng.choice([i for i, length in enumerate(words) if length < 8])] += 1
+        return tuple(sorted([special] + words, reverse=True))
+
+
+def _encode(paths: List[Path], cols: int) -> bytes:
+    return bytes(r * cols + c for path in paths for (r, c) in path)
+
+
+def solve_key(key: LengthKey, per_key: int, seed: int) -> List[bytes]:
+    """Solve key until per_key distinct records exist, counting every symmetry of each solve."""
+    random.seed(seed)
+    generator = BoardGenerator()
+    rows, cols = generator.valid_sizes[sum(key)]
+    records: Dict[bytes, None] = {}
+    solves = 0
+    while len(records) < per_key and solves < per_key:
+        _, placement_info = generator.generate_board_with_lengths(list(key))
+        solves += 1
+        for symmetry in symmetries_for(rows, cols):
+            records.setdefault(_encode(transform_paths(placement_info['paths'], symmetry, rows, cols), cols))
+    return list(records)[:per_key]
+
+
+def build_atlas(output: str, keys: Iterable[LengthKey], per_key: int, workers: Optional[int] = None,
+                seed: int = 0) -> int:
+    """Solve per_key partitions for every key and write the atlas file. Returns the record count."""
+    keys = sorted(set(keys))
+    sizes = BoardGenerator().valid_sizes
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        solved = list(executor.map(solve_key, keys, [per_key] * len(keys), [seed + i for i in range(len(keys))]))
+
+    index_size = sum(INDEX_ENTRY.size + len(key) for key in keys)
+    offset = HEADER.size + index_size
+    with open(output, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(keys)))
+        for key, records in zip(keys, solved):
+            rows, cols = sizes[sum(key)]
+            f.write(INDEX_ENTRY.pack(len(key), rows, cols, len(records), offset))
+            f.write(bytes(key))
+            offset += len(records) * rows * cols
+        for records in solved:
+            for record in records:
+                f.write(record)
+    return sum(len(records) for records in solved)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Precompute a partition atlas for BoardGenerator.")
+    parser.add_argument('output', help="atlas file to write")
+    parser.add_argument('--profiles-per-size', type=int, default=20,
+                        help="random realistic length multisets per board size")
+    parser.add_argument('--profiles', help="file with one JSON list of word lengths per line, e.g. from logs")
+    parser.add_argument('--per-profile', type=int, default=64, help="partitions stored per length multiset")
+    parser.add_argument('--workers', type=int, default=None, help="solver processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    sizes = BoardGenerator().valid_sizes
+    keys = {realistic_profile(size, rng) for size in sizes for _ in range(args.profiles_per_size)}
+    if args.profiles:
+        with open(args.profiles) as f:
+            for line in f:
+                if line.strip():
+                    lengths = json.loads(line)
+                    if sum(lengths) in sizes:
+                        keys.add(tuple(sorted(lengths, reverse=True)))
+
+    total = build_atlas(args.output, keys, args.per_profile, args.workers, args.seed)
+    print(f"Wrote {total} partitions for {len(keys)} length multisets to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
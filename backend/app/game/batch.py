@@ -0,0 +1,201 @@
+"""
+Bulk puzzle generation.
+
+Writes puzzle packs as JSONL, one finished game per line, in completion order:
+
+    python -m app.game.batch word_sets.jsonl pack.jsonl --workers 8
+
+Each input line is either a word set ({"theme": ..., "special_word": ...,
+"words": [...]}), a seed word ({"seed_word": "music"} or "music"), or null for
+an unseeded game. Seed words go through the LLM, so they need ANTHROPIC_API_KEY
+or --api-key, or through a local word-set corpus with --corpus. Only
+--concurrency inputs are in flight at a time, so memory stays flat no matter
+how large the pack is. With --difficulty every game also gets a "difficulty"
+score and level (see difficulty.py) for bucketing packs.
+With --validate finished games are checked in chunks (see validation.py) before
+they are written, and games that fail are written as errors instead. With
+--ambiguity-check boards that spell a theme word along a second path (see
+ambiguity.py) are regenerated, and any still ambiguous after the retries are
+written with "ambiguous": true.
+"""
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import os
+
+from .ambiguity import BoardAnalyzer, load_wordlist
+from .board_generator import BoardGenerator
+from .word_generator import WordGenerator, WordSource
+from .corpus import CorpusWordGenerator
+from .difficulty import score_board
+from .validation import validate_boards
+from . import worker_pool
+
+# Games validated together by generate_pack(validate=True)
+VALIDATE_CHUNK = 1024
+
+
+async def map_unordered(func: Callable[[Any], Awaitable[Any]], items: Iterable[Any],
+                        limit: int) -> AsyncIterator[Tuple[int, Any, Optional[Exception]]]:
+    """
+    Await func(item) for every item with at most limit running at once, and
+    yield (index, result, error) as each one finishes. Items are pulled from
+    the iterable lazily, only when a slot frees up. Work still in flight is
+    cancelled if the caller stops iterating early.
+    """
+    async def run(index, item):
+        try:
+            return index, await func(item), None
+        except Exception as e:
+            return index, None, e
+
+    items = enumerate(items)
+    pending = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < limit:
+                try:
+                    index, item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(run(index, item)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # The consumer stopped early (e.g. a /batch client went away): don't leave work running
+        for task in pending:
+            task.cancel()
+
+
+def make_game(word_set: Dict[str, Any], board: List[List[str]], placement_info: dict) -> Dict[str, Any]:
+    """A finished game in the /generate response shape."""
+    return {
+        'theme': word_set['theme'],
+        'special_word': word_set['special_word'],
+        'words': word_set['words'],
+        'board': board,
+        'placement_info': placement_info
+    }
+
+
+def read_items(path: str) -> Iterator[Any]:
+    """Lazily read pack inputs: word-set objects, seed words, or null."""
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if isinstance(item, dict) and 'special_word' not in item:
+                item = item.get('seed_word')
+            yield item
+
+
+async def generate_pack(items: Iterable[Any], output: str, executor,
+                        word_generator: Optional[WordSource] = None, concurrency: int = 16,
+                        difficulty: bool = False, validate: bool = False,
+                        analyzer: Optional[BoardAnalyzer] = None, ambiguity_retries: int = 3) -> Tuple[int, int]:
+    """
+    Generate a game for every item and append it to output as it completes.
+    Failures are written as {"index": i, "error": ...} lines. With validate,
+    games are held back and checked VALIDATE_CHUNK at a time. With an analyzer,
+    ambiguous boards are regenerated up to ambiguity_retries times and flagged
+    if they still are. Returns the number of games and of failures.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def build(item):
+        if isinstance(item, dict):
+            word_set = item
+        else:
+            if word_generator is None:
+                raise ValueError("Seed words need an LLM or corpus word generator")
+            word_set = await word_generator.agenerate_word_set(item)
+        for _ in range(ambiguity_retries + 1):
+            board, placement_info = await loop.run_in_executor(
+                executor, worker_pool.generate_board, word_set['special_word'], word_set['words']
+            )
+            if analyzer is None:
+                break
+            # Off the event loop, so the other games in flight keep going
+            report = await loop.run_in_executor(None, analyzer.analyze, board, placement_info)
+            if not report['alternate_paths']:
+                break
+        game = make_game(word_set, board, placement_info)
+        if analyzer is not None and report['alternate_paths']:
+            game['ambiguous'] = True
+        if difficulty:
+            game['difficulty'] = score_board(board, placement_info)
+        return game
+
+    games = failures = 0
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+
+    def write_chunk(f):
+        nonlocal games, failures
+        result = validate_boards([game['board'] for _, game in chunk],
+                                 [game['placement_info'] for _, game in chunk])
+        for i, (index, game) in enumerate(chunk):
+            if result.valid[i]:
+                games += 1
+                f.write(json.dumps({'index': index, **game}) + '\n')
+            else:
+                failures += 1
+                f.write(json.dumps({'index': index, 'error': f"Invalid board: {', '.join(result.errors(i))}"}) + '\n')
+        chunk.clear()
+
+    with open(output, 'w') as f:
+        async for index, game, error in map_unordered(build, items, concurrency):
+            if error is not None:
+                failures += 1
+                f.write(json.dumps({'index': index, 'error': str(error)}) + '\n')
+            elif validate:
+                chunk.append((index, game))
+                if len(chunk) >= VALIDATE_CHUNK:
+                    write_chunk(f)
+            else:
+                games += 1
+                f.write(json.dumps({'index': index, **game}) + '\n')
+        if chunk:
+            write_chunk(f)
+    return games, failures
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate a puzzle pack as JSONL.")
+    parser.add_argument('input', help="JSONL of word sets, seed words or nulls")
+    parser.add_argument('output', help="JSONL file to write games to")
+    parser.add_argument('--workers', type=int, default=None, help="board solver processes (default: CPU count)")
+    parser.add_argument('--concurrency', type=int, default=16, help="games in flight at once")
+    parser.add_argument('--api-key', default=os.getenv("ANTHROPIC_API_KEY"), help="LLM key for seed words")
+    parser.add_argument('--corpus', help="word-set JSONL to resolve seed words from instead of the LLM")
+    parser.add_argument('--difficulty', action='store_true', help="score every game's difficulty")
+    parser.add_argument('--validate', action='store_true', help="check every board before writing it")
+    parser.add_argument('--ambiguity-check', action='store_true',
+                        help="regenerate boards that spell a theme word along a second path (uses WORDLIST)")
+    parser.add_argument('--ambiguity-retries', type=int, default=3, help="regenerations of an ambiguous board")
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        word_generator = CorpusWordGenerator(args.corpus)
+    else:
+        word_generator = WordGenerator(api_key=args.api_key) if args.api_key else None
+    analyzer = BoardAnalyzer(load_wordlist()) if args.ambiguity_check else None
+    executor = worker_pool.create_board_pool(BoardGenerator(), args.workers)
+    try:
+        games, failures = asyncio.run(
+            generate_pack(read_items(args.input), args.output, executor, word_generator, args.concurrency,
+                          args.difficulty, args.validate, analyzer, args.ambiguity_retries)
+        )
+    finally:
+        executor.shutdown()
+    print(f"Wrote {games} games to {args.output} ({failures} failed)")
+
+
+if __name__ == '__main__':
+    main()
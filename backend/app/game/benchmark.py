@@ -0,0 +1,144 @@
+"""
+Board generation benchmark.
+
+Solves realistic length profiles (see atlas.realistic_profile) for every board
+size with fixed seeds, so two runs of the same code do the same work and runs
+of different code can be compared size by size:
+
+    python -m app.game.benchmark --runs 50 --output before.json
+
+Every solve is timed and its solver nodes and attempts are counted; solves
+that time out or fail count towards the failure rate, and their time and nodes
+stay in the distributions, since those are the tail. Finished boards are
+checked with validation.validate_layouts, and boards that fail a check are
+reported as invalid.
+"""
+from typing import Dict, List, Optional
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from .atlas import realistic_profile
+from .board_generator import BoardGenerator
+from .partition_solver import ORDERINGS, SolveStats, SolverTimeout
+from .validation import validate_layouts
+
+PERCENTILES = (50, 95, 99)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max and mean of values, or zeros if there are none."""
+    if not values:
+        return {**{f'p{q}': 0.0 for q in PERCENTILES}, 'max': 0.0, 'mean': 0.0}
+    array = np.asarray(values, dtype=float)
+    summary = {f'p{q}': round(float(value), 3) for q, value in zip(PERCENTILES, np.percentile(array, PERCENTILES))}
+    summary['max'] = round(float(array.max()), 3)
+    summary['mean'] = round(float(array.mean()), 3)
+    return summary
+
+
+def bench_size(generator: BoardGenerator, size: int, runs: int, seed: int) -> Dict:
+    """
+    Solve runs realistic profiles for one board size. Returns the samples:
+    time_ms, nodes and attempts per solve, and the failed and invalid counts.
+    """
+    rng = random.Random(seed * 1000 + size)
+    samples = {'time_ms': [], 'nodes': [], 'attempts': [], 'failures': 0, 'invalid': 0}
+    profiles, layouts, placements = [], [], []
+    for _ in range(runs):
+        lengths = list(realistic_profile(size, rng))
+        solve_rng = random.Random(rng.getrandbits(64))
+        stats = SolveStats()
+        start = time.perf_counter()
+        try:
+            layout, placement_info = generator.generate_board_with_lengths(lengths, rng=solve_rng, stats=stats)
+        except (SolverTimeout, ValueError):
+            samples['failures'] += 1
+        else:
+            profiles.append(lengths)
+            layouts.append(layout)
+            placements.append(placement_info)
+        samples['time_ms'].append((time.perf_counter() - start) * 1000)
+        samples['nodes'].append(stats.nodes)
+        samples['attempts'].append(stats.attempts)
+
+    samples['invalid'] = int((~validate_layouts(layouts, placements, profiles).valid).sum())
+    return samples
+
+
+def summarize_samples(samples: Dict) -> Dict:
+    """The report entry for bench_size samples (or several sizes' samples merged)."""
+    runs = len(samples['time_ms'])
+    return {
+        'runs': runs,
+        'failures': samples['failures'],
+        'invalid': samples['invalid'],
+        'failure_rate': round((samples['failures'] + samples['invalid']) / runs, 4) if runs else 0.0,
+        'time_ms': summarize(samples['time_ms']),
+        'nodes': summarize(samples['nodes']),
+        'attempts': summarize(samples['attempts'])
+    }
+
+
+def run_benchmark(generator: BoardGenerator, sizes: Optional[List[int]] = None, runs: int = 50,
+                  seed: int = 0) -> Dict:
+    """
+    Benchmark every size in sizes (default: all of generator.valid_sizes).
+    Returns the run's config, one summary per size and a total over all sizes.
+    """
+    sizes = sorted(sizes or generator.valid_sizes)
+    results = []
+    total = {'time_ms': [], 'nodes': [], 'attempts': [], 'failures': 0, 'invalid': 0}
+    for size in sizes:
+        samples = bench_size(generator, size, runs, seed)
+        results.append({'size': size, 'shape': list(generator.valid_sizes[size]), **summarize_samples(samples)})
+        for key, value in samples.items():
+            total[key] += value
+    return {
+        'config': {
+            'seed': seed,
+            'runs': runs,
+            'ordering': generator.ordering,
+            'node_budget': generator.node_budget,
+            'time_limit': generator.time_limit,
+            'spangram': generator.spangram
+        },
+        'sizes': results,
+        'total': summarize_samples(total)
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark board generation over every board size.")
+    parser.add_argument('--runs', type=int, default=50, help="solves per board size")
+    parser.add_argument('--sizes', type=int, nargs='+', help="board sizes to run (default: all)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ordering', choices=ORDERINGS, default='constrained')
+    parser.add_argument('--node-budget', type=int, default=1000, help="nodes per solver attempt before a restart")
+    parser.add_argument('--time-limit', type=float, default=10.0, help="seconds per solve before it fails")
+    parser.add_argument('--spangram', action='store_true', help="make the longest path span the board")
+    parser.add_argument('--output', help="JSON file to write results to (default: stdout)")
+    args = parser.parse_args(argv)
+
+    generator = BoardGenerator(ordering=args.ordering, node_budget=args.node_budget,
+                               time_limit=args.time_limit, spangram=args.spangram)
+    unknown = set(args.sizes or ()) - set(generator.valid_sizes)
+    if unknown:
+        parser.error(f"Not valid board sizes: {sorted(unknown)}")
+    report = run_benchmark(generator, args.sizes, args.runs, args.seed)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        total = report['total']
+        print(f"Wrote {args.output}: {total['runs']} solves, p99 {total['time_ms']['p99']} ms, "
+              f"failure rate {total['failure_rate']}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,16 @@
 from typing import List, Tuple, Optional, Dict, Set
 import random
 import logging
+import time
 from collections import deque
+from .partition_solver import PartitionSolver, SolveStats, ORDERINGS
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 class BoardGenerator:
-    def __init__(self):
+    def __init__(self, ordering: str = 'constrained', node_budget: int = 1000, time_limit: Optional[float] = 10.0,
+                 atlas=None, spangram: bool = False):
         self.valid_sizes = {
             36: (6, 6), 42: (6, 7), 48: (6, 8), 49: (7, 7),
             54: (6, 9), 56: (7, 8), 60: (6, 10), 63: (7, 9),
@@ -20,18 +23,42 @@ class BoardGenerator:
             (0, -1),           (0, 1),
             (1, -1),  (1, 0),  (1, 1)
         ]
+        # How the solver orders path starts and extensions; 'random' gives the
+        # most varied boards, 'constrained' needs far less backtracking
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown ordering '{ordering}', expected one of {ORDERINGS}")
+        self.ordering = ordering
+        # Each solver attempt expands node_budget * luby(attempt) cells before a
+        # restart; the whole solve raises SolverTimeout after time_limit seconds
+        self.node_budget = node_budget
+        self.time_limit = time_limit
+        # Optional PartitionAtlas of pre-solved partitions, tried before searching
+        self.atlas = atlas
+        # Make the first path (the special word) span the board edge to edge
+        self.spangram = spangram
+        # Bitboard solvers with precomputed neighbor masks for every board shape
+        self.solvers = {
+            size: PartitionSolver(rows, cols)
+            for size, (rows, cols) in self.valid_sizes.items()
+        }
 
-    def generate_board(self, special_word: str, words: List[str]) -> Tuple[List[List[str]], dict]:
+    def generate_board(self, special_word: str, words: List[str],
+                       partition: Optional[Tuple[List[List[int]], dict]] = None,
+                       rng: Optional[random.Random] = None,
+                       shape: Optional[Tuple[int, int]] = None,
+                       stats: Optional[SolveStats] = None) -> Tuple[List[List[str]], dict]:
         """
         Generate a game board with the special word and theme words.
-        The special word is treated as just another word for now, as the path-finding
-        algorithm already handles placing longer words first.
+        The special word takes the first path, which spans the board edge to edge
+        with self.spangram; otherwise it is placed like any other word.
+        An already solved partition for [special_word] + words can be passed to skip the search.
+        rng, shape and stats are passed on to generate_board_with_words.
         """
         # Combine special word and words
         all_words = [special_word] + words
         
         # Generate the board with words
-        board, placement_info = self.generate_board_with_words(all_words)
+        board, placement_info = self.generate_board_with_words(all_words, partition, rng, shape, stats)
         
         # Update placement info to separate special word from other words
         special_word_path = placement_info['paths'][0]  # First path is special word
@@ -152,13 +179,14 @@ class BoardGenerator:
             board[row][col] = word[i].upper()  # Convert to uppercase
             placed_positions.add((row, col))
 
-    def _fill_empty_spaces(self, board: List[List[str]]):
-        """Fill empty spaces with random letters."""
+    def _fill_empty_spaces(self, board: List[List[str]], rng: Optional[random.Random] = None):
+        """Fill empty spaces with random letters, drawn from rng if given."""
         letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+        rng = rng or random
         for i in range(len(board)):
             for j in range(len(board[0])):
                 if board[i][j] == '':
-                    board[i][j] = random.choice(letters)
+                    board[i][j] = rng.choice(letters)
 
     def _find_valid_board_size(self, total_letters: int) -> Optional[int]:
         """Find the smallest valid board size that can fit the given number of letters."""
@@ -168,99 +196,112 @@ class BoardGenerator:
                 return size
         return None 
 
-    def generate_board_with_lengths(self, lengths: List[int]) -> Tuple[List[List[int]], dict]:
+    def generate_board_with_lengths(self, lengths: List[int], rng: Optional[random.Random] = None,
+                                    shape: Optional[Tuple[int, int]] = None,
+                                    stats: Optional[SolveStats] = None) -> Tuple[List[List[int]], dict]:
         """
         Generate a board with paths of specified lengths.
-        This is a simplified version that just places paths of given lengths,
-        similar to the working wormtest.py implementation.
+        Paths are found by the bitboard PartitionSolver for the board shape;
+        the board holds the 1-based worm index of each cell and
+        placement_info['paths'] lists each path's cells in the order of lengths.
+        Raises SolverTimeout if no partition is found within self.time_limit.
+
+        With a seeded rng the same lengths always give the same board (the atlas
+        is skipped, as its contents are not part of the seed). shape is rows x
+        cols, by default the configured shape for the total (see shapes_for).
+        With self.spangram the first path runs from one edge to the opposite one
+        (the atlas is skipped too, as its partitions are not built that way).
+        The solver's work is added to stats, if given, with the partition's
+        source: 'atlas' for atlas hits (no solver work), else 'solve'.
         """
         total_squares = sum(lengths)
         if total_squares not in self.valid_sizes:
             raise ValueError(f"Total squares {total_squares} must match a valid board size")
+        if shape is not None and shape not in self.shapes_for(total_squares):
+            raise ValueError(f"Board shape {shape} does not hold {total_squares} squares")
 
-        rows, cols = self.valid_sizes[total_squares]
-        board = [[-1 for _ in range(cols)] for _ in range(rows)]
-        placement_info = {'paths': [None] * len(lengths)}  # Pre-allocate list to maintain order
-
-        # Sort worms by descending length (helps place big worms first)
-        worms_ordered = sorted(enumerate(lengths), key=lambda x: x[1], reverse=True)
-
-        def place_all_worms(worm_index: int) -> bool:
-            """Try to place worm_index-th worm. If all placed, return True."""
-            if worm_index == len(worms_ordered):
-                return True  # all worms placed successfully
-
-            idx, length = worms_ordered[worm_index]
-            # Try each free cell as a potential start
-            free_cells = [
-                (r, c)
-                for r in range(rows)
-                for c in range(cols)
-                if board[r][c] == -1
-            ]
-            random.shuffle(free_cells)
-
-            for start_cell in free_cells:
-                path = [start_cell]
-                if build_worm_path(path, length):
-                    # Mark the path with this worm index
-                    for (rr, cc) in path:
-                        board[rr][cc] = idx + 1  # Use 1-based indices
-                    placement_info['paths'][idx] = path  # Store path in original order
-                    # Recurse for next worm
-                    if place_all_worms(worm_index + 1):
-                        return True
-                    else:
-                        # Undo if it didn't work out
-                        for (rr, cc) in path:
-                            board[rr][cc] = -1
-                        placement_info['paths'][idx] = None
-            return False
+        if rng is None and shape is None:
+            partition = self.sample_atlas(lengths, stats)
+            if partition is not None:
+                return partition
 
-        def build_worm_path(path: List[Tuple[int, int]], target_length: int) -> bool:
-            """
-            Recursively extend a path by adjacent squares (edge or corner).
-            If we reach target_length, success -> True.
-            """
-            if len(path) == target_length:
-                return True
+        if shape is None or shape == self.valid_sizes[total_squares]:
+            solver = self.solvers[total_squares]
+        else:
+            solver = PartitionSolver(*shape)
+        if stats is not None:
+            stats.add_source('solve')
+        paths = solver.solve(lengths, self.ordering, self.node_budget, self.time_limit, rng=rng,
+                             span=0 if self.spangram else None, stats=stats)
+        if paths is None:
+            if self.spangram:
+                raise ValueError(f"Failed to generate a board with a {lengths[0]}-letter path spanning "
+                                 f"a {solver.rows}x{solver.cols} board")
+            raise ValueError("Failed to generate a valid board with the given lengths")
 
-            (r, c) = path[-1]
-            # Shuffle neighbors for random exploration
-            neighbors = self._get_neighbors(r, c, rows, cols)
-            random.shuffle(neighbors)
-            
-            for (nr, nc) in neighbors:
-                if board[nr][nc] == -1 and (nr, nc) not in path:
-                    path.append((nr, nc))
-                    if build_worm_path(path, target_length):
-                        return True
-                    path.pop()
-            return False
+        return solver.to_board(paths)
 
-        # Try to place all worms with global backtracking
-        if not place_all_worms(0):
-            raise ValueError("Failed to generate a valid board with the given lengths")
+    def sample_atlas(self, lengths: List[int],
+                     stats: Optional[SolveStats] = None) -> Optional[Tuple[List[List[int]], dict]]:
+        """
+        A pre-solved partition for lengths from the atlas, or None if there is
+        no atlas, it has none for lengths, or the special word has to span the
+        board (atlas partitions are not built that way). Hits are added to
+        stats as source 'atlas'.
+        """
+        if self.atlas is None or self.spangram:
+            return None
+        partition = self.atlas.sample(lengths)
+        if partition is not None and stats is not None:
+            stats.add_source('atlas')
+        return partition
 
-        return board, placement_info
+    def min_special_lengths(self) -> Optional[Dict[int, int]]:
+        """
+        The shortest special word each board size can take, keyed by size: with
+        self.spangram it has to reach across the board's narrower side. None
+        without spangram, when any special word fits.
+        """
+        if not self.spangram:
+            return None
+        return {size: min(shape) for size, shape in self.valid_sizes.items()}
 
-    def _get_neighbors(self, r: int, c: int, rows: int, cols: int) -> List[Tuple[int, int]]:
-        """Return valid adjacent neighbors for cell (r,c)."""
-        result = []
-        for dr, dc in self.DIRECTIONS:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols:
-                result.append((nr, nc))
-        return result 
+    def shapes_for(self, total_squares: int) -> List[Tuple[int, int]]:
+        """
+        Board shapes for total_squares: the configured one first, then its
+        transpose and any other rows x cols in [6..10] x [6..10] with that area.
+        """
+        rows, cols = self.valid_sizes[total_squares]
+        shapes = [(rows, cols), (cols, rows)]
+        for r in range(6, 11):
+            if total_squares % r == 0 and 6 <= total_squares // r <= 10:
+                shapes.append((r, total_squares // r))
+        return list(dict.fromkeys(shapes))
 
-    def generate_board_with_words(self, words: List[str]) -> Tuple[List[List[str]], dict]:
+    def generate_board_with_words(self, words: List[str],
+                                  partition: Optional[Tuple[List[List[int]], dict]] = None,
+                                  rng: Optional[random.Random] = None,
+                                  shape: Optional[Tuple[int, int]] = None,
+                                  stats: Optional[SolveStats] = None) -> Tuple[List[List[str]], dict]:
         """
         Generate a board with the given words, placing each word along a contiguous path.
         This builds on top of generate_board_with_lengths by placing actual words along the paths.
+        partition is an optional (board, placement_info) result of generate_board_with_lengths
+        for these words' lengths, e.g. from the PartitionCache.
+        All randomness comes from rng when given, so random.Random(seed) reproduces the board.
+        With stats, the solver's work and the time spent finding the partition, placing
+        the letters and filling the rest of the board are added to it.
         """
+        start = time.perf_counter() if stats is not None else 0.0
         # First get the paths using the lengths
-        lengths = [len(word) for word in words]
-        number_board, placement_info = self.generate_board_with_lengths(lengths)
+        if partition is None:
+            lengths = [len(word) for word in words]
+            partition = self.generate_board_with_lengths(lengths, rng, shape, stats)
+            if stats is not None:
+                now = time.perf_counter()
+                stats.add_phase('partition', now - start)
+                start = now
+        number_board, placement_info = partition
         
         # Now create a new board for letters and place the words along the paths
         rows, cols = len(number_board), len(number_board[0])
@@ -270,8 +311,14 @@ class BoardGenerator:
         for word, path in zip(words, placement_info['paths']):
             for i, (row, col) in enumerate(path):
                 board[row][col] = word[i]
+        if stats is not None:
+            now = time.perf_counter()
+            stats.add_phase('letters', now - start)
+            start = now
         
         # Fill empty spaces with random letters
-        self._fill_empty_spaces(board)
+        self._fill_empty_spaces(board, rng)
+        if stats is not None:
+            stats.add_phase('fill', time.perf_counter() - start)
         
         return board, placement_info 
\ No newline at end of file
@@ -0,0 +1,82 @@
+from typing import Any, Callable, Dict
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import asyncio
+import time
+
+
+class AsyncClientPool:
+    """
+    Bounded LRU cache of async LLM clients, keyed by API key.
+
+    Reusing a client reuses its HTTP connection pool, so requests with the same
+    key skip client construction and the TLS handshake. Clients unused for
+    idle_timeout seconds, or pushed out by more than max_size keys, are closed
+    once no request is using them. At most max_concurrency requests per key
+    run at once; the rest wait for a free slot.
+    """
+
+    def __init__(self, factory: Callable[[str], Any], max_size: int = 32, idle_timeout: float = 300.0,
+                 max_concurrency: int = 4):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_concurrency = max_concurrency
+        # api_key -> [client, last_used, requests in flight, concurrency semaphore]
+        self._clients: "OrderedDict[str, list]" = OrderedDict()
+        # Evicted clients still serving a request, closed when that request ends
+        self._retired: Dict[int, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    @asynccontextmanager
+    async def client(self, api_key: str):
+        """Borrow the client for api_key, creating it if needed."""
+        now = time.monotonic()
+        await self._evict_idle(now)
+        entry = self._clients.get(api_key)
+        if entry is None:
+            entry = [self.factory(api_key), now, 0, asyncio.Semaphore(self.max_concurrency)]
+            self._clients[api_key] = entry
+            await self._evict_overflow()
+        else:
+            self._clients.move_to_end(api_key)
+        entry[1] = now
+        entry[2] += 1
+        try:
+            async with entry[3]:
+                yield entry[0]
+        finally:
+            entry[2] -= 1
+            entry[1] = time.monotonic()
+            if not entry[2] and self._retired.pop(id(entry), None) is not None:
+                await entry[0].close()
+
+    async def _evict_idle(self, now: float):
+        """Drop clients that have not been used for idle_timeout seconds."""
+        while self._clients:
+            api_key, entry = next(iter(self._clients.items()))
+            if now - entry[1] < self.idle_timeout:
+                break
+            del self._clients[api_key]
+            await self._retire(entry)
+
+    async def _evict_overflow(self):
+        """Drop least recently used clients beyond max_size."""
+        while len(self._clients) > self.max_size:
+            _, entry = self._clients.popitem(last=False)
+            await self._retire(entry)
+
+    async def _retire(self, entry: list):
+        if entry[2]:
+            self._retired[id(entry)] = entry
+        else:
+            await entry[0].close()
+
+    async def aclose(self):
+        """Close every cached client, e.g. on application shutdown."""
+        entries = list(self._clients.values()) + list(self._retired.values())
+        self._clients.clear()
+        self._retired.clear()
+        await asyncio.gather(*(entry[0].close() for entry in entries))
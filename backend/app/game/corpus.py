@@ -0,0 +1,108 @@
+from typing import Dict, List, Optional
+from collections import Counter, defaultdict
+import json
+import os
+import random
+import re
+from .word_generator import WordSource
+
+# Themed word sets shipped with the app, one JSON object per line
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), 'data', 'word_sets.jsonl')
+
+
+def normalize_keyword(word: str) -> str:
+    """Lowercase letters only, with a trailing plural 's' dropped, so 'Planets' finds 'planet'."""
+    word = re.sub(r'[^a-z]', '', word.lower())
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+    return word
+
+
+class CorpusWordGenerator(WordSource):
+    """
+    Word generator backed by a local corpus of themed word sets instead of an LLM.
+
+    Each corpus line is {"theme": ..., "special_word": ..., "words": [...]} with
+    optional "keywords". Sets are indexed by total letter count and by keyword
+    (the keywords, theme words, special word and words), so a seed word resolves
+    with a dictionary lookup and no network access. Raises LookupError when no
+    set matches a seed word, so callers can fall back to an LLM. With
+    min_special_lengths, sets whose special word cannot span their board are
+    left out.
+    """
+    def __init__(self, path: str = DEFAULT_CORPUS, min_special_lengths: Optional[Dict[int, int]] = None):
+        super().__init__(min_special_lengths)
+        self.path = path
+        self.word_sets: List[Dict] = []
+        self.totals: List[int] = []
+        self.by_total: Dict[int, List[int]] = defaultdict(list)
+        self.by_keyword: Dict[str, List[int]] = defaultdict(list)
+        with open(path) as f:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    self._add(json.loads(line), line_number)
+
+    def _add(self, entry: Dict, line_number: int):
+        word_set = {
+            'theme': entry['theme'],
+            'special_word': entry['special_word'],
+            'words': list(entry['words'])
+        }
+        total_letters = len(word_set['special_word']) + sum(len(word) for word in word_set['words'])
+        if total_letters not in self.valid_sizes:
+            raise ValueError(f"{self.path}:{line_number}: total letter count {total_letters} is not a valid board size")
+        if total_letters not in self.sizes_for(word_set['special_word']):
+            # Its special word is too short to span its board, so the set is never served
+            return
+
+        index = len(self.word_sets)
+        self.word_sets.append(word_set)
+        self.totals.append(total_letters)
+        self.by_total[total_letters].append(index)
+        keywords = set(entry.get('keywords', []))
+        keywords.update(word_set['theme'].split())
+        keywords.add(word_set['special_word'])
+        keywords.update(word_set['words'])
+        for keyword in {normalize_keyword(keyword) for keyword in keywords}:
+            if keyword:
+                self.by_keyword[keyword].append(index)
+
+    def __len__(self) -> int:
+        return len(self.word_sets)
+
+    def matches(self, seed_word: str) -> List[int]:
+        """Indexes of the sets matching seed_word: the whole seed if it is a keyword, else the sets sharing the most of its words."""
+        exact = self.by_keyword.get(normalize_keyword(seed_word))
+        if exact:
+            return exact
+        hits = Counter()
+        for token in seed_word.split():
+            for index in self.by_keyword.get(normalize_keyword(token), ()):
+                hits[index] += 1
+        if not hits:
+            return []
+        best = max(hits.values())
+        return [index for index, count in hits.items() if count == best]
+
+    def generate_word_set(self, seed_word: str = None, total_letters: Optional[int] = None) -> Dict[str, str]:
+        """
+        Pick a word set at random, among those matching seed_word and/or with
+        the given total letter count when set.
+        """
+        if seed_word:
+            candidates = self.matches(seed_word)
+            if total_letters is not None:
+                candidates = [index for index in candidates if self.totals[index] == total_letters]
+        elif total_letters is not None:
+            candidates = self.by_total.get(total_letters, [])
+        else:
+            candidates = range(len(self.word_sets))
+        if not candidates:
+            raise LookupError(f"No word set in the corpus for seed word {seed_word!r}"
+                              + (f" with {total_letters} letters" if total_letters is not None else ""))
+        word_set = self.word_sets[random.choice(candidates)]
+        return {**word_set, 'words': list(word_set['words'])}
+
+    async def agenerate_word_set(self, seed_word: str = None, fanout: int = 1, stream: bool = False) -> Dict[str, str]:
+        """Same as generate_word_set; fanout and stream only apply to LLM generators."""
+        return self.generate_word_set(seed_word)
@@ -0,0 +1,142 @@
+"""
+Difficulty scoring for finished boards.
+
+A board is harder when its theme words can be read along many paths (decoy
+readings that are not the answer) and when the answer paths are tangled:
+they turn often and sharply, and their diagonal steps cross other paths.
+"""
+from typing import Dict, List, Tuple
+import math
+
+from .ambiguity import grid_neighbors
+
+Cell = Tuple[int, int]
+
+# Score thresholds between the levels, see score_board; roughly the tertiles
+# of the bundled corpus on default boards
+LEVELS = ((15.5, 'easy'), (17.0, 'medium'), (math.inf, 'hard'))
+# King move (dr, dc) -> direction 0-7, counterclockwise from east
+DIRECTIONS = {(0, 1): 0, (-1, 1): 1, (-1, 0): 2, (-1, -1): 3,
+              (0, -1): 4, (1, -1): 5, (1, 0): 6, (1, 1): 7}
+
+
+def letter_cells(letters: List[str]) -> Dict[str, List[int]]:
+    """The cells holding each letter."""
+    cells: Dict[str, List[int]] = {}
+    for cell, letter in enumerate(letters):
+        cells.setdefault(letter, []).append(cell)
+    return cells
+
+
+def count_readings(cells_by_letter: Dict[str, List[int]], rows: int, cols: int, word: str) -> int:
+    """
+    Count the paths of king moves that spell word on the board, each cell
+    used at most once. Words without repeated letters can't revisit a cell, so
+    they are counted with a DP over word positions: ways[cell] is how many ways
+    word[i:] can be read starting at cell, and only cells holding word[i] are
+    visited. Words that repeat a letter are counted exactly by a DFS that
+    tracks the cells used in an int bitmask.
+    """
+    neighbors = grid_neighbors(rows, cols)
+    word = word.lower()
+    if len(set(word)) < len(word):
+        return _count_simple_paths(cells_by_letter, neighbors, word)
+    ways = dict.fromkeys(cells_by_letter.get(word[-1], ()), 1)
+    for letter in reversed(word[:-1]):
+        if not ways:
+            return 0
+        previous = ways
+        ways = {}
+        for cell in cells_by_letter.get(letter, ()):
+            total = 0
+            for neighbor in neighbors[cell]:
+                total += previous.get(neighbor, 0)
+            if total:
+                ways[cell] = total
+    return sum(ways.values())
+
+
+def _count_simple_paths(cells_by_letter: Dict[str, List[int]], neighbors: Tuple[Tuple[int, ...], ...],
+                        word: str) -> int:
+    """Count the paths spelling word that use no cell twice, by DFS with a visited bitmask."""
+    holds = [set(cells_by_letter.get(letter, ())) for letter in word]
+    last = len(word) - 1
+
+    def extend(cell: int, index: int, used: int) -> int:
+        if index == last:
+            return 1
+        count = 0
+        for neighbor in neighbors[cell]:
+            if neighbor in holds[index + 1] and not used >> neighbor & 1:
+                count += extend(neighbor, index + 1, used | 1 << neighbor)
+        return count
+
+    return sum(extend(cell, 0, 1 << cell) for cell in holds[0])
+
+
+def _diagonal_key(a: Cell, b: Cell) -> Tuple[int, int, bool]:
+    """The 2x2 block a diagonal step lies in, and which of its two diagonals it is."""
+    top, left = min(a[0], b[0]), min(a[1], b[1])
+    main = (a[0] - b[0]) == (a[1] - b[1])
+    return top, left, main
+
+
+def path_stats(paths: List[List[Cell]]) -> List[Dict[str, int]]:
+    """
+    Per path: turns (changes of direction), sharp_turns (of 90 degrees or more)
+    and crossings (diagonal steps that cross a diagonal step of any path).
+    """
+    diagonals = set()
+    for path in paths:
+        for a, b in zip(path, path[1:]):
+            if a[0] != b[0] and a[1] != b[1]:
+                diagonals.add(_diagonal_key(a, b))
+
+    stats = []
+    for path in paths:
+        turns = sharp_turns = crossings = 0
+        previous = None
+        for a, b in zip(path, path[1:]):
+            direction = DIRECTIONS[(b[0] - a[0], b[1] - a[1])]
+            if previous is not None and direction != previous:
+                turns += 1
+                angle = min((direction - previous) % 8, (previous - direction) % 8)
+                if angle >= 2:
+                    sharp_turns += 1
+            previous = direction
+            if a[0] != b[0] and a[1] != b[1]:
+                top, left, main = _diagonal_key(a, b)
+                if (top, left, not main) in diagonals:
+                    crossings += 1
+        stats.append({'turns': turns, 'sharp_turns': sharp_turns, 'crossings': crossings})
+    return stats
+
+
+def score_board(board: List[List[str]], placement_info: dict) -> dict:
+    """
+    Score a generate_board result. Returns the readings and path stats of
+    every word, the overall score and its level (easy, medium or hard).
+
+    score = 10 * tangle + 2 * log2(1 + decoys), where tangle is the mean over
+    paths of (turns + sharp_turns + crossings) per step and decoys is the
+    number of readings that are not the answer, summed over words.
+    """
+    rows, cols = len(board), len(board[0])
+    cells_by_letter = letter_cells([letter.lower() for row in board for letter in row])
+    placements = [placement_info['special_word']] + placement_info['words']
+    paths = [placement['path'] for placement in placements]
+
+    words = []
+    tangle = 0.0
+    decoys = 0
+    for placement, stats in zip(placements, path_stats(paths)):
+        readings = count_readings(cells_by_letter, rows, cols, placement['word'])
+        decoys += max(readings - 1, 0)
+        steps = max(len(placement['path']) - 1, 1)
+        tangle += (stats['turns'] + stats['sharp_turns'] + stats['crossings']) / steps
+        words.append({'word': placement['word'], 'readings': readings, **stats})
+    tangle /= len(placements)
+
+    score = round(10 * tangle + 2 * math.log2(1 + decoys), 2)
+    level = next(name for threshold, name in LEVELS if score < threshold)
+    return {'score': score, 'level': level, 'words': words}
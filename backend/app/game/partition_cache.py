@@ -0,0 +1,140 @@
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict, deque
+import asyncio
+import logging
+import random
+from .symmetry import symmetries_for, transform_paths
+
+logger = logging.getLogger(__name__)
+
+Path = List[Tuple[int, int]]
+LengthKey = Tuple[int, ...]
+
+
+def unsort_partition(lengths: List[int], paths: List[Path], rows: int, cols: int,
+                     keep_first: bool = False) -> Tuple[List[List[int]], dict]:
+    """
+    Map paths stored longest first (the order of a length key) back onto the
+    original order of lengths, as a generate_board_with_lengths result.
+    With keep_first, the first path belongs to lengths[0] and only the rest were sorted.
+    """
+    if keep_first:
+        order = [0] + sorted(range(1, len(lengths)), key=lambda i: lengths[i], reverse=True)
+    else:
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    ordered_paths: List[Optional[Path]] = [None] * len(lengths)
+    for path, idx in zip(paths, order):
+        ordered_paths[idx] = path
+
+    board = [[-1 for _ in range(cols)] for _ in range(rows)]
+    for idx, path in enumerate(ordered_paths):
+        for (r, c) in path:
+            board[r][c] = idx + 1  # Use 1-based indices
+    return board, {'paths': ordered_paths}
+
+
+class PartitionCache:
+    """
+    Warm pools of pre-solved partitions, keyed by length multiset.
+
+    Each key is the lengths sorted longest first, and its pool holds solved
+    paths in that order. take() pops one and maps it back to the caller's word
+    order, so common shapes skip the search entirely. Pools that drop to
+    low_water (and keys seen for the first time) are refilled to pool_size by
+    the background run() task. Every solve is added under each symmetry of its
+    board (see symmetry.py), so one search yields 4 or 8 partitions. At most
+    max_keys keys are kept, least recently used first out.
+
+    For spanning partitions (BoardGenerator.spangram) the first length is the
+    spanning path, so keys keep it first and sort only the rest. Rotations and
+    reflections map opposite edges to opposite edges, so variants still span.
+    """
+
+    def __init__(self, valid_sizes: Dict[int, Tuple[int, int]], max_keys: int = 64,
+                 pool_size: int = 8, low_water: int = 2, spanning: bool = False):
+        self.valid_sizes = valid_sizes
+        self.spanning = spanning
+        self.max_keys = max_keys
+        self.pool_size = pool_size
+        self.low_water = low_water
+        self._pools: "OrderedDict[LengthKey, Deque[List[Path]]]" = OrderedDict()
+        self._low: Set[LengthKey] = set()
+        self._wanted: Optional[asyncio.Event] = None
+
+    @staticmethod
+    def key_for(lengths: List[int], spanning: bool = False) -> LengthKey:
+        if spanning:
+            return (lengths[0],) + tuple(sorted(lengths[1:], reverse=True))
+        return tuple(sorted(lengths, reverse=True))
+
+    def __len__(self) -> int:
+        return sum(len(pool) for pool in self._pools.values())
+
+    def take(self, lengths: List[int]) -> Optional[Tuple[List[List[int]], dict]]:
+        """
+        Pop a ready partition for lengths as a generate_board_with_lengths result,
+        or return None on a miss. Either way the key is queued for refilling if low.
+        """
+        key = self.key_for(lengths, self.spanning)
+        if sum(key) not in self.valid_sizes:
+            return None
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._add_key(key)
+        else:
+            self._pools.move_to_end(key)
+        paths = pool.popleft() if pool else None
+        if len(pool) <= self.low_water:
+            self._request_refill(key)
+        if paths is None:
+            return None
+        rows, cols = self.valid_sizes[sum(lengths)]
+        return unsort_partition(lengths, paths, rows, cols, self.spanning)
+
+    def put(self, key: LengthKey, paths: List[Path]):
+        """Add solved paths (in key order) to the pool for key, if it is still tracked and not full."""
+        pool = self._pools.get(key)
+        if pool is not None and len(pool) < self.pool_size:
+            pool.append(paths)
+
+    def put_variants(self, key: LengthKey, paths: List[Path]):
+        """Add every rotation and reflection of solved paths, in random order."""
+        rows, cols = self.valid_sizes[sum(key)]
+        symmetries = list(symmetries_for(rows, cols))
+        random.shuffle(symmetries)
+        for symmetry in symmetries:
+            self.put(key, transform_paths(paths, symmetry, rows, cols))
+
+    def _add_key(self, key: LengthKey) -> Deque[List[Path]]:
+        pool: Deque[List[Path]] = deque()
+        self._pools[key] = pool
+        while len(self._pools) > self.max_keys:
+            evicted, _ = self._pools.popitem(last=False)
+            self._low.discard(evicted)
+        return pool
+
+    def _request_refill(self, key: LengthKey):
+        self._low.add(key)
+        if self._wanted is not None:
+            self._wanted.set()
+
+    async def run(self, solve: Callable[[List[int]], Awaitable[Tuple[List[List[int]], dict]]]):
+        """
+        Background refill loop: whenever pools run low, call solve (an async
+        generate_board_with_lengths, e.g. in a process pool) until they are full.
+        """
+        self._wanted = asyncio.Event()
+        if self._low:
+            self._wanted.set()
+        while True:
+            await self._wanted.wait()
+            self._wanted.clear()
+            while self._low:
+                key = self._low.pop()
+                while key in self._pools and len(self._pools[key]) < self.pool_size:
+                    try:
+                        _, placement_info = await solve(list(key))
+                    except Exception as e:
+                        logger.warning(f"Refilling partition pool {key} failed: {str(e)}")
+                        break
+                    self.put_variants(key, placement_info['paths'])
@@ -0,0 +1,449 @@
+from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+from itertools import count
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Candidate orderings for path starts and extensions:
+#   'random'      - uniform shuffle of every candidate
+#   'constrained' - fewest free neighbors first (Warnsdorff's rule), random tie-breaks
+ORDERINGS = ('random', 'constrained')
+
+# 8 directions for adjacency (including diagonals)
+DIRECTIONS = [
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1)
+]
+
+
+def iter_bits(mask: int) -> List[int]:
+    """Return the indices of the set bits in mask, lowest first."""
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
+
+
+# Returned by a search attempt that ran out of nodes before finishing
+BUDGET_EXCEEDED = object()
+# The clock (and stop flag) is only read every DEADLINE_CHECK_MASK + 1 nodes
+DEADLINE_CHECK_MASK = 0x3FF
+
+
+class SolverTimeout(TimeoutError):
+    """Raised when no partition was found before the solver's deadline."""
+
+
+class SolverCancelled(Exception):
+    """Raised when a solve was stopped from outside, e.g. because a racing solve won."""
+
+
+class SolveStats:
+    """
+    Work done by the solves and board generations it is passed to, summed over
+    all of them (including solves that timed out): cells expanded (nodes),
+    search attempts and restarts (attempts that ran out of budget), backtracks
+    per worm in lengths order (positions exhausted while placing that worm),
+    the deepest point of any search (cells placed at once), wall time per
+    BoardGenerator phase ('partition', 'letters' and 'fill'), in seconds, and
+    how many boards took their partition from each source: 'solve' (the solver
+    ran), 'atlas', 'cache' or 'race'. Only 'solve' boards add solver counts.
+
+    Solvers only touch it between attempts and on backtracks, so passing None
+    costs nothing on the hot path.
+    """
+    __slots__ = ('nodes', 'attempts', 'restarts', 'backtracks', 'max_depth', 'phases', 'sources')
+
+    def __init__(self):
+        self.nodes = 0
+        self.attempts = 0
+        self.restarts = 0
+        self.backtracks: List[int] = []
+        self.max_depth = 0
+        self.phases: Dict[str, float] = {}
+        self.sources: Dict[str, int] = {}
+
+    def add_backtracks(self, backtracks: List[int]):
+        """Add per-worm backtrack counts, widening the list for more worms."""
+        if len(backtracks) > len(self.backtracks):
+            self.backtracks.extend([0] * (len(backtracks) - len(self.backtracks)))
+        for worm, count in enumerate(backtracks):
+            self.backtracks[worm] += count
+
+    def add_phase(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_source(self, source: str, count: int = 1):
+        self.sources[source] = self.sources.get(source, 0) + count
+
+    def merge(self, other: dict):
+        """Add the counts of another SolveStats, given as its to_dict()."""
+        self.nodes += other['nodes']
+        self.attempts += other['attempts']
+        self.restarts += other['restarts']
+        self.add_backtracks(other['backtracks'])
+        self.max_depth = max(self.max_depth, other['max_depth'])
+        for phase, ms in other['phase_ms'].items():
+            self.add_phase(phase, ms / 1000)
+        for source, count in other['sources'].items():
+            self.add_source(source, count)
+
+    def to_dict(self) -> dict:
+        return {
+            'nodes': self.nodes,
+            'attempts': self.attempts,
+            'restarts': self.restarts,
+            'backtracks': list(self.backtracks),
+            'max_depth': self.max_depth,
+            'phase_ms': {phase: round(seconds * 1000, 3) for phase, seconds in self.phases.items()},
+            'sources': dict(self.sources)
+        }
+
+
+def luby(i: int) -> int:
+    """Return the i-th term (1-based) of the Luby restart sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:  # Python < 3.10
+    def popcount(mask: int) -> int:
+        return bin(mask).count('1')
+
+
+@lru_cache(maxsize=4096)
+def subset_sums(lengths: Tuple[int, ...]) -> int:
+    """
+    Return a bitset whose bit s is set when some sub-multiset of lengths sums to s.
+    Callers pass a sorted tuple so every ordering of a multiset shares one cache entry.
+    """
+    reachable = 1  # the empty sub-multiset sums to 0
+    for length in lengths:
+        reachable |= reachable << length
+    return reachable
+
+
+class PartitionSolver:
+    """
+    Bitboard engine that partitions a rows x cols grid into worm paths.
+
+    Cell (r, c) is bit r * cols + c of an integer mask, so the occupied area,
+    the free area and a path's own cells are all single integers. Neighbor
+    masks are precomputed once per shape, which turns "free neighbors of the
+    path head" into one AND instead of a grid scan plus a list lookup.
+    """
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.full_mask = (1 << self.size) - 1
+        self.cells = [(i // cols, i % cols) for i in range(self.size)]
+        self.neighbor_masks = [0] * self.size
+        for i, (r, c) in enumerate(self.cells):
+            mask = 0
+            for dr, dc in DIRECTIONS:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < rows and 0 <= nc < cols:
+                    mask |= 1 << (nr * cols + nc)
+            self.neighbor_masks[i] = mask
+        # Column masks that stop horizontal shifts from wrapping between rows
+        first_col = sum(1 << (r * cols) for r in range(rows))
+        self.not_first_col = self.full_mask & ~first_col
+        self.not_last_col = self.full_mask & ~(first_col << (cols - 1))
+        # For spanning paths: within[e][d] holds the cells at most d steps from
+        # edge e (top, bottom, left, right), since a king move changes the row
+        # and the column by at most one
+        first_row = (1 << cols) - 1
+        edge_distances = [
+            lambda r, c: r, lambda r, c: rows - 1 - r,
+            lambda r, c: c, lambda r, c: cols - 1 - c,
+        ]
+        self.within = [
+            [sum(1 << i for i, (r, c) in enumerate(self.cells) if distance(r, c) <= d)
+             for d in range(max(rows, cols))]
+            for distance in edge_distances
+        ]
+        self.edges = [first_row, first_row << (self.size - cols), first_col, first_col << (cols - 1)]
+
+    def _dilate(self, mask: int) -> int:
+        """Grow mask by one cell in all 8 directions (bits past the board are not cleared)."""
+        grown = mask | ((mask << 1) & self.not_first_col) | ((mask >> 1) & self.not_last_col)
+        return grown | (grown << self.cols) | (grown >> self.cols)
+
+    def free_regions(self, free: int) -> List[int]:
+        """Split the free mask into its 8-connected regions."""
+        regions = []
+        while free:
+            region = free & -free
+            while True:
+                grown = self._dilate(region) & free
+                if grown == region:
+                    break
+                region = grown
+            regions.append(region)
+            free &= ~region
+        return regions
+
+    def regions_feasible(self, free: int, reachable: int, head: Optional[int] = None, need: int = 0) -> bool:
+        """
+        Check that the free area can still be partitioned.
+        Every free region must have a size that some sub-multiset of the remaining
+        lengths sums to (reachable is their subset_sums bitset). While a path is
+        being built, its remaining need cells must also fit into one region next
+        to the path head, with what is left of that region still reachable.
+        """
+        dead = []
+        touching = []
+        for region in self.free_regions(free):
+            size = popcount(region)
+            if not reachable >> size & 1:
+                dead.append(region)
+                if len(dead) > 1 or not need:
+                    return False
+            if need and region & self.neighbor_masks[head]:
+                touching.append((region, size))
+
+        if not need:
+            return True
+        for region, size in touching:
+            if size >= need and reachable >> (size - need) & 1 and (not dead or dead[0] == region):
+                return True
+        return False
+
+    def _order_by_free_degree(self, cells: List[int], free: int, rng: random.Random) -> List[int]:
+        """Shuffle cells, then stable-sort them by free-neighbor count so ties stay random."""
+        neighbor_masks = self.neighbor_masks
+        rng.shuffle(cells)
+        cells.sort(key=lambda cell: popcount(neighbor_masks[cell] & free))
+        return cells
+
+    def _candidates(self, mask: int, free: int, constrained: bool, rng: random.Random) -> List[int]:
+        """
+        Order the cells of mask for trying, best candidate last (the search pops from the end).
+        With constrained ordering, start cells come from corners and pocket edges and
+        extensions follow Warnsdorff's rule: the cell with the fewest onward moves first.
+        """
+        cells = iter_bits(mask)
+        if constrained:
+            self._order_by_free_degree(cells, free, rng)
+            cells.reverse()
+        else:
+            rng.shuffle(cells)
+        return cells
+
+    def _span_reach(self, start: int, distance: int) -> int:
+        """
+        Cells at most distance steps from an edge opposite one that start is on:
+        where a spanning path from start may be with distance cells still to go.
+        """
+        reach = 0
+        for edge, opposite in ((0, 1), (1, 0), (2, 3), (3, 2)):
+            if self.edges[edge] >> start & 1:
+                within = self.within[opposite]
+                reach |= within[distance] if distance < len(within) else self.full_mask
+        return reach
+
+    def span_starts(self, length: int) -> int:
+        """Edge cells from which a path of length cells can reach the opposite edge."""
+        edge_cells = self.edges[0] | self.edges[1] | self.edges[2] | self.edges[3]
+        return sum(1 << cell for cell in iter_bits(edge_cells) if self._span_reach(cell, length - 1) >> cell & 1)
+
+    def solve(self, lengths: List[int], ordering: str = 'random', node_budget: int = 1000,
+              time_limit: Optional[float] = None, stop=None,
+              rng: Optional[random.Random] = None, span: Optional[int] = None,
+              stats: Optional[SolveStats] = None) -> Optional[List[List[int]]]:
+        """
+        Partition the grid into paths of the given lengths.
+        Returns one list of cell indices per length (in the original order),
+        or None if the lengths provably cannot partition the grid. ordering picks
+        how start cells and path extensions are tried (see ORDERINGS).
+
+        Each attempt may expand node_budget times the next Luby number of cells
+        before it is abandoned and restarted with a fresh random seed. Raises
+        SolverTimeout once time_limit seconds have passed without a solution,
+        and SolverCancelled once stop (anything with is_set(), such as an Event)
+        is set. Attempt seeds are drawn from rng (default: the global random
+        module), so a seeded rng always gives the same partition.
+
+        With span set, the path for lengths[span] is placed first and must run
+        from one edge of the board to the opposite one (like a spangram).
+
+        If stats is given, the work done by this solve is added to it.
+        """
+        if sum(lengths) != self.size:
+            raise ValueError(f"Lengths sum to {sum(lengths)}, board has {self.size} cells")
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown ordering '{ordering}', expected one of {ORDERINGS}")
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+
+        for attempt in count(1):
+            if deadline is not None and time.monotonic() > deadline:
+                raise SolverTimeout(f"No partition found for lengths {lengths} after {attempt - 1} attempts")
+            if stop is not None and stop.is_set():
+                raise SolverCancelled(f"Solve for lengths {lengths} was stopped")
+            attempt_rng = random.Random((rng or random).getrandbits(64))
+            if stats is not None:
+                stats.attempts += 1
+            paths = self._search(lengths, ordering == 'constrained', attempt_rng, node_budget * luby(attempt),
+                                 deadline, stop, span, stats)
+            if paths is not BUDGET_EXCEEDED:
+                return paths
+            if stats is not None:
+                stats.restarts += 1
+            logger.debug(f"Attempt {attempt} exceeded its node budget, restarting")
+
+    def _search(self, lengths: List[int], constrained: bool, rng: random.Random,
+                node_limit: int, deadline: Optional[float], stop=None, span: Optional[int] = None,
+                stats: Optional[SolveStats] = None):
+        """
+        One depth-first attempt, run iteratively with an explicit stack.
+
+        Worms are placed longest first, so the search only has to choose the
+        sequence of cells: position p belongs to a fixed worm, and is either that
+        worm's start (any free cell) or an extension of the cell before it. Each
+        stack frame holds the untried candidates for one position.
+
+        A spanning worm goes first instead. It starts on an edge, and until it
+        touches the opposite edge every extension must stay within as many king
+        moves of that edge as the worm has cells left, so dead ends are never
+        entered rather than found by generating and rejecting whole paths.
+
+        Returns the paths, None when the whole space was exhausted, or
+        BUDGET_EXCEEDED when node_limit cells were expanded first. The nodes,
+        backtracks and depth are added to stats, if given, however the attempt
+        ends.
+        """
+        full_mask = self.full_mask
+        neighbor_masks = self.neighbor_masks
+        regions_feasible = self.regions_feasible
+
+        # Sort worms by descending length (helps place big worms first)
+        worms_ordered = sorted(enumerate(lengths), key=lambda x: x[1], reverse=True)
+        span_length = 0
+        if span is not None:
+            span_length = lengths[span]
+            worms_ordered.remove((span, span_length))
+            worms_ordered.insert(0, (span, span_length))
+        # For each position in the cell sequence: its worm and how many cells that worm still needs
+        worm_at: List[int] = []
+        need_after: List[int] = []
+        for k, (_, length) in enumerate(worms_ordered):
+            worm_at.extend([k] * length)
+            need_after.extend(range(length - 1, -1, -1))
+        # Subset-sum reachability of the lengths still unplaced after each worm
+        reachable_after = [
+            subset_sums(tuple(sorted(length for _, length in worms_ordered[k + 1:])))
+            for k in range(len(worms_ordered))
+        ]
+
+        sequence: List[int] = []
+        occupied = 0
+        start_mask = self.span_starts(span_length) if span_length else full_mask
+        stack = [self._candidates(start_mask, full_mask, constrained, rng)]
+        nodes = 0
+        # Position at which the spanning worm first touched its target edge
+        span_reached = None
+        # Backtracks per worm (in worms_ordered order) and the deepest sequence
+        # before one, only kept when stats are wanted
+        backtracks = [0] * len(worms_ordered) if stats is not None else None
+        max_depth = 0
+
+        try:
+            while stack:
+                candidates = stack[-1]
+                if not candidates:
+                    # Position exhausted: backtrack into the previous one
+                    stack.pop()
+                    if backtracks is not None and sequence:
+                        backtracks[worm_at[len(sequence) - 1]] += 1
+                        max_depth = max(max_depth, len(sequence))
+                    if sequence:
+                        occupied ^= 1 << sequence.pop()
+                        if span_reached is not None and span_reached >= len(sequence):
+                            span_reached = None
+                    continue
+
+                nodes += 1
+                if nodes > node_limit:
+                    nodes -= 1
+                    return BUDGET_EXCEEDED
+                if not nodes & DEADLINE_CHECK_MASK:
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise SolverTimeout(f"No partition found for lengths {lengths} before the deadline")
+                    if stop is not None and stop.is_set():
+                        raise SolverCancelled(f"Solve for lengths {lengths} was stopped")
+
+                cell = candidates.pop()
+                position = len(sequence)
+                sequence.append(cell)
+                occupied |= 1 << cell
+                if position + 1 == self.size:
+                    break
+
+                free = full_mask & ~occupied
+                need = need_after[position]
+                reachable = reachable_after[worm_at[position]]
+                if need:
+                    extensions = neighbor_masks[cell] & free
+                    if position < span_length and span_reached is None:
+                        if self._span_reach(sequence[0], 0) >> cell & 1:
+                            span_reached = position
+                        else:
+                            # The next cell has need - 1 cells after it to reach the target edge
+                            extensions &= self._span_reach(sequence[0], need - 1)
+                    # Stop extending a path that has already cut off a dead region
+                    if extensions and regions_feasible(free, reachable, cell, need):
+                        stack.append(self._candidates(extensions, free, constrained, rng))
+                        continue
+                elif regions_feasible(free, reachable):
+                    stack.append(self._candidates(free, free, constrained, rng))
+                    continue
+
+                sequence.pop()
+                occupied ^= 1 << cell
+                if span_reached == position:
+                    span_reached = None
+            else:
+                return None
+        finally:
+            if stats is not None:
+                stats.nodes += nodes
+                stats.max_depth = max(stats.max_depth, max_depth, len(sequence))
+                by_worm = [0] * len(lengths)
+                for k, (idx, _) in enumerate(worms_ordered):
+                    by_worm[idx] = backtracks[k]
+                stats.add_backtracks(by_worm)
+
+        paths: List[Optional[List[int]]] = [None] * len(lengths)
+        offset = 0
+        for idx, length in worms_ordered:
+            paths[idx] = sequence[offset:offset + length]
+            offset += length
+        return paths
+
+    def to_board(self, paths: List[List[int]]) -> Tuple[List[List[int]], dict]:
+        """Convert solved cell-index paths into the (board, placement_info) contract."""
+        board = [[-1 for _ in range(self.cols)] for _ in range(self.rows)]
+        placement_info = {'paths': []}
+        for idx, path in enumerate(paths):
+            coords = [self.cells[cell] for cell in path]
+            for (r, c) in coords:
+                board[r][c] = idx + 1  # Use 1-based indices
+            placement_info['paths'].append(coords)
+        return board, placement_info
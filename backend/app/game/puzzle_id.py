@@ -0,0 +1,140 @@
+"""
+Compact puzzle IDs.
+
+A puzzle ID packs everything needed to regenerate a board: the words, the
+seed of the random.Random that generated it, the board shape and whether the
+special word spans the board (plus the theme, so a replayed game is complete).
+Regenerating with
+BoardGenerator(spangram=spangram).generate_board(special_word, words, rng=random.Random(seed), shape=shape)
+gives back the identical board.
+
+Layout, before base64url encoding without padding:
+    version    1 byte
+    shape      1 byte, rows in the high nibble and cols in the low one
+    flags      1 byte, bit 0 set if the special word spans the board (not in version 1 IDs)
+    seed       unsigned LEB128 varint
+    count      1 byte, number of words (the special word first)
+    lengths    1 byte per word
+    letters    every word's letters, a-z as 5 bits each, packed most significant bit first
+    theme      UTF-8, the rest of the bytes
+"""
+from typing import List, NamedTuple, Tuple
+import base64
+import re
+
+VERSION = 2
+# Flag bits
+SPANGRAM = 0x01
+_WORD = re.compile('[a-z]+')
+
+
+class Puzzle(NamedTuple):
+    special_word: str
+    words: List[str]
+    seed: int
+    shape: Tuple[int, int]
+    theme: str = ''
+    spangram: bool = False
+
+
+def _encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _decode_varint(data: bytes, position: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+def encode_puzzle_id(special_word: str, words: List[str], seed: int, shape: Tuple[int, int], theme: str = '',
+                     spangram: bool = False) -> str:
+    """
+    Encode a puzzle as a URL-safe ID. Words must be lowercase a-z, the seed
+    a non-negative int and rows and cols at most 15; raises ValueError otherwise.
+    """
+    all_words = [special_word] + list(words)
+    for word in all_words:
+        if not _WORD.fullmatch(word) or len(word) > 255:
+            raise ValueError(f"Word '{word}' cannot be encoded, puzzle IDs hold lowercase a-z words")
+    rows, cols = shape
+    if not (0 < rows < 16 and 0 < cols < 16):
+        raise ValueError(f"Board shape {shape} cannot be encoded")
+    if seed < 0:
+        raise ValueError("Seed must be non-negative")
+    if len(all_words) > 255:
+        raise ValueError("Too many words")
+
+    data = bytearray([VERSION, rows << 4 | cols, SPANGRAM if spangram else 0])
+    data += _encode_varint(seed)
+    data.append(len(all_words))
+    data += bytes(len(word) for word in all_words)
+
+    bits = nbits = 0
+    for letter in ''.join(all_words):
+        bits = bits << 5 | (ord(letter) - ord('a'))
+        nbits += 5
+        while nbits >= 8:
+            nbits -= 8
+            data.append(bits >> nbits & 0xFF)
+    if nbits:
+        data.append(bits << (8 - nbits) & 0xFF)
+
+    data += theme.encode('utf-8')
+    return base64.urlsafe_b64encode(bytes(data)).rstrip(b'=').decode('ascii')
+
+
+def decode_puzzle_id(puzzle_id: str) -> Puzzle:
+    """
+    Decode a puzzle ID from encode_puzzle_id. Version 1 IDs predate the flags
+    and decode as not spanning. Raises ValueError if it is malformed.
+    """
+    try:
+        data = base64.urlsafe_b64decode(puzzle_id + '=' * (-len(puzzle_id) % 4))
+        if data[0] not in (1, VERSION):
+            raise ValueError(f"Unknown puzzle ID version {data[0]}")
+        rows, cols = data[1] >> 4, data[1] & 0x0F
+        flags = data[2] if data[0] > 1 else 0
+        seed, position = _decode_varint(data, 3 if data[0] > 1 else 2)
+        count = data[position]
+        lengths = list(data[position + 1:position + 1 + count])
+        position += 1 + count
+        if len(lengths) != count or not count:
+            raise ValueError("Puzzle ID is truncated")
+
+        letters = []
+        bits = nbits = 0
+        while len(letters) < sum(lengths):
+            bits = bits << 8 | data[position]
+            position += 1
+            nbits += 8
+            while nbits >= 5 and len(letters) < sum(lengths):
+                nbits -= 5
+                letters.append(chr(ord('a') + (bits >> nbits & 0x1F)))
+            bits &= (1 << nbits) - 1
+
+        text = ''.join(letters)
+        if not _WORD.fullmatch(text):
+            raise ValueError("Puzzle ID holds invalid letters")
+        all_words = []
+        start = 0
+        for length in lengths:
+            all_words.append(text[start:start + length])
+            start += length
+        theme = data[position:].decode('utf-8')
+    except (IndexError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid puzzle ID: {str(e) or type(e).__name__}")
+    return Puzzle(all_words[0], all_words[1:], seed, (rows, cols), theme, bool(flags & SPANGRAM))
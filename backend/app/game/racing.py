@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Executor, as_completed
+import asyncio
+import logging
+import multiprocessing
+import random
+import threading
+
+from .board_generator import BoardGenerator
+from .partition_solver import PartitionSolver, SolverCancelled
+
+logger = logging.getLogger(__name__)
+
+# Per-process solvers for the shapes this worker has raced on
+_solvers: Dict[Tuple[int, int], PartitionSolver] = {}
+
+
+def _race_worker(lengths: List[int], shape: Tuple[int, int], seed: int, settings: tuple, stop) -> Optional[List[List[int]]]:
+    """Run one racer: a full solve with its own seed, stopping early once stop is set."""
+    solver = _solvers.get(shape)
+    if solver is None:
+        solver = _solvers[shape] = PartitionSolver(*shape)
+    ordering, node_budget, time_limit, span = settings
+    random.seed(seed)
+    try:
+        return solver.solve(lengths, ordering, node_budget, time_limit, stop, span=span)
+    except SolverCancelled:
+        return None
+
+
+class BoardRacer:
+    """
+    Races several independent partition solves in a process pool and keeps the
+    first success.
+
+    Randomized backtracking has a heavy-tailed runtime, so the fastest of N
+    seeds is far faster in the tail than one seed. Racers use different seeds
+    and, with allow_alternative_shapes, cycle through every board shape for the
+    total (see BoardGenerator.shapes_for). Once one finishes the rest are
+    cancelled through a shared stop event.
+    """
+
+    def __init__(self, executor: Executor, board_generator: BoardGenerator, racers: int = 4,
+                 allow_alternative_shapes: bool = False):
+        self.executor = executor
+        self.board_generator = board_generator
+        self.racers = racers
+        self.allow_alternative_shapes = allow_alternative_shapes
+        self._manager = None
+        # race() runs on executor threads, so the first concurrent races must not both start a manager
+        self._manager_lock = threading.Lock()
+
+    def _stop_event(self):
+        # A manager event can be pickled into pool tasks, unlike a plain multiprocessing.Event
+        with self._manager_lock:
+            if self._manager is None:
+                self._manager = multiprocessing.Manager()
+            return self._manager.Event()
+
+    def race(self, lengths: List[int]) -> Tuple[List[List[int]], dict]:
+        """Race solves for lengths and return the winner as a generate_board_with_lengths result."""
+        total_squares = sum(lengths)
+        if total_squares not in self.board_generator.valid_sizes:
+            raise ValueError(f"Total squares {total_squares} must match a valid board size")
+        shapes = self.board_generator.shapes_for(total_squares)
+        if not self.allow_alternative_shapes:
+            shapes = shapes[:1]
+        settings = (self.board_generator.ordering, self.board_generator.node_budget, self.board_generator.time_limit,
+                    0 if self.board_generator.spangram else None)
+
+        stop = self._stop_event()
+        futures = {
+            self.executor.submit(_race_worker, lengths, shapes[i % len(shapes)],
+                                 random.getrandbits(64), settings, stop): shapes[i % len(shapes)]
+            for i in range(self.racers)
+        }
+        error = None
+        try:
+            for future in as_completed(futures):
+                try:
+                    paths = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if paths is not None:
+                    rows, cols = futures[future]
+                    logger.debug(f"Racer on a {rows}x{cols} board won")
+                    return PartitionSolver(rows, cols).to_board(paths)
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+        if error is not None:
+            raise error
+        raise ValueError("Failed to generate a valid board with the given lengths")
+
+    async def arace(self, lengths: List[int]) -> Tuple[List[List[int]], dict]:
+        """race() without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.race, lengths)
+
+    def close(self):
+        with self._manager_lock:
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
@@ -0,0 +1,104 @@
+from typing import Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+import secrets
+import time
+
+PathKey = Tuple[int, ...]
+
+
+class GameSession:
+    """
+    One player's game: the answers indexed for constant-time guesses, and the
+    words found so far.
+
+    Every answer path is stored as a tuple of cell indices (row * cols + col),
+    both forwards and reversed, so checking a guess is one hash lookup.
+    """
+    __slots__ = ('rows', 'cols', 'special_word', 'words', 'answers', 'found', 'last_used')
+
+    def __init__(self, board: List[List[str]], special_word: str, words: List[str], placement_info: dict):
+        self.rows, self.cols = len(board), len(board[0])
+        self.special_word = special_word
+        self.words = words
+        self.answers: Dict[PathKey, str] = {}
+        placements = [placement_info['special_word']] + placement_info['words']
+        for placement in placements:
+            key = tuple(r * self.cols + c for (r, c) in placement['path'])
+            self.answers[key] = placement['word']
+            self.answers[key[::-1]] = placement['word']
+        self.found: Set[str] = set()
+        self.last_used = time.monotonic()
+
+    def path_key(self, path: List[Tuple[int, int]]) -> Optional[PathKey]:
+        """The lookup key for a selected path, or None if it leaves the board."""
+        key = []
+        for (r, c) in path:
+            if not (0 <= r < self.rows and 0 <= c < self.cols):
+                return None
+            key.append(r * self.cols + c)
+        return tuple(key)
+
+    def guess(self, path: List[Tuple[int, int]]) -> dict:
+        """Check a selected path and record the word if it is a new find."""
+        key = self.path_key(path)
+        word = self.answers.get(key) if key is not None else None
+        already_found = word in self.found
+        if word is not None:
+            self.found.add(word)
+        return {
+            'correct': word is not None,
+            'word': word,
+            'special': word is not None and word == self.special_word,
+            'already_found': already_found,
+            'found': sorted(self.found),
+            'complete': len(self.found) == len(self.words) + 1
+        }
+
+
+class SessionStore:
+    """
+    In-memory game sessions, expiring after ttl seconds without a guess and
+    bounded to max_size sessions, least recently used first out.
+
+    Sessions are kept in least recently used order, so expired ones are always
+    at the front and are dropped as new sessions arrive.
+
+    The store belongs to one process: with several server workers, a /guess
+    that reaches another worker than the one that created its session gets a
+    404. Serve session games from a single worker (or with sticky routing).
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, board: List[List[str]], special_word: str, words: List[str], placement_info: dict) -> str:
+        """Index a game's answers and return the new session's ID."""
+        now = time.monotonic()
+        self._evict(now)
+        session_id = secrets.token_urlsafe(16)
+        self._sessions[session_id] = GameSession(board, special_word, words, placement_info)
+        while len(self._sessions) > self.max_size:
+            self._sessions.popitem(last=False)
+        return session_id
+
+    def get(self, session_id: str) -> Optional[GameSession]:
+        """The live session for session_id, or None if it is unknown or has expired."""
+        now = time.monotonic()
+        self._evict(now)
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def _evict(self, now: float):
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_used < self.ttl:
+                return
+            self._sessions.popitem(last=False)
@@ -0,0 +1,57 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from collections import OrderedDict
+import asyncio
+import time
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one, and keeps results
+    for ttl seconds.
+
+    The first do() for a key starts func(); calls for that key made while it
+    runs await the same task instead of starting their own. A successful
+    result is then served to later calls until it expires. Failures are passed
+    to every waiting caller but never cached. At most max_size results are
+    kept, least recently used first out. A caller that is cancelled does not
+    cancel the shared task for the others.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 256):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        # key -> (expiry time, result)
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self):
+        """Forget every cached result; calls in flight are unaffected."""
+        self._results.clear()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self._results.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self._results.move_to_end(key)
+                return cached[1]
+            del self._results[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            return
+        self._results[key] = (time.monotonic() + self.ttl, task.result())
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
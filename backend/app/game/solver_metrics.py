@@ -0,0 +1,122 @@
+"""
+Solver stats aggregated per length profile.
+
+Every game generated with stats (see partition_solver.SolveStats) is recorded
+under its length profile, the word lengths sorted longest first, so the
+profiles that make the solver blow up stand out. Games count by where their
+partitions came from, but solver counts (nodes, restarts, depth, backtracks)
+are only averaged over the boards the solver actually ran for; cache, race
+and atlas hits would otherwise pull them towards zero:
+
+    GET /api/game/stats?sort=max_nodes&limit=10
+"""
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+LengthKey = Tuple[int, ...]
+
+# Orders summary() can sort profiles by, highest first
+SORT_KEYS = ('games', 'solves', 'mean_nodes', 'max_nodes', 'mean_restarts', 'mean_ms', 'max_ms')
+
+
+class ProfileStats:
+    """Running totals for one length profile."""
+    __slots__ = ('games', 'solves', 'sources', 'nodes', 'max_nodes', 'restarts', 'max_depth', 'backtracks',
+                 'phase_ms', 'max_ms')
+
+    def __init__(self):
+        self.games = 0
+        # Boards the solver ran for, and boards per partition source
+        self.solves = 0
+        self.sources: Dict[str, int] = {}
+        self.nodes = 0
+        self.max_nodes = 0
+        self.restarts = 0
+        self.max_depth = 0
+        # Backtracks summed by the length of the worm they happened in
+        self.backtracks: Dict[int, int] = {}
+        self.phase_ms: Dict[str, float] = {}
+        self.max_ms = 0.0
+
+    def add(self, lengths: List[int], stats: dict):
+        """Add a SolveStats.to_dict(); backtracks are per worm in the order of lengths."""
+        self.games += 1
+        for source, count in stats['sources'].items():
+            self.sources[source] = self.sources.get(source, 0) + count
+        solves = stats['sources'].get('solve', 0)
+        if solves:
+            self.solves += solves
+            self.nodes += stats['nodes']
+            self.max_nodes = max(self.max_nodes, stats['nodes'])
+            self.restarts += stats['restarts']
+            self.max_depth = max(self.max_depth, stats['max_depth'])
+            for length, count in zip(lengths, stats['backtracks']):
+                if count:
+                    self.backtracks[length] = self.backtracks.get(length, 0) + count
+        for phase, ms in stats['phase_ms'].items():
+            self.phase_ms[phase] = self.phase_ms.get(phase, 0.0) + ms
+        self.max_ms = max(self.max_ms, sum(stats['phase_ms'].values()))
+
+    def summary(self) -> dict:
+        return {
+            'games': self.games,
+            'solves': self.solves,
+            'sources': dict(self.sources),
+            'mean_nodes': round(self.nodes / self.solves, 1) if self.solves else 0.0,
+            'max_nodes': self.max_nodes,
+            'mean_restarts': round(self.restarts / self.solves, 3) if self.solves else 0.0,
+            'max_depth': self.max_depth,
+            'backtracks_by_length': {str(length): count for length, count in sorted(self.backtracks.items())},
+            'mean_phase_ms': {phase: round(ms / self.games, 3) for phase, ms in self.phase_ms.items()},
+            'mean_ms': round(sum(self.phase_ms.values()) / self.games, 3),
+            'max_ms': round(self.max_ms, 3)
+        }
+
+
+class SolverMetrics:
+    """
+    In-memory ProfileStats for up to max_profiles length profiles, the least
+    recently seen profile dropped first.
+    """
+
+    def __init__(self, max_profiles: int = 1000):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[LengthKey, ProfileStats]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def record(self, lengths: List[int], stats: dict):
+        """Add one generation's SolveStats.to_dict() for a game with these word lengths."""
+        key = tuple(sorted(lengths, reverse=True))
+        profile = self._profiles.get(key)
+        if profile is None:
+            profile = self._profiles[key] = ProfileStats()
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        else:
+            self._profiles.move_to_end(key)
+        profile.add(lengths, stats)
+
+    def summary(self, sort: str = 'max_nodes', limit: int = 20) -> dict:
+        """Totals over every profile, and the top limit profiles by sort (see SORT_KEYS)."""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}', expected one of {SORT_KEYS}")
+        profiles = [{'lengths': list(key), **profile.summary()} for key, profile in self._profiles.items()]
+        profiles.sort(key=lambda profile: profile[sort], reverse=True)
+        games = sum(profile.games for profile in self._profiles.values())
+        solves = sum(profile.solves for profile in self._profiles.values())
+        sources: Dict[str, int] = {}
+        for profile in self._profiles.values():
+            for source, count in profile.sources.items():
+                sources[source] = sources.get(source, 0) + count
+        return {
+            'games': games,
+            'solves': solves,
+            'sources': sources,
+            'profiles_seen': len(self._profiles),
+            'mean_nodes': round(sum(p.nodes for p in self._profiles.values()) / solves, 1) if solves else 0.0,
+            'max_nodes': max((p.max_nodes for p in self._profiles.values()), default=0),
+            'restarts': sum(p.restarts for p in self._profiles.values()),
+            'profiles': profiles[:limit]
+        }
@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, List, Optional
+
+
+class IncrementalResponseParser:
+    """
+    Incremental parser for a streamed word-set completion.
+
+    Feed it text chunks as they arrive. It watches the 'Special Word:' and
+    'Words:' lines and reports when the rest of the stream is no longer needed:
+    either the word set is complete, or it can already be rejected. The full
+    text received so far is kept in .text for the usual _parse_response.
+    """
+
+    def __init__(self, valid_sizes: Iterable[int], min_special_length: int = 8, min_words: int = 5,
+                 min_special_lengths: Optional[Dict[int, int]] = None):
+        self.max_size = max(valid_sizes)
+        self.valid_sizes = set(valid_sizes)
+        self.min_special_length = min_special_length
+        # Shortest special word per board size, for special words that span the board
+        self.min_special_lengths = min_special_lengths
+        self.min_words = min_words
+        self.text = ''
+        self.special_word: Optional[str] = None
+        self.words: Optional[List[str]] = None
+        self._line_start = 0
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Add a chunk of the completion. Returns True once enough has been received.
+        Raises ValueError as soon as the response can no longer be valid.
+        """
+        self.text += chunk
+        while True:
+            end = self.text.find('\n', self._line_start)
+            if end == -1:
+                break
+            line = self.text[self._line_start:end].strip()
+            self._line_start = end + 1
+            if self._complete_line(line):
+                return True
+
+        # Check the words of an unfinished Words: line as they come in
+        partial = self.text[self._line_start:].strip()
+        if partial.startswith('Words:'):
+            items = partial.replace('Words:', '').split(',')
+            self._check_reachable([w.strip() for w in items[:-1]])
+        return False
+
+    def _complete_line(self, line: str) -> bool:
+        if line.startswith('Special Word:'):
+            self.special_word = line.replace('Special Word:', '').strip()
+            if len(self.special_word) < self.min_special_length:
+                raise ValueError(f"Special word '{self.special_word}' is too short "
+                                 f"(must be at least {self.min_special_length} letters)")
+            if self.min_special_lengths is not None:
+                # Only the boards the special word can span are left
+                self.valid_sizes = {size for size in self.valid_sizes
+                                    if len(self.special_word) >= self.min_special_lengths[size]}
+                if not self.valid_sizes:
+                    raise ValueError(f"Special word '{self.special_word}' is too short to span any board")
+                self.max_size = max(self.valid_sizes)
+        elif line.startswith('Words:'):
+            self.words = [w.strip() for w in line.replace('Words:', '').split(',')]
+            if len(self.words) < self.min_words:
+                raise ValueError(f"Not enough theme words (got {len(self.words)}, need at least {self.min_words})")
+            self._check_reachable(self.words)
+            # A valid total needs nothing more; otherwise wait for the alternates used for repairs
+            return self.special_word is not None and self._total(self.words) in self.valid_sizes
+        elif line.startswith('Alternates:') and self.words is not None:
+            return True
+        return False
+
+    def _total(self, words: List[str]) -> int:
+        return len(self.special_word) + sum(len(word) for word in words)
+
+    def _check_reachable(self, words: List[str]):
+        """Reject once even the shortest allowed selection of words exceeds every board size."""
+        if self.special_word is None or len(words) < self.min_words:
+            return
+        shortest = sorted(len(word) for word in words)[:self.min_words]
+        if len(self.special_word) + sum(shortest) > self.max_size:
+            raise ValueError(f"Letter total can no longer reach a valid size (over {self.max_size})")
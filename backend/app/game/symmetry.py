@@ -0,0 +1,77 @@
+from typing import Callable, Dict, Iterator, List, Tuple
+
+Cell = Tuple[int, int]
+
+# Symmetries of the rectangle, as (r, c, rows, cols) -> (r', c')
+SYMMETRIES: Dict[str, Callable[[int, int, int, int], Cell]] = {
+    'identity': lambda r, c, rows, cols: (r, c),
+    'rotate180': lambda r, c, rows, cols: (rows - 1 - r, cols - 1 - c),
+    'mirror_horizontal': lambda r, c, rows, cols: (r, cols - 1 - c),
+    'mirror_vertical': lambda r, c, rows, cols: (rows - 1 - r, c),
+    # The rest swap rows and columns, so they only keep square boards the same shape
+    'rotate90': lambda r, c, rows, cols: (c, rows - 1 - r),
+    'rotate270': lambda r, c, rows, cols: (cols - 1 - c, r),
+    'transpose': lambda r, c, rows, cols: (c, r),
+    'anti_transpose': lambda r, c, rows, cols: (cols - 1 - c, rows - 1 - r),
+}
+SHAPE_PRESERVING = ('identity', 'rotate180', 'mirror_horizontal', 'mirror_vertical')
+
+
+def symmetries_for(rows: int, cols: int) -> Tuple[str, ...]:
+    """Names of the symmetries that map a rows x cols board onto itself: 8 if square, else 4."""
+    return tuple(SYMMETRIES) if rows == cols else SHAPE_PRESERVING
+
+
+def transform_path(path: List[Cell], symmetry: str, rows: int, cols: int) -> List[Cell]:
+    transform = SYMMETRIES[symmetry]
+    return [transform(r, c, rows, cols) for (r, c) in path]
+
+
+def transform_paths(paths: List[List[Cell]], symmetry: str, rows: int, cols: int) -> List[List[Cell]]:
+    return [transform_path(path, symmetry, rows, cols) for path in paths]
+
+
+def transform_board(board: List[list], symmetry: str) -> List[list]:
+    """Apply a symmetry to a grid of worm ids or letters."""
+    rows, cols = len(board), len(board[0])
+    transform = SYMMETRIES[symmetry]
+    new_rows, new_cols = (rows, cols) if symmetry in SHAPE_PRESERVING else (cols, rows)
+    result = [[None] * new_cols for _ in range(new_rows)]
+    for r in range(rows):
+        for c in range(cols):
+            nr, nc = transform(r, c, rows, cols)
+            result[nr][nc] = board[r][c]
+    return result
+
+
+def transform_placement_info(placement_info: dict, symmetry: str, rows: int, cols: int) -> dict:
+    """
+    Apply a symmetry to every path in placement_info. Handles both the
+    generate_board_with_lengths form ({'paths': [...]}) and the generate_board
+    form ({'special_word': {'path': ...}, 'words': [{'path': ...}]}).
+    """
+    if 'paths' in placement_info:
+        return {**placement_info, 'paths': transform_paths(placement_info['paths'], symmetry, rows, cols)}
+    return {
+        **placement_info,
+        'special_word': {
+            **placement_info['special_word'],
+            'path': transform_path(placement_info['special_word']['path'], symmetry, rows, cols)
+        },
+        'words': [
+            {**entry, 'path': transform_path(entry['path'], symmetry, rows, cols)}
+            for entry in placement_info['words']
+        ]
+    }
+
+
+def transform_solution(board: List[list], placement_info: dict, symmetry: str) -> Tuple[List[list], dict]:
+    """Apply a symmetry to a (board, placement_info) pair."""
+    rows, cols = len(board), len(board[0])
+    return transform_board(board, symmetry), transform_placement_info(placement_info, symmetry, rows, cols)
+
+
+def solution_variants(board: List[list], placement_info: dict) -> Iterator[Tuple[List[list], dict]]:
+    """Yield the solution under every symmetry of its board shape, starting with the identity."""
+    for symmetry in symmetries_for(len(board), len(board[0])):
+        yield transform_solution(board, placement_info, symmetry)
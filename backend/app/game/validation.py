@@ -0,0 +1,163 @@
+"""
+Vectorized checks for batches of finished boards.
+
+Every board in a batch is flattened into one array of cell values and every
+path step into one array of (row, col) cells, so the checks run as a handful
+of NumPy operations over the whole batch instead of Python loops per board.
+Boards of different shapes can be mixed in one batch.
+
+Checks, each a bool array with one entry per board (True = passed):
+  shape       every row has the same length
+  coverage    each path cell is on the board and every cell is on exactly one path
+  contiguity  consecutive cells of a path are 8-neighbors (steps within +-1)
+  letters     path lengths match their words and the cells along each path
+              spell its word (or hold its worm ID, for validate_layouts)
+"""
+from itertools import chain
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+CHECKS = ('shape', 'coverage', 'contiguity', 'letters')
+
+
+class Validation(NamedTuple):
+    shape: np.ndarray
+    coverage: np.ndarray
+    contiguity: np.ndarray
+    letters: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        """True for boards that passed every check."""
+        return self.shape & self.coverage & self.contiguity & self.letters
+
+    def errors(self, index: int) -> List[str]:
+        """The names of the checks board index failed."""
+        return [check for check in CHECKS if not getattr(self, check)[index]]
+
+
+def _board_shape(board: Sequence[Sequence]) -> Tuple[int, int]:
+    """(rows, cols) of a rectangular, non-empty board, else (0, 0)."""
+    if not board or not board[0] or len(set(map(len, board))) != 1:
+        return 0, 0
+    return len(board), len(board[0])
+
+
+def _validate(shapes: List[Tuple[int, int]], values: np.ndarray, paths: List[List[Sequence]],
+              expected: np.ndarray, word_lengths: np.ndarray) -> Validation:
+    """
+    Run the checks over flattened boards. values holds every board's cells in
+    row-major order, one board after another; paths[b] lists board b's paths;
+    expected holds the value each path step should read, in path order, and
+    word_lengths the length each path should have.
+    """
+    n = len(shapes)
+    shape_arr = np.array(shapes, dtype=np.int64).reshape(n, 2)
+    sizes = shape_arr[:, 0] * shape_arr[:, 1]
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    path_lengths = np.fromiter((len(path) for board in paths for path in board), dtype=np.int64)
+    paths_per_board = np.fromiter((len(board) for board in paths), dtype=np.int64, count=n)
+    if len(word_lengths) != len(path_lengths):
+        raise ValueError(f"Expected {len(path_lengths)} word lengths, one per path, got {len(word_lengths)}")
+    steps = int(path_lengths.sum())
+    cells = np.fromiter(
+        chain.from_iterable(chain.from_iterable(chain.from_iterable(paths))), dtype=np.int64, count=2 * steps
+    ).reshape(steps, 2)
+    rows, cols = cells[:, 0], cells[:, 1]
+
+    # Board and path of every step, and whether it starts a path
+    path_board = np.repeat(np.arange(n), paths_per_board)
+    step_board = np.repeat(path_board, path_lengths)
+    starts = np.zeros(steps, dtype=bool)
+    starts[np.cumsum(path_lengths)[:-1][path_lengths[1:] > 0]] = True
+    if steps:
+        starts[0] = True
+
+    board_rows, board_cols = shape_arr[step_board, 0], shape_arr[step_board, 1]
+    inside = (rows >= 0) & (rows < board_rows) & (cols >= 0) & (cols < board_cols)
+    index = offsets[step_board] + np.where(inside, rows * board_cols + cols, 0)
+
+    def per_board(mask: np.ndarray, owners: np.ndarray) -> np.ndarray:
+        return np.bincount(owners[mask], minlength=n)
+
+    shape_ok = sizes > 0
+    counts = np.bincount(index[inside], minlength=int(sizes.sum()))
+    cell_board = np.repeat(np.arange(n), sizes)
+    coverage_ok = (shape_ok
+                   & (per_board(counts != 1, cell_board) == 0)
+                   & (per_board(~inside, step_board) == 0))
+
+    jump = np.maximum(np.abs(np.diff(rows)), np.abs(np.diff(cols))) != 1
+    contiguity_ok = shape_ok & (per_board(jump & ~starts[1:], step_board[1:]) == 0)
+
+    wrong_value = np.zeros(steps, dtype=bool)
+    wrong_value[inside] = values[index[inside]] != expected[inside]
+    letters_ok = (shape_ok
+                  & (per_board(wrong_value, step_board) == 0)
+                  & (per_board(path_lengths != word_lengths, path_board) == 0))
+
+    return Validation(shape_ok, coverage_ok, contiguity_ok, letters_ok)
+
+
+def _codes(text: str) -> np.ndarray:
+    """One integer code point per character."""
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+
+
+def validate_boards(boards: Sequence[List[List[str]]], placement_infos: Iterable[dict]) -> Validation:
+    """
+    Check a batch of generate_board results: boards[i] with placement_infos[i]
+    ({'special_word': {'word', 'path'}, 'words': [...]}, as JSON or as returned).
+    Letters are compared case-insensitively.
+    """
+    shapes, texts, paths, words, word_lengths = [], [], [], [], []
+    for board, placement_info in zip(boards, placement_infos):
+        placements = [placement_info['special_word']] + placement_info['words']
+        board_paths = [placement['path'] for placement in placements]
+        board_words = [placement['word'] for placement in placements]
+        text = ''.join(map(''.join, board))
+        shape = _board_shape(board)
+        if len(text) != shape[0] * shape[1]:
+            shape, text = (0, 0), ''
+        shapes.append(shape)
+        texts.append(text)
+        paths.append(board_paths)
+        word_lengths.extend(map(len, board_words))
+        word_text = ''.join(board_words)
+        steps = sum(map(len, board_paths))
+        if len(word_text) != steps:
+            # Keep later boards aligned; this one fails the letters check anyway
+            word_text = word_text[:steps].ljust(steps, '\0')
+        words.append(word_text)
+
+    return _validate(shapes, _codes(''.join(texts).lower()), paths, _codes(''.join(words).lower()),
+                     np.array(word_lengths, dtype=np.int64))
+
+
+def validate_layouts(layouts: Sequence[List[List[int]]], placement_infos: Iterable[dict],
+                     lengths: Optional[Iterable[Sequence[int]]] = None) -> Validation:
+    """
+    Check a batch of generate_board_with_lengths results: layouts[i] holds
+    worm IDs (1 for paths[0], 2 for paths[1], ...) and placement_infos[i] is
+    {'paths': [...]}. The letters check compares worm IDs, and the path
+    lengths against lengths[i], the lengths that were asked for, if given.
+    """
+    shapes, values, paths, expected = [], [], [], []
+    for layout, placement_info in zip(layouts, placement_infos):
+        shape = _board_shape(layout)
+        shapes.append(shape)
+        if shape[0]:
+            values.extend(chain.from_iterable(layout))
+        board_paths = placement_info['paths']
+        paths.append(board_paths)
+        for worm, path in enumerate(board_paths, 1):
+            expected.extend([worm] * len(path))
+
+    if lengths is None:
+        word_lengths = np.fromiter((len(path) for board in paths for path in board), dtype=np.int64)
+    else:
+        word_lengths = np.fromiter(chain.from_iterable(lengths), dtype=np.int64)
+    return _validate(shapes, np.array(values, dtype=np.int64), paths, np.array(expected, dtype=np.int64),
+                     word_lengths)
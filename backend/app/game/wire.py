@@ -0,0 +1,77 @@
+"""
+Compact wire format for games.
+
+The default response sends the board as a nested list of one-letter strings
+and every path as [row, col] pairs next to a copy of its word. The compact
+form sends the same game as
+
+    {
+        "format": "compact",
+        "theme": ..., "special_word": ..., "words": [...],
+        "rows": 6, "cols": 6,
+        "board": "CLOCK...",          # row-major, one character per cell
+        "paths": [[0, 7, 13, ...]],   # cell indices (row * cols + col), special word first
+        "puzzle_id": ...,             # when present
+        "session_id": ...,            # when present, with empty paths
+        "stats": {...}                # solver stats, when asked for
+    }
+
+frontend/src/types/game.ts decodes it back into the default shape.
+"""
+from typing import Any, Dict, List, Optional
+
+COMPACT_MEDIA_TYPE = 'application/vnd.strands.compact+json'
+
+
+def wants_compact(format: Optional[str], accept: Optional[str]) -> bool:
+    """Whether a request asked for the compact form, by ?format=compact or its Accept header."""
+    if format is not None:
+        return format == 'compact'
+    return bool(accept) and COMPACT_MEDIA_TYPE in accept
+
+
+def compact_game(theme: str, special_word: str, words: List[str], board: List[List[str]],
+                 placement_info: dict, puzzle_id: Optional[str] = None,
+                 session_id: Optional[str] = None, stats: Optional[dict] = None) -> Dict[str, Any]:
+    """Encode a game (as returned by /generate) in the compact form."""
+    cols = len(board[0])
+    paths = []
+    if placement_info:
+        paths = [placement_info['special_word']['path']] + [entry['path'] for entry in placement_info['words']]
+    game = {
+        'format': 'compact',
+        'theme': theme,
+        'special_word': special_word,
+        'words': words,
+        'rows': len(board),
+        'cols': cols,
+        'board': ''.join(''.join(row) for row in board),
+        'paths': [[r * cols + c for (r, c) in path] for path in paths]
+    }
+    if puzzle_id is not None:
+        game['puzzle_id'] = puzzle_id
+    if session_id is not None:
+        game['session_id'] = session_id
+    if stats is not None:
+        game['stats'] = stats
+    return game
+
+
+def expand_game(game: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode the compact form back into the default one."""
+    rows, cols, letters = game['rows'], game['cols'], game['board']
+    paths = [[divmod(cell, cols) for cell in path] for path in game['paths']]
+    expanded = {
+        'theme': game['theme'],
+        'special_word': game['special_word'],
+        'words': game['words'],
+        'board': [list(letters[r * cols:(r + 1) * cols]) for r in range(rows)],
+        'placement_info': {
+            'special_word': {'word': game['special_word'], 'path': paths[0]},
+            'words': [{'word': word, 'path': path} for word, path in zip(game['words'], paths[1:])]
+        } if paths else {}
+    }
+    for key in ('puzzle_id', 'session_id', 'stats'):
+        if key in game:
+            expanded[key] = game[key]
+    return expanded
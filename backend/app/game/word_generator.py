@@ -1,49 +1,189 @@
-from typing import Dict, Set, List
+from typing import AsyncIterator, Dict, Set, List, Optional
 import os
+import asyncio
 from abc import ABC, abstractmethod
-from anthropic import Anthropic, HUMAN_PROMPT, AI_PROMPT
+from anthropic import Anthropic, AsyncAnthropic, HUMAN_PROMPT, AI_PROMPT
+from .client_pool import AsyncClientPool
+from .word_repair import repair_word_set
+from .stream_parser import IncrementalResponseParser
 
-class BaseWordGenerator(ABC):
-    """Abstract base class for word generators."""
-    def __init__(self):
+class WordSource(ABC):
+    """Anything that produces themed word sets whose total letter count fits a board."""
+    def __init__(self, min_special_lengths: Optional[Dict[int, int]] = None):
         self.valid_sizes = {36, 42, 48, 49, 54, 56, 60, 63, 64, 70, 72, 77, 80, 81, 90, 100}
+        # Shortest special word per board size, when the special word has to
+        # span the board (see BoardGenerator.min_special_lengths)
+        self.min_special_lengths = min_special_lengths
+
+    def sizes_for(self, special_word: str) -> Set[int]:
+        """The board sizes a word set with this special word may total."""
+        if self.min_special_lengths is None:
+            return self.valid_sizes
+        return {size for size in self.valid_sizes if len(special_word) >= self.min_special_lengths[size]}
+
+    @abstractmethod
+    def generate_word_set(self, seed_word: str = None) -> Dict[str, str]:
+        """Return a {'theme', 'special_word', 'words'} set, themed on seed_word if given."""
+
+    @abstractmethod
+    async def agenerate_word_set(self, seed_word: str = None, fanout: int = 1, stream: bool = False) -> Dict[str, str]:
+        """generate_word_set without blocking the event loop."""
+
+class BaseWordGenerator(WordSource):
+    """Abstract base class for LLM word generators."""
 
     @abstractmethod
     def generate_completion(self, prompt: str) -> str:
         """Generate a completion from the LLM."""
         pass
 
+    async def agenerate_completion(self, prompt: str) -> str:
+        """
+        Generate a completion from the LLM without blocking the event loop.
+        Subclasses with an async client should override this; by default the
+        blocking generate_completion runs in a worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate_completion, prompt)
+
+    async def astream_completion(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Yield the completion in chunks as the LLM produces it.
+        Defaults to a single chunk from agenerate_completion.
+        """
+        yield await self.agenerate_completion(prompt)
+
+    async def agenerate_streamed_completion(self, prompt: str) -> str:
+        """
+        Stream a completion through IncrementalResponseParser and stop reading
+        as soon as the word set is complete. Raises ValueError mid-stream when
+        the response can already be rejected.
+        """
+        parser = IncrementalResponseParser(self.valid_sizes, min_special_lengths=self.min_special_lengths)
+        stream = self.astream_completion(prompt)
+        try:
+            async for chunk in stream:
+                if parser.feed(chunk):
+                    break
+        finally:
+            await stream.aclose()
+        return parser.text
+
     def generate_word_set(self, seed_word: str = None) -> Dict[str, str]:
         """Generate a themed set of words for the game."""
         max_attempts = 5
+        last_error = None
         for attempt in range(max_attempts):
             try:
                 prompt = self._create_prompt(seed_word, attempt > 0)
                 print(f"Attempt {attempt + 1}: Sending prompt to LLM")
                 
                 response = self.generate_completion(prompt)
-                print(f"Raw LLM response: {response}")
-                
-                result = self._parse_response(response)
-                print(f"Parsed result: {result}")
+                result = self._check_response(response)
+                if result is not None:
+                    return result
                 
-                # Validate total letter count
-                total_letters = len(result['special_word']) + sum(len(word) for word in result['words'])
-                print(f"Total letters: {total_letters}")
+            except Exception as e:
+                print(f"Error in word generation attempt {attempt + 1}: {str(e)}")
+                last_error = e
+        raise self._attempts_failed(max_attempts, last_error)
+
+    async def agenerate_word_set(self, seed_word: str = None, fanout: int = 1, stream: bool = False) -> Dict[str, str]:
+        """
+        Async version of generate_word_set, using agenerate_completion.
+        With fanout > 1, each attempt sends that many completions at once and
+        keeps the first valid word set. With stream, completions are parsed
+        while they arrive and cut off early (see agenerate_streamed_completion).
+        """
+        max_attempts = 5
+        if fanout > 1:
+            return await self._agenerate_word_set_fanout(seed_word, fanout, max_attempts, stream)
+        last_error = None
+        for attempt in range(max_attempts):
+            try:
+                prompt = self._create_prompt(seed_word, attempt > 0)
+                print(f"Attempt {attempt + 1}: Sending prompt to LLM")
                 
-                if total_letters in self.valid_sizes:
+                response = await self._afetch_completion(prompt, stream)
+                result = self._check_response(response)
+                if result is not None:
                     return result
-                else:
-                    closest_size = min(self.valid_sizes, key=lambda x: abs(x - total_letters))
-                    print(f"Invalid total letter count ({total_letters}). "
-                          f"Closest valid size is {closest_size}. Retrying...")
-                    continue
                 
             except Exception as e:
                 print(f"Error in word generation attempt {attempt + 1}: {str(e)}")
-                if attempt == max_attempts - 1:
-                    raise Exception(f"Failed to generate valid words after {max_attempts} attempts: {str(e)}")
-                continue
+                last_error = e
+        raise self._attempts_failed(max_attempts, last_error)
+
+    async def _agenerate_word_set_fanout(self, seed_word: str, fanout: int, max_attempts: int,
+                                         stream: bool = False) -> Dict[str, str]:
+        """
+        Send completions in waves of fanout concurrent requests, checking each
+        response as soon as it arrives. The first valid word set wins and the
+        rest of its wave is cancelled. Stops after max_attempts completions
+        (rounded up to whole waves).
+        """
+        waves = -(-max_attempts // fanout)
+        last_error = None
+        for wave in range(waves):
+            prompt = self._create_prompt(seed_word, wave > 0)
+            print(f"Wave {wave + 1}: Sending {fanout} prompts to LLM")
+            tasks = [asyncio.ensure_future(self._afetch_completion(prompt, stream)) for _ in range(fanout)]
+            try:
+                for completion in asyncio.as_completed(tasks):
+                    try:
+                        result = self._check_response(await completion)
+                    except Exception as e:
+                        print(f"Error in word generation wave {wave + 1}: {str(e)}")
+                        last_error = e
+                        continue
+                    if result is not None:
+                        return result
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        raise self._attempts_failed(waves * fanout, last_error)
+
+    @staticmethod
+    def _attempts_failed(attempts: int, last_error: Optional[Exception]) -> Exception:
+        """The error for running out of attempts, whether they raised or only had invalid totals."""
+        reason = str(last_error) if last_error is not None else "no completion had a valid letter total"
+        return Exception(f"Failed to generate valid words after {attempts} attempts: {reason}")
+
+    async def _afetch_completion(self, prompt: str, stream: bool) -> str:
+        if stream:
+            return await self.agenerate_streamed_completion(prompt)
+        return await self.agenerate_completion(prompt)
+
+    def _check_response(self, response: str) -> Optional[Dict[str, str]]:
+        """Parse a completion and return it if its total letter count is valid, else None."""
+        print(f"Raw LLM response: {response}")
+        
+        result = self._parse_response(response)
+        print(f"Parsed result: {result}")
+        
+        # Validate total letter count
+        total_letters = len(result['special_word']) + sum(len(word) for word in result['words'])
+        print(f"Total letters: {total_letters}")
+        
+        alternates = result.pop('alternates', [])
+        valid_sizes = self.sizes_for(result['special_word'])
+        if not valid_sizes:
+            print(f"Special word '{result['special_word']}' is too short to span any board. Retrying...")
+            return None
+        if total_letters in valid_sizes:
+            return result
+        
+        # Most bad totals are one word off, so try dropping or swapping words locally first
+        repaired = repair_word_set(result['special_word'], result['words'], valid_sizes, alternates)
+        if repaired is not None:
+            print(f"Repaired word list to {repaired} instead of re-prompting")
+            result['words'] = repaired
+            return result
+        closest_size = min(valid_sizes, key=lambda x: abs(x - total_letters))
+        print(f"Invalid total letter count ({total_letters}). "
+              f"Closest valid size is {closest_size}. Retrying...")
+        return None
 
     def _create_prompt(self, seed_word: str = None, is_retry: bool = False) -> str:
         """Create the prompt for the LLM."""
@@ -89,7 +229,8 @@ Words: gear, dial, hands, tick, chime, wind
 Please provide:
 Theme: [educational theme]
 Special Word: [thematic word 8-15 letters]
-Words: [5-7 related words]"""
+Words: [5-7 related words]
+Alternates: [3 more related words of 3-8 letters, used if the total needs adjusting]"""
         
         if is_retry:
             base_prompt += "\n\nPrevious words didn't match required letter counts. Please try again with words that sum to one of the valid total sizes."
@@ -113,6 +254,9 @@ Words: [5-7 related words]"""
                 elif line.startswith('Words:'):
                     words = line.replace('Words:', '').strip()
                     result['words'] = [w.strip() for w in words.split(',')]
+                elif line.startswith('Alternates:'):
+                    alternates = line.replace('Alternates:', '').strip()
+                    result['alternates'] = [w.strip() for w in alternates.split(',') if w.strip()]
             
             # Validate the response
             if not all(key in result for key in ['theme', 'special_word', 'words']):
@@ -131,26 +275,58 @@ Words: [5-7 related words]"""
             print(f"Error parsing LLM response: {str(e)}")  # Log the error
             raise Exception(f"Failed to parse LLM response: {str(e)}")
 
+# Async Anthropic clients shared by every request, one per API key
+anthropic_clients = AsyncClientPool(lambda api_key: AsyncAnthropic(api_key=api_key))
+
 class AnthropicWordGenerator(BaseWordGenerator):
     """Word generator using Anthropic's Claude API."""
-    def __init__(self, api_key: str = None):
-        super().__init__()
+    def __init__(self, api_key: str = None, client_pool: AsyncClientPool = None,
+                 min_special_lengths: Optional[Dict[int, int]] = None):
+        super().__init__(min_special_lengths)
         if not api_key:
             api_key = os.getenv("ANTHROPIC_API_KEY")
             if not api_key:
                 raise ValueError("No API key provided and ANTHROPIC_API_KEY environment variable is not set")
-        self.client = Anthropic(api_key=api_key)
+        self.api_key = api_key
+        self.client_pool = client_pool if client_pool is not None else anthropic_clients
+        self._client = None
 
-    def generate_completion(self, prompt: str) -> str:
-        """Generate a completion using Anthropic's Claude API."""
-        response = self.client.completions.create(
+    @property
+    def client(self) -> Anthropic:
+        """Blocking client, only built if the sync path is used."""
+        if self._client is None:
+            self._client = Anthropic(api_key=self.api_key)
+        return self._client
+
+    def _completion_params(self, prompt: str) -> dict:
+        return dict(
             prompt=f"{HUMAN_PROMPT} {prompt} {AI_PROMPT}",
             model="claude-2.1",
             max_tokens_to_sample=1024,
             stop_sequences=[HUMAN_PROMPT]
         )
+
+    def generate_completion(self, prompt: str) -> str:
+        """Generate a completion using Anthropic's Claude API."""
+        response = self.client.completions.create(**self._completion_params(prompt))
+        return response.completion
+
+    async def agenerate_completion(self, prompt: str) -> str:
+        """Generate a completion with a pooled async client, reusing its connections."""
+        async with self.client_pool.client(self.api_key) as client:
+            response = await client.completions.create(**self._completion_params(prompt))
         return response.completion
 
+    async def astream_completion(self, prompt: str) -> AsyncIterator[str]:
+        """Stream a completion with a pooled async client, closing the response if the caller stops early."""
+        async with self.client_pool.client(self.api_key) as client:
+            stream = await client.completions.create(**self._completion_params(prompt), stream=True)
+            try:
+                async for event in stream:
+                    yield event.completion
+            finally:
+                await stream.response.aclose()
+
 # Example of how to add a new LLM implementation:
 """
 class OpenAIWordGenerator(BaseWordGenerator):
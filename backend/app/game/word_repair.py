@@ -0,0 +1,51 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Keeping an original word always outweighs the alternates used (at most 7 words are chosen)
+KEEP_SCORE = 16
+ALTERNATE_SCORE = -1
+
+
+def repair_word_set(special_word: str, words: List[str], valid_sizes: Iterable[int],
+                    alternates: List[str] = (), min_words: int = 5, max_words: int = 7) -> Optional[List[str]]:
+    """
+    Pick theme words so the total letter count lands on a valid board size.
+
+    Chooses between min_words and max_words words from words plus alternates so
+    that len(special_word) plus their lengths is in valid_sizes. Keeps as many of
+    the original words as possible, then uses as few alternates as possible, and
+    returns the choice in its original order, or None if no choice works.
+
+    This is a subset sum over (word count, letter total) states, so it runs in
+    microseconds for the dozen or so candidates an LLM response holds.
+    """
+    seen = set()
+    candidates: List[Tuple[str, int]] = []  # (word, score for keeping it)
+    for word in words:
+        if word.lower() not in seen:
+            seen.add(word.lower())
+            candidates.append((word, KEEP_SCORE))
+    for word in alternates:
+        if word and word.lower() not in seen:
+            seen.add(word.lower())
+            candidates.append((word, ALTERNATE_SCORE))
+
+    targets = {size - len(special_word) for size in valid_sizes}
+    # (word count, letter total) -> (best score, bitmask of chosen candidates)
+    best: Dict[Tuple[int, int], Tuple[int, int]] = {(0, 0): (0, 0)}
+    max_total = max(targets, default=0)
+    for i, (word, score) in enumerate(candidates):
+        for (count, total), (state_score, chosen) in list(best.items()):
+            key = (count + 1, total + len(word))
+            if key[0] > max_words or key[1] > max_total:
+                continue
+            if key not in best or best[key][0] < state_score + score:
+                best[key] = (state_score + score, chosen | (1 << i))
+
+    solutions = [
+        state for (count, total), state in best.items()
+        if count >= min_words and total in targets
+    ]
+    if not solutions:
+        return None
+    _, chosen = max(solutions)
+    return [word for i, (word, _) in enumerate(candidates) if chosen >> i & 1]
@@ -0,0 +1,48 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import random
+from .board_generator import BoardGenerator
+from .partition_solver import SolveStats
+
+# Per-process generator, set up once by the pool initializer
+_board_generator: Optional[BoardGenerator] = None
+
+
+def _init_worker(board_generator: BoardGenerator):
+    """Store the generator pickled over from the parent process."""
+    global _board_generator
+    _board_generator = board_generator
+
+
+def create_board_pool(board_generator: BoardGenerator, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool for CPU-bound board solving.
+    Every worker gets its own copy of board_generator (and its precomputed
+    solvers) once at startup instead of with every task.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(board_generator,)
+    )
+
+
+def generate_board(special_word: str, words: List[str], seed: Optional[int] = None,
+                   shape: Optional[Tuple[int, int]] = None) -> Tuple[List[List[str]], dict]:
+    """Run BoardGenerator.generate_board inside a pool worker, reproducibly if seed is given."""
+    rng = random.Random(seed) if seed is not None else None
+    return _board_generator.generate_board(special_word, words, rng=rng, shape=shape)
+
+
+def generate_board_with_stats(special_word: str, words: List[str], seed: Optional[int] = None,
+                              shape: Optional[Tuple[int, int]] = None) -> Tuple[List[List[str]], dict, dict]:
+    """Like generate_board, also returning the SolveStats of the generation as a dict."""
+    rng = random.Random(seed) if seed is not None else None
+    stats = SolveStats()
+    board, placement_info = _board_generator.generate_board(special_word, words, rng=rng, shape=shape, stats=stats)
+    return board, placement_info, stats.to_dict()
+
+
+def generate_board_with_lengths(lengths: List[int]) -> Tuple[List[List[int]], dict]:
+    """Run BoardGenerator.generate_board_with_lengths inside a pool worker."""
+    return _board_generator.generate_board_with_lengths(lengths)
@@ -1,17 +1,74 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+import asyncio
 import os
 from .routes import game
+from .game import worker_pool
+from .game.partition_cache import PartitionCache
+from .game.racing import BoardRacer
+from .game.ambiguity import BoardAnalyzer, load_wordlist
+from .game.word_generator import anthropic_clients
 
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Board solving is CPU-bound, so it runs in worker processes owned by the app
+    workers = os.getenv("BOARD_WORKERS")
+    app.state.board_executor = worker_pool.create_board_pool(
+        game.board_generator,
+        max_workers=int(workers) if workers else None
+    )
+    # Optionally race several seeds (and board shapes) per solve, first success wins
+    racers = int(os.getenv("BOARD_RACERS", "1"))
+    app.state.board_racer = BoardRacer(
+        app.state.board_executor,
+        game.board_generator,
+        racers=racers,
+        allow_alternative_shapes=os.getenv("BOARD_RACE_SHAPES", "false").lower() == "true"
+    ) if racers > 1 else None
+
+    # Pre-solved partitions for the length profiles requests keep asking for
+    app.state.partition_cache = PartitionCache(
+        game.board_generator.valid_sizes,
+        max_keys=int(os.getenv("PARTITION_CACHE_KEYS", "64")),
+        pool_size=int(os.getenv("PARTITION_POOL_SIZE", "8")),
+        spanning=game.board_generator.spangram
+    )
+
+    async def solve_partition(lengths):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            app.state.board_executor, worker_pool.generate_board_with_lengths, lengths
+        )
+
+    # Dictionary trie for spotting boards that spell theme words more than once
+    ambiguity_check = os.getenv("AMBIGUITY_CHECK", "false").lower() == "true"
+    app.state.board_analyzer = BoardAnalyzer(load_wordlist()) if ambiguity_check else None
+
+    refill_task = asyncio.create_task(app.state.partition_cache.run(solve_partition))
+    try:
+        yield
+    finally:
+        refill_task.cancel()
+        app.state.partition_cache = None
+        app.state.board_analyzer = None
+        if app.state.board_racer is not None:
+            app.state.board_racer.close()
+            app.state.board_racer = None
+        app.state.board_executor.shutdown()
+        app.state.board_executor = None
+        await anthropic_clients.aclose()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Word Search Game API",
     description="API for generating and managing word search game puzzles",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
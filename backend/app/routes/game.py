@@ -1,11 +1,73 @@
-from fastapi import APIRouter, HTTPException, Header
+from fastapi import APIRouter, HTTPException, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict
-from ..game.word_generator import WordGenerator
+from typing import List, Optional, Dict, Tuple
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from ..game.word_generator import WordGenerator, WordSource
+from ..game.corpus import CorpusWordGenerator, DEFAULT_CORPUS
 from ..game.board_generator import BoardGenerator
+from ..game.partition_solver import SolveStats, SolverTimeout
+from ..game.atlas import PartitionAtlas
+from ..game import worker_pool
+from ..game.batch import make_game, map_unordered
+from ..game.single_flight import SingleFlight
+from ..game.puzzle_id import decode_puzzle_id, encode_puzzle_id
+from ..game.wire import COMPACT_MEDIA_TYPE, compact_game, wants_compact
+from ..game.sessions import SessionStore
+from ..game.solver_metrics import SORT_KEYS, SolverMetrics
 
 router = APIRouter()
-board_generator = BoardGenerator()
+# Memory-mapped library of pre-solved partitions, built with `python -m app.game.atlas`
+atlas_path = os.getenv("PARTITION_ATLAS")
+board_generator = BoardGenerator(
+    atlas=PartitionAtlas(atlas_path) if atlas_path else None,
+    # Make the special word span the board from one side to the other
+    spangram=os.getenv("SPANGRAM", "false").lower() == "true"
+)
+# Concurrent completions per word-generation attempt (first valid one wins)
+WORD_FANOUT = int(os.getenv("WORD_FANOUT", "1"))
+# Parse completions while they stream and stop reading once the word set is known
+WORD_STREAMING = os.getenv("WORD_STREAMING", "false").lower() == "true"
+# Word set sources tried in order: "llm" (needs the caller's API key) and/or "corpus"
+WORD_SOURCES = [source.strip() for source in os.getenv("WORD_SOURCES", "llm").split(",") if source.strip()]
+# With SPANGRAM, word sets are only accepted if their special word can span their board
+min_special_lengths = board_generator.min_special_lengths()
+word_corpus = CorpusWordGenerator(
+    os.getenv("WORD_CORPUS") or DEFAULT_CORPUS, min_special_lengths
+) if "corpus" in WORD_SOURCES else None
+
+# Generate every board from a fresh seed and return its puzzle ID. Seeded boards
+# are solved directly, without the partition cache or racing, so they can be replayed
+PUZZLE_IDS = os.getenv("PUZZLE_IDS", "false").lower() == "true"
+
+# Regenerate boards that spell a theme word along a second path, up to this many
+# times, when the app has a board analyzer (see AMBIGUITY_CHECK in main.py)
+AMBIGUITY_RETRIES = int(os.getenv("AMBIGUITY_RETRIES", "3"))
+
+# Concurrent requests for the same seed word (and API key) share one generation,
+# and its game is served again for GAME_CACHE_TTL seconds
+game_flights = SingleFlight(
+    ttl=float(os.getenv("GAME_CACHE_TTL", "30")),
+    max_size=int(os.getenv("GAME_CACHE_SIZE", "256"))
+)
+
+# Games played through /guess, so their answers stay on the server. Sessions
+# are in this process's memory, so they need a single worker (see SessionStore)
+game_sessions = SessionStore(
+    ttl=float(os.getenv("SESSION_TTL", "3600")),
+    max_size=int(os.getenv("SESSION_MAX", "10000"))
+)
+
+# Collect solver stats for every generated game and aggregate them per length
+# profile at GET /api/game/stats; off by default, as collecting them is not free
+SOLVER_STATS = os.getenv("SOLVER_STATS", "false").lower() == "true"
+solver_metrics = SolverMetrics(max_profiles=int(os.getenv("SOLVER_STATS_PROFILES", "1000")))
 
 class GameResponse(BaseModel):
     theme: str
@@ -13,45 +75,352 @@ class GameResponse(BaseModel):
     words: List[str]
     board: List[List[str]]
     placement_info: Dict
+    puzzle_id: Optional[str] = None
+    session_id: Optional[str] = None
+    stats: Optional[Dict] = None
 
 class GameRequest(BaseModel):
     seed_word: Optional[str] = None
+    # Keep the answers on the server: the response has an empty placement_info
+    # and a session_id for /guess instead
+    session: bool = False
+    # Return the solver stats (see SolveStats) of the generation with the game
+    stats: bool = False
+
+class GuessRequest(BaseModel):
+    session_id: str
+    path: List[Tuple[int, int]]
+
+class GuessResponse(BaseModel):
+    correct: bool
+    word: Optional[str] = None
+    special: bool
+    already_found: bool
+    found: List[str]
+    complete: bool
+
+class WordSet(BaseModel):
+    theme: str
+    special_word: str
+    words: List[str]
+
+class BatchRequest(BaseModel):
+    # Seed words go through the word sources (None for an unseeded game); word sets are used as given
+    seed_words: List[Optional[str]] = []
+    word_sets: List[WordSet] = []
+
+# Games generated at once per batch request
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+async def solve_board(app, special_word: str, words: List[str], seed: Optional[int] = None,
+                      shape: Optional[Tuple[int, int]] = None,
+                      stats: Optional[SolveStats] = None, fresh: bool = False) -> Tuple[List[List[str]], dict]:
+    """
+    Generate the board without blocking the event loop.
+    Uses a pre-solved partition from the app's partition cache when one is ready.
+    When racing is enabled it then samples the atlas, and only races solves
+    across the app's process pool on an atlas miss. Otherwise it runs a single
+    solve in the pool when it is running, or else in a worker thread.
+    A board with a seed (and optional shape) is always solved directly, so the
+    same seed reproduces it.
+    The generation's work is added to stats, if given, with where the partition
+    came from (see SolveStats); cached and raced partitions add no solver work,
+    only the race's wall time is known.
+    With fresh, the partition cache and the atlas are skipped, so the board is
+    newly solved (e.g. to replace an ambiguous one, whose cached variants and
+    atlas partitions may be ambiguous too).
+    """
+    if seed is None:
+        lengths = [len(special_word)] + [len(word) for word in words]
+        partition_cache = getattr(app.state, 'partition_cache', None)
+        if partition_cache is not None and not fresh:
+            partition = partition_cache.take(lengths)
+            if partition is not None:
+                if stats is not None:
+                    stats.add_source('cache')
+                return board_generator.generate_board(special_word, words, partition, stats=stats)
+
+        board_racer = getattr(app.state, 'board_racer', None)
+        if board_racer is not None:
+            # An atlas sample is O(1), so it beats starting any racers
+            partition = None if fresh else board_generator.sample_atlas(lengths, stats)
+            if partition is None:
+                start = time.perf_counter()
+                partition = await board_racer.arace(lengths)
+                if stats is not None:
+                    stats.add_phase('partition', time.perf_counter() - start)
+                    stats.add_source('race')
+            return board_generator.generate_board(special_word, words, partition, stats=stats)
+
+        if fresh:
+            # Seeded solves never take atlas partitions
+            seed = random.getrandbits(32)
+
+    rng = random.Random(seed) if seed is not None else None
+    executor = getattr(app.state, 'board_executor', None)
+    if executor is None:
+        return await run_in_threadpool(
+            board_generator.generate_board, special_word, words, rng=rng, shape=shape, stats=stats
+        )
+    loop = asyncio.get_running_loop()
+    if stats is None:
+        return await loop.run_in_executor(executor, worker_pool.generate_board, special_word, words, seed, shape)
+    board, placement_info, worker_stats = await loop.run_in_executor(
+        executor, worker_pool.generate_board_with_stats, special_word, words, seed, shape
+    )
+    stats.merge(worker_stats)
+    return board, placement_info
+
+def word_sources(authorization: Optional[str]) -> List[WordSource]:
+    """
+    The configured word generators in WORD_SOURCES order. The LLM is skipped
+    without a Bearer key, and a request with no usable source gets a 401.
+    """
+    sources = []
+    for source in WORD_SOURCES:
+        if source == "corpus":
+            sources.append(word_corpus)
+        elif authorization and authorization.startswith('Bearer '):
+            # Initialize word generator with user's API key
+            sources.append(WordGenerator(api_key=authorization.replace('Bearer ', ''),
+                                         min_special_lengths=min_special_lengths))
+    if not sources:
+        raise HTTPException(
+            status_code=401,
+            detail="Missing or invalid API key"
+        )
+    return sources
+
+async def generate_word_set(sources: List[WordSource], seed_word: Optional[str]) -> Dict:
+    """Generate a word set from the first source that succeeds; a source returning None has failed."""
+    for i, source in enumerate(sources):
+        try:
+            word_set = await source.agenerate_word_set(seed_word, fanout=WORD_FANOUT, stream=WORD_STREAMING)
+            if word_set is None:
+                raise ValueError(f"{type(source).__name__} returned no word set")
+            return word_set
+        except Exception as e:
+            if i == len(sources) - 1:
+                raise
+            print(f"{type(source).__name__} failed, falling back to the next word source: {str(e)}")
+
+def flight_key(seed_word: str, authorization: Optional[str]) -> Tuple[str, str]:
+    """Coalescing key for a seeded request: the normalized seed word and a hash of the API key."""
+    scope = hashlib.sha256(authorization.encode()).hexdigest() if authorization else ''
+    return seed_word.strip().lower(), scope
+
+def record_stats(word_set: Dict, stats: Optional[SolveStats]) -> Optional[Dict]:
+    """Add a generation's stats to the per-profile metrics and return them as a dict."""
+    if stats is None:
+        return None
+    result = stats.to_dict()
+    if SOLVER_STATS:
+        solver_metrics.record([len(word_set['special_word'])] + [len(word) for word in word_set['words']], result)
+    return result
+
+async def solve_unambiguous_board(app, special_word: str, words: List[str], seeded: bool = False,
+                                  stats: Optional[SolveStats] = None
+                                  ) -> Tuple[List[List[str]], dict, Optional[int]]:
+    """
+    solve_board, regenerating the board up to AMBIGUITY_RETRIES times while the
+    app's board analyzer finds a theme word along a second path. The analysis
+    runs in a worker thread so it doesn't block the event loop. Regenerations
+    are fresh solves (see solve_board), since every cached rotation or mirror
+    of an ambiguous board spells the same extra words. With seeded,
+    every attempt gets a fresh seed; returns the board, its placement info and
+    the seed it was solved from (None unless seeded).
+    """
+    analyzer = getattr(app.state, 'board_analyzer', None)
+    for attempt in range(AMBIGUITY_RETRIES + 1):
+        seed = random.getrandbits(32) if seeded else None
+        board, placement_info = await solve_board(app, special_word, words, seed, stats=stats, fresh=attempt > 0)
+        if analyzer is None:
+            break
+        report = await run_in_threadpool(analyzer.analyze, board, placement_info)
+        alternates = report['alternate_paths']
+        if not alternates:
+            break
+        print(f"Board attempt {attempt + 1} also spells {sorted({a['word'] for a in alternates})} "
+              f"along other paths, regenerating")
+    return board, placement_info, seed
+
+async def build_game(app, sources: List[WordSource], seed_word: Optional[str],
+                     collect_stats: bool = False) -> GameResponse:
+    # Generate words
+    word_set = await generate_word_set(sources, seed_word)
+    
+    # Generate board, summing the solver stats over any regenerations
+    stats = SolveStats() if collect_stats or SOLVER_STATS else None
+    board, placement_info, seed = await solve_unambiguous_board(
+        app,
+        word_set['special_word'],
+        word_set['words'],
+        PUZZLE_IDS,
+        stats=stats
+    )
+    
+    puzzle_id = None
+    if seed is not None:
+        try:
+            puzzle_id = encode_puzzle_id(word_set['special_word'], word_set['words'], seed,
+                                         (len(board), len(board[0])), word_set['theme'], board_generator.spangram)
+        except ValueError as e:
+            print(f"No puzzle ID for this game: {str(e)}")
+    
+    return GameResponse(
+        theme=word_set['theme'],
+        special_word=word_set['special_word'],
+        words=word_set['words'],
+        board=board,
+        placement_info=placement_info,
+        puzzle_id=puzzle_id,
+        stats=record_stats(word_set, stats)
+    )
+
+def game_response(game: GameResponse, compact: bool, response: Response):
+    """
+    The game as is, or in the compact wire format (see wire.py) when the client
+    asked for it. Both vary on Accept, so shared caches keep them apart.
+    """
+    if not compact:
+        response.headers['Vary'] = 'Accept'
+        return game
+    return JSONResponse(
+        compact_game(game.theme, game.special_word, game.words, game.board, game.placement_info,
+                     game.puzzle_id, game.session_id, game.stats),
+        media_type=COMPACT_MEDIA_TYPE,
+        headers={'Vary': 'Accept'}
+    )
 
 @router.post("/generate", response_model=GameResponse)
-async def generate_game(request: GameRequest, authorization: str = Header(None)):
+async def generate_game(request: GameRequest, http_request: Request, response: Response,
+                        authorization: str = Header(None), format: Optional[str] = None, accept: str = Header(None)):
     try:
-        if not authorization or not authorization.startswith('Bearer '):
-            raise HTTPException(
-                status_code=401,
-                detail="Missing or invalid API key"
-            )
-        
-        api_key = authorization.replace('Bearer ', '')
-        
-        # Initialize word generator with user's API key
-        word_generator = WordGenerator(api_key=api_key)
+        sources = word_sources(authorization)
+        compact = wants_compact(format, accept)
         
-        # Generate words
-        word_set = word_generator.generate_word_set(request.seed_word)
+        # Unseeded games are meant to differ every time, so only seeded ones are shared.
+        # Session games are never shared, or a plain request could fetch their answers.
+        # Requests that share a generation get its stats if it collected any
+        if not request.seed_word or request.session:
+            game = await build_game(http_request.app, sources, request.seed_word, request.stats)
+        else:
+            game = await game_flights.do(
+                flight_key(request.seed_word, authorization),
+                lambda: build_game(http_request.app, sources, request.seed_word, request.stats)
+            )
+        if not request.stats and game.stats is not None:
+            game = game.model_copy(update={'stats': None})
         
-        # Generate board
-        board, placement_info = board_generator.generate_board(
-            word_set['special_word'],
-            word_set['words']
-        )
+        if request.session:
+            session_id = game_sessions.create(game.board, game.special_word, game.words, game.placement_info)
+            # The puzzle ID replays the full game through /puzzle, answers included
+            game = game.model_copy(update={'placement_info': {}, 'puzzle_id': None, 'session_id': session_id})
+        return game_response(game, compact, response)
         
-        return GameResponse(
-            theme=word_set['theme'],
-            special_word=word_set['special_word'],
-            words=word_set['words'],
-            board=board,
-            placement_info=placement_info
+    except SolverTimeout as e:
+        print(f"Board generation timed out: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Board generation is taking too long, please try again"
         )
-        
     except Exception as e:
         # Log the actual error for debugging but don't send it to the client
         print(f"Error generating game: {str(e)}")
         raise HTTPException(
             status_code=422,
             detail=str(e)
-        ) 
\ No newline at end of file
+        ) 
+
+@router.post("/guess", response_model=GuessResponse)
+async def guess(request: GuessRequest):
+    """Check a selected path against a session's answers, forwards or backwards."""
+    session = game_sessions.get(request.session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Game session not found or expired")
+    return GuessResponse(**session.guess(request.path))
+
+@router.get("/puzzle/{puzzle_id}", response_model=GameResponse)
+async def replay_puzzle(puzzle_id: str, http_request: Request, response: Response, format: Optional[str] = None,
+                        accept: str = Header(None)):
+    """Regenerate the game for a puzzle ID, identical to when it was first generated."""
+    try:
+        puzzle = decode_puzzle_id(puzzle_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if puzzle.spangram != board_generator.spangram:
+        # The same seed lays the board out differently with and without a spanning special word
+        raise HTTPException(
+            status_code=422,
+            detail=f"Puzzle was generated with SPANGRAM={str(puzzle.spangram).lower()}, "
+                   f"this server runs with SPANGRAM={str(board_generator.spangram).lower()}"
+        )
+    try:
+        board, placement_info = await solve_board(
+            http_request.app, puzzle.special_word, puzzle.words, puzzle.seed, puzzle.shape
+        )
+    except SolverTimeout as e:
+        print(f"Board generation timed out: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Board generation is taking too long, please try again"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return game_response(GameResponse(
+        theme=puzzle.theme,
+        special_word=puzzle.special_word,
+        words=puzzle.words,
+        board=board,
+        placement_info=placement_info,
+        puzzle_id=puzzle_id
+    ), wants_compact(format, accept), response)
+
+@router.post("/batch")
+async def generate_batch(request: BatchRequest, http_request: Request, authorization: str = Header(None),
+                         format: Optional[str] = None):
+    """
+    Generate one game per seed word and per word set, streamed back as NDJSON
+    in completion order. Each line is a game with its "index" in the request
+    (seed words first, then word sets), or {"index": ..., "error": ...}.
+    With ?format=compact the games are in the compact wire format.
+    """
+    compact = wants_compact(format, None)
+    sources = word_sources(authorization) if request.seed_words else []
+
+    items = [('seed', seed_word) for seed_word in request.seed_words]
+    items += [('word_set', word_set.model_dump()) for word_set in request.word_sets]
+
+    async def build(item):
+        kind, value = item
+        if kind == 'seed':
+            word_set = await generate_word_set(sources, value)
+        else:
+            word_set = value
+        stats = SolveStats() if SOLVER_STATS else None
+        board, placement_info, _ = await solve_unambiguous_board(
+            http_request.app, word_set['special_word'], word_set['words'], stats=stats
+        )
+        record_stats(word_set, stats)
+        game = make_game(word_set, board, placement_info)
+        return compact_game(**game) if compact else game
+
+    async def lines():
+        async for index, game, error in map_unordered(build, items, BATCH_CONCURRENCY):
+            if error is None:
+                yield json.dumps({'index': index, **game}) + '\n'
+            else:
+                print(f"Error generating batch game {index}: {str(error)}")
+                yield json.dumps({'index': index, 'error': str(error)}) + '\n'
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/stats")
+async def solver_stats(sort: str = 'max_nodes', limit: int = 20):
+    """
+    Solver stats aggregated per length profile since startup, with the top
+    limit profiles by sort (one of SORT_KEYS). Only collected with SOLVER_STATS.
+    """
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(SORT_KEYS)}")
+    return {'enabled': SOLVER_STATS, **solver_metrics.summary(sort, limit)}
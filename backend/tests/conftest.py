@@ -2,6 +2,10 @@ import pytest
 from fastapi.testclient import TestClient
 from app.main import app
 import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from dotenv import load_dotenv
 
 # Load environment variables for testing
@@ -20,4 +24,100 @@ def requires_openai():
 @pytest.fixture(autouse=True)
 def setup_environment():
     """Setup any required environment variables."""
-    pass  # We'll handle specific requirements in individual fixtures 
\ No newline at end of file
+    yield
+    # Seeded games are cached across requests, so don't let them leak between tests
+    from app.routes import game
+    game.game_flights.clear()
+
+@pytest.fixture
+def stub_word_generator(monkeypatch):
+    """
+    Replace the routes' LLM word generator with one that always returns the
+    clockworks word set, so /generate runs offline. Returns the stub class:
+    seed_words records the seed word of every call.
+    """
+    from app.routes import game
+
+    class StubWordGenerator:
+        seed_words = []
+
+        def __init__(self, api_key=None, min_special_lengths=None):
+            pass
+
+        async def agenerate_word_set(self, seed_word=None, fanout=1, stream=False):
+            self.seed_words.append(seed_word)
+            return {'theme': 'Time for a change', 'special_word': 'clockworks',
+                    'words': ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']}
+
+    monkeypatch.setattr(game, "WordGenerator", StubWordGenerator)
+    return StubWordGenerator
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """Answers /v1/complete like the Anthropic API, with canned completions."""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        server.requests.append(body)
+        server.connections.add(self.client_address)
+        completion = server.completions[min(len(server.requests), len(server.completions)) - 1]
+        if body.get("stream"):
+            self._stream(completion, body["model"])
+            return
+        payload = json.dumps({
+            "type": "completion",
+            "id": f"compl_{len(server.requests)}",
+            "completion": completion,
+            "stop_reason": "stop_sequence",
+            "model": body["model"],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, completion, model):
+        """Send the completion line by line as server-sent events."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for line in completion.splitlines(keepends=True):
+                data = json.dumps({"type": "completion", "completion": line, "stop_reason": None, "model": model})
+                self._write_chunk(f"event: completion\ndata: {data}\n\n".encode())
+                self.server.events_sent += 1
+                time.sleep(self.server.stream_delay)
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def llm_server(monkeypatch):
+    """
+    Local stand-in for the LLM endpoint. Set server.completions to the responses
+    to return in order (the last one repeats); server.requests records every
+    request body and server.connections every client connection. Streamed
+    completions are sent one line per event, stream_delay seconds apart.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLMHandler)
+    server.completions = [""]
+    server.requests = []
+    server.connections = set()
+    server.stream_delay = 0.0
+    server.events_sent = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    yield server
+    server.shutdown()
+    server.server_close()
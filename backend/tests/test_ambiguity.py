@@ -0,0 +1,119 @@
+from app.game.ambiguity import BoardAnalyzer, grid_neighbors, load_wordlist
+from app.game.board_generator import BoardGenerator
+
+def placement(board, words):
+    """placement_info for words laid out along rows, one row per word."""
+    entries = [{'word': word, 'path': [(r, c) for c in range(len(word))]} for r, word in enumerate(words)]
+    return {'special_word': entries[0], 'words': entries[1:]}
+
+def test_grid_neighbors():
+    neighbors = grid_neighbors(3, 3)
+    assert sorted(neighbors[0]) == [1, 3, 4]
+    assert len(neighbors[4]) == 8
+
+def test_finds_alternate_paths():
+    board = [list("tide"), list("qtid")]
+    report = BoardAnalyzer().analyze(board, placement(board, ["tide", "qtid"]))
+    paths = [a['path'] for a in report['alternate_paths'] if a['word'] == 'tide']
+    assert sorted(paths) == [
+        [(1, 1), (0, 1), (0, 2), (0, 3)],
+        [(1, 1), (1, 2), (0, 2), (0, 3)],
+        [(1, 1), (1, 2), (1, 3), (0, 3)],
+    ]
+
+def test_finds_stray_words():
+    board = [list("tide"), list("xxxx"), list("cart")]
+    analyzer = BoardAnalyzer(["edit", "card", "tied", "cart"])
+    report = analyzer.analyze(board, placement(board, ["tide", "xxxx", "cart"]))
+    # "card" and "tied" are not on the board, "cart" is a theme word
+    assert report['stray_words'] == [{'word': 'edit', 'path': [(0, 3), (0, 2), (0, 1), (0, 0)]}]
+    assert report['alternate_paths'] == []
+
+def test_clean_board_has_no_alternates():
+    board = [list("gear"), list("tick")]
+    report = BoardAnalyzer(["gear", "tick"]).analyze(board, placement(board, ["gear", "tick"]))
+    assert report == {'alternate_paths': [], 'stray_words': []}
+
+def test_generated_board_alternates_are_real():
+    words = ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']
+    board, placement_info = BoardGenerator().generate_board('clockworks', words)
+    report = BoardAnalyzer().analyze(board, placement_info)
+    for alternate in report['alternate_paths']:
+        # Any alternate really spells its word on the board
+        assert ''.join(board[r][c] for r, c in alternate['path']).lower() == alternate['word']
+    assert report['stray_words'] == []
+
+def test_load_wordlist_filters(tmp_path):
+    path = tmp_path / "words"
+    path.write_text("apple\nApple\nit's\nat\nbanana\n")
+    assert load_wordlist(str(path)) == ['apple', 'banana']
+    assert load_wordlist(str(tmp_path / "missing")) == []
+
+def test_ambiguous_boards_are_regenerated(client, monkeypatch, stub_word_generator):
+    from app.main import app
+
+    class FlakyAnalyzer:
+        calls = 0
+
+        def analyze(self, board, placement_info):
+            self.calls += 1
+            alternates = [{'word': 'gear', 'path': []}] if self.calls == 1 else []
+            return {'alternate_paths': alternates, 'stray_words': []}
+
+    analyzer = FlakyAnalyzer()
+    monkeypatch.setattr(app.state, "board_analyzer", analyzer, raising=False)
+    response = client.post("/api/game/generate", json={}, headers={"Authorization": "Bearer test-key"})
+    assert response.status_code == 200
+    assert analyzer.calls == 2
+
+def test_batch_regenerates_ambiguous_boards(client, monkeypatch):
+    from app.main import app
+
+    class FlakyAnalyzer:
+        calls = 0
+
+        def analyze(self, board, placement_info):
+            self.calls += 1
+            alternates = [{'word': 'gear', 'path': []}] if self.calls == 1 else []
+            return {'alternate_paths': alternates, 'stray_words': []}
+
+    analyzer = FlakyAnalyzer()
+    monkeypatch.setattr(app.state, "board_analyzer", analyzer, raising=False)
+    word_set = {'theme': 'Test', 'special_word': 'clockworks',
+                'words': ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']}
+    response = client.post("/api/game/batch", json={'word_sets': [word_set]})
+    assert response.status_code == 200
+    assert 'error' not in response.text
+    assert analyzer.calls == 2
+
+def test_regenerations_skip_the_partition_cache(monkeypatch):
+    import asyncio
+    from types import SimpleNamespace
+    from app.routes import game
+
+    words = ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']
+    solved = BoardGenerator().generate_board_with_lengths([10] + [len(word) for word in words])
+
+    class StubCache:
+        takes = 0
+
+        def take(self, lengths):
+            # Every variant of one solve, so taking again gives the same ambiguous board
+            self.takes += 1
+            return solved
+
+    class AmbiguousOnce:
+        calls = 0
+
+        def analyze(self, board, placement_info):
+            self.calls += 1
+            alternates = [{'word': 'gear', 'path': []}] if self.calls == 1 else []
+            return {'alternate_paths': alternates, 'stray_words': []}
+
+    cache = StubCache()
+    app = SimpleNamespace(state=SimpleNamespace(partition_cache=cache, board_racer=None, board_executor=None,
+                                                board_analyzer=AmbiguousOnce()))
+    _, _, seed = asyncio.run(game.solve_unambiguous_board(app, 'clockworks', words))
+    assert cache.takes == 1
+    assert app.state.board_analyzer.calls == 2
+    assert seed is None
@@ -40,4 +40,27 @@ def test_generate_game_no_seed(client):
     assert "spangram" in data
     assert "words" in data
     assert "board" in data
-    assert "placement_info" in data 
\ No newline at end of file
+    assert "placement_info" in data 
+
+def test_generate_game_timeout_returns_503(client, monkeypatch, stub_word_generator):
+    from app.routes import game
+    from app.game.partition_solver import SolverTimeout
+
+    def timeout(*args, **kwargs):
+        raise SolverTimeout("too slow")
+
+    monkeypatch.setattr(game.board_generator, "generate_board", timeout)
+    response = client.post("/api/game/generate", json={}, headers={"Authorization": "Bearer test-key"})
+    assert response.status_code == 503
+
+def test_generate_game_uses_board_pool(stub_word_generator):
+    from app.main import app
+
+    # Entering the client runs the lifespan, which starts the process pool
+    with TestClient(app) as pooled_client:
+        assert app.state.board_executor is not None
+        response = pooled_client.post("/api/game/generate", json={}, headers={"Authorization": "Bearer test-key"})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["board"]) == 6 and len(data["board"][0]) == 6
+    assert data["placement_info"]["special_word"]["word"] == "clockworks"
@@ -0,0 +1,48 @@
+import pickle
+import random
+from app.game.atlas import PartitionAtlas, build_atlas, realistic_profile
+from app.game.board_generator import BoardGenerator
+
+KEYS = [(14, 12, 10), (15, 7, 6, 5, 5, 4)]
+
+def build(tmp_path, per_key=5):
+    path = str(tmp_path / "test.atlas")
+    build_atlas(path, KEYS, per_key, workers=1)
+    return path
+
+def test_realistic_profiles_sum_to_size():
+    rng = random.Random(0)
+    for size in BoardGenerator().valid_sizes:
+        key = realistic_profile(size, rng)
+        assert sum(key) == size
+        assert 8 <= key[0] <= 15  # the special word is always the longest
+        assert all(3 <= length <= 8 for length in key[1:])
+
+def test_atlas_round_trip(tmp_path):
+    atlas = PartitionAtlas(build(tmp_path))
+    assert sorted(atlas.keys()) == sorted(KEYS)
+    assert len(atlas) == 10
+
+    board, placement_info = atlas.sample([10, 14, 12])
+    assert [len(path) for path in placement_info['paths']] == [10, 14, 12]
+    cells = set()
+    for idx, path in enumerate(placement_info['paths']):
+        for (r, c), (nr, nc) in zip(path, path[1:]):
+            assert max(abs(r - nr), abs(c - nc)) == 1
+        for (r, c) in path:
+            assert board[r][c] == idx + 1
+            cells.add((r, c))
+    assert len(cells) == 36
+    assert atlas.sample([18, 18]) is None
+    atlas.close()
+
+def test_board_generator_samples_atlas(tmp_path):
+    atlas = PartitionAtlas(build(tmp_path))
+    generator = BoardGenerator(atlas=atlas)
+    stored = {str(atlas.record((14, 12, 10), i)) for i in range(5)}
+    _, placement_info = generator.generate_board_with_lengths([14, 12, 10])
+    assert str(placement_info['paths']) in stored
+
+    # Workers receive the atlas by path and map the file again
+    clone = pickle.loads(pickle.dumps(generator))
+    assert len(clone.atlas) == 10
@@ -0,0 +1,123 @@
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from app.game import batch, worker_pool
+from app.game.batch import generate_pack, map_unordered, read_items
+from app.game.board_generator import BoardGenerator
+
+WORD_SET = {'theme': 'Time for a change', 'special_word': 'clockworks',
+            'words': ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']}
+
+def test_map_unordered_bounds_in_flight_work():
+    active = 0
+    peak = 0
+
+    async def work(delay):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(delay)
+        active -= 1
+        if delay == 0.02:
+            raise ValueError("bad item")
+        return delay
+
+    async def run():
+        return [item async for item in map_unordered(work, [0.03, 0.01, 0.02, 0.0, 0.01], limit=2)]
+
+    results = asyncio.run(run())
+    assert peak == 2
+    assert sorted(index for index, _, _ in results) == [0, 1, 2, 3, 4]
+    assert [index for index, _, error in results if error is not None] == [2]
+
+def test_map_unordered_cancels_pending_work_on_close():
+    cancelled = []
+
+    async def work(delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    async def run():
+        results = map_unordered(work, [0.0, 10, 10, 10], limit=3)
+        assert (await results.__anext__())[1] == 0.0
+        await results.aclose()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    # The fourth item was never started
+    assert cancelled == [10, 10]
+
+def test_generate_pack_writes_jsonl(tmp_path):
+    source = tmp_path / "input.jsonl"
+    source.write_text(json.dumps(WORD_SET) + "\n" + json.dumps({**WORD_SET, 'words': ['x']}) + "\n")
+    output = tmp_path / "pack.jsonl"
+
+    with worker_pool.create_board_pool(BoardGenerator(), 2) as executor:
+        games, failures = asyncio.run(generate_pack(read_items(str(source)), str(output), executor))
+
+    assert (games, failures) == (1, 1)
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    game = next(line for line in lines if 'error' not in line)
+    assert game['index'] == 0
+    assert len(game['board']) == 6
+
+def test_generate_pack_validates_in_chunks(tmp_path, monkeypatch):
+    generator = BoardGenerator()
+    calls = 0
+
+    def generate_board(special_word, words):
+        nonlocal calls
+        calls += 1
+        board, placement_info = generator.generate_board(special_word, words)
+        if calls == 2:
+            board[0][0] = '?'
+        return board, placement_info
+
+    monkeypatch.setattr(worker_pool, 'generate_board', generate_board)
+    monkeypatch.setattr(batch, 'VALIDATE_CHUNK', 2)
+    output = tmp_path / "pack.jsonl"
+    with ThreadPoolExecutor(1) as executor:
+        games, failures = asyncio.run(generate_pack([WORD_SET] * 3, str(output), executor,
+                                                    concurrency=1, validate=True))
+
+    assert (games, failures) == (2, 1)
+    lines = {line['index']: line for line in map(json.loads, output.read_text().splitlines())}
+    assert lines[1]['error'] == "Invalid board: letters"
+    assert len(lines[0]['board']) == len(lines[2]['board']) == 6
+
+def test_generate_pack_flags_ambiguous_boards(tmp_path, monkeypatch):
+    generator = BoardGenerator()
+    monkeypatch.setattr(worker_pool, 'generate_board', generator.generate_board)
+
+    class AmbiguousAnalyzer:
+        calls = 0
+
+        def analyze(self, board, placement_info):
+            self.calls += 1
+            return {'alternate_paths': [{'word': 'gear', 'path': []}], 'stray_words': []}
+
+    analyzer = AmbiguousAnalyzer()
+    output = tmp_path / "pack.jsonl"
+    with ThreadPoolExecutor(1) as executor:
+        games, failures = asyncio.run(generate_pack([WORD_SET], str(output), executor,
+                                                    analyzer=analyzer, ambiguity_retries=2))
+
+    assert (games, failures) == (1, 0)
+    assert analyzer.calls == 3
+    assert json.loads(output.read_text())['ambiguous'] is True
+
+def test_batch_endpoint_streams_ndjson(client):
+    response = client.post("/api/game/batch", json={'word_sets': [WORD_SET, WORD_SET]})
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line['index'] for line in lines) == [0, 1]
+    assert all(line['special_word'] == 'clockworks' for line in lines)
+
+def test_batch_endpoint_needs_key_for_seed_words(client):
+    response = client.post("/api/game/batch", json={'seed_words': ['music']})
+    assert response.status_code == 401
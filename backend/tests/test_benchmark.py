@@ -0,0 +1,35 @@
+import json
+from app.game.benchmark import main, run_benchmark, summarize
+from app.game.board_generator import BoardGenerator
+
+def test_summarize():
+    summary = summarize(list(range(1, 101)))
+    assert summary['p50'] == 50.5
+    assert summary['max'] == 100
+    assert summarize([]) == {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0, 'mean': 0.0}
+
+def test_run_benchmark_reports_every_size():
+    report = run_benchmark(BoardGenerator(), sizes=[49, 36], runs=4, seed=1)
+    assert [result['size'] for result in report['sizes']] == [36, 49]
+    assert report['sizes'][1]['shape'] == [7, 7]
+    assert report['total']['runs'] == 8
+    assert report['total']['failure_rate'] == 0
+    # Every solve expands at least one node per cell
+    assert report['sizes'][0]['nodes']['p50'] >= 36
+
+def test_fixed_seed_repeats_the_same_work():
+    first = run_benchmark(BoardGenerator(), sizes=[64], runs=5, seed=7)
+    second = run_benchmark(BoardGenerator(), sizes=[64], runs=5, seed=7)
+    assert first['sizes'][0]['nodes'] == second['sizes'][0]['nodes']
+
+def test_failures_are_counted():
+    report = run_benchmark(BoardGenerator(time_limit=-1), sizes=[100], runs=3)
+    assert report['sizes'][0]['failures'] == 3
+    assert report['total']['failure_rate'] == 1.0
+
+def test_cli_writes_json(tmp_path):
+    output = tmp_path / "bench.json"
+    main(['--runs', '2', '--sizes', '36', '42', '--output', str(output)])
+    report = json.loads(output.read_text())
+    assert report['config']['runs'] == 2
+    assert len(report['sizes']) == 2
@@ -1,5 +1,6 @@
 import pytest
 from app.game.board_generator import BoardGenerator
+from app.game.partition_solver import SolveStats
 
 def test_board_generator_initialization():
     generator = BoardGenerator()
@@ -101,4 +102,33 @@ def test_board_generation_with_words():
     # Verify board is completely filled with letters
     for row in board:
         for cell in row:
-            assert cell.isalpha(), "Each cell should contain a letter" 
\ No newline at end of file
+            assert cell.isalpha(), "Each cell should contain a letter"
+
+def test_board_generation_with_random_ordering():
+    generator = BoardGenerator(ordering='random')
+    board, placement_info = generator.generate_board_with_lengths([12, 12, 12])
+    assert len(board) == 6 and len(board[0]) == 6
+    assert all(cell > 0 for row in board for cell in row)
+
+def test_board_generator_rejects_unknown_ordering():
+    with pytest.raises(ValueError):
+        BoardGenerator(ordering='alphabetical')
+
+def test_generate_board_fills_stats():
+    generator = BoardGenerator()
+    stats = SolveStats()
+    generator.generate_board('clockworks', ['gear', 'dial', 'hands', 'tick', 'chime', 'wind'], stats=stats)
+    assert stats.nodes >= 36 and stats.attempts >= 1
+    assert set(stats.phases) == {'partition', 'letters', 'fill'}
+
+    # A given partition skips the solver, so only placing and filling letters is timed
+    partition = generator.generate_board_with_lengths([10, 4, 4, 5, 4, 5, 4])
+    stats = SolveStats()
+    generator.generate_board('clockworks', ['gear', 'dial', 'hands', 'tick', 'chime', 'wind'], partition, stats=stats)
+    assert stats.nodes == 0
+    assert set(stats.phases) == {'letters', 'fill'}
+
+def test_min_special_lengths():
+    assert BoardGenerator().min_special_lengths() is None
+    lengths = BoardGenerator(spangram=True).min_special_lengths()
+    assert lengths[36] == 6 and lengths[80] == 8 and lengths[100] == 10
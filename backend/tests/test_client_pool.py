@@ -0,0 +1,107 @@
+import asyncio
+from anthropic import AsyncAnthropic
+from app.game.client_pool import AsyncClientPool
+from app.game.word_generator import AnthropicWordGenerator
+
+VALID_RESPONSE = """Theme: Time for a change
+Special Word: clockworks
+Words: gear, dial, hands, tick, chime, wind"""
+
+class FakeClient:
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+def test_pool_reuses_client_per_key():
+    async def run():
+        pool = AsyncClientPool(FakeClient)
+        async with pool.client("a") as first:
+            pass
+        async with pool.client("a") as second:
+            pass
+        async with pool.client("b") as other:
+            pass
+        return first, second, other
+
+    first, second, other = asyncio.run(run())
+    assert first is second
+    assert other is not first
+
+def test_pool_evicts_least_recently_used():
+    async def run():
+        pool = AsyncClientPool(FakeClient, max_size=2)
+        async with pool.client("a") as a:
+            pass
+        async with pool.client("b") as b:
+            pass
+        async with pool.client("a"):
+            pass
+        async with pool.client("c"):
+            pass
+        return pool, a, b
+
+    pool, a, b = asyncio.run(run())
+    assert len(pool) == 2
+    assert not a.closed  # "a" was used more recently than "b"
+    assert b.closed
+
+def test_pool_evicts_idle_clients():
+    async def run():
+        pool = AsyncClientPool(FakeClient, idle_timeout=0)
+        async with pool.client("a") as a:
+            pass
+        async with pool.client("b"):
+            pass
+        return a
+
+    assert asyncio.run(run()).closed
+
+def test_pool_defers_closing_client_in_use():
+    async def run():
+        pool = AsyncClientPool(FakeClient, max_size=1)
+        async with pool.client("a") as a:
+            async with pool.client("b"):
+                pass
+            assert not a.closed
+        return a
+
+    assert asyncio.run(run()).closed
+
+def test_pool_limits_concurrency_per_key():
+    async def run():
+        pool = AsyncClientPool(FakeClient, max_concurrency=2)
+        active = 0
+        peak = 0
+
+        async def borrow(api_key):
+            nonlocal active, peak
+            async with pool.client(api_key):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(borrow("a") for _ in range(5)))
+        return peak
+
+    assert asyncio.run(run()) == 2
+
+def test_agenerate_word_set_reuses_connection(llm_server):
+    llm_server.completions = [VALID_RESPONSE]
+
+    async def run():
+        pool = AsyncClientPool(lambda api_key: AsyncAnthropic(api_key=api_key))
+        results = []
+        for _ in range(2):
+            generator = AnthropicWordGenerator(api_key="test-key", client_pool=pool)
+            results.append(await generator.agenerate_word_set("clocks"))
+        await pool.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert [result['special_word'] for result in results] == ["clockworks", "clockworks"]
+    assert len(llm_server.requests) == 2
+    assert len(llm_server.connections) == 1
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import pytest
+from app.game.corpus import CorpusWordGenerator
+from app.routes import game
+
+def test_bundled_corpus_loads_with_valid_totals():
+    corpus = CorpusWordGenerator()
+    assert len(corpus) >= 20
+    for total, indexes in corpus.by_total.items():
+        assert total in corpus.valid_sizes
+        for index in indexes:
+            word_set = corpus.word_sets[index]
+            assert len(word_set['special_word']) + sum(map(len, word_set['words'])) == total
+
+def test_seed_word_resolves_by_keyword():
+    corpus = CorpusWordGenerator()
+    assert asyncio.run(corpus.agenerate_word_set("Planets"))['special_word'] == "telescopesights"
+    assert corpus.generate_word_set("saturn")['special_word'] == "telescopesights"
+    assert corpus.generate_word_set("the deep ocean")['special_word'] == "oceanlife"
+
+def test_total_letters_and_misses():
+    corpus = CorpusWordGenerator()
+    word_set = corpus.generate_word_set(total_letters=36)
+    assert len(word_set['special_word']) + sum(map(len, word_set['words'])) == 36
+    with pytest.raises(LookupError):
+        corpus.generate_word_set("xylophonist")
+    with pytest.raises(LookupError):
+        corpus.generate_word_set("planets", total_letters=100)
+    total = corpus.totals[corpus.matches("planets")[0]]
+    assert corpus.generate_word_set("planets", total_letters=total)['special_word'] == "telescopesights"
+
+def test_corpus_is_not_an_llm_generator():
+    from app.game.word_generator import BaseWordGenerator, WordSource
+    corpus = CorpusWordGenerator()
+    assert isinstance(corpus, WordSource)
+    assert not isinstance(corpus, BaseWordGenerator)
+    assert not hasattr(corpus, 'generate_completion')
+
+def test_invalid_total_is_rejected(tmp_path):
+    path = tmp_path / "sets.jsonl"
+    path.write_text(json.dumps({'theme': 'Bad', 'special_word': 'clockworks', 'words': ['gear', 'dial']}) + "\n")
+    with pytest.raises(ValueError, match="sets.jsonl:1"):
+        CorpusWordGenerator(str(path))
+
+def test_spanning_corpus_skips_sets_that_cannot_span(tmp_path):
+    from app.game.board_generator import BoardGenerator
+    path = tmp_path / "sets.jsonl"
+    # 81 letters is a 9x9 board, which an 8-letter special word cannot span
+    path.write_text(
+        json.dumps({'theme': 'Clocks', 'special_word': 'pendulum',
+                    'words': ['grandfather', 'cuckooclock', 'chronometer', 'hourglasses', 'timepieces',
+                              'stopwatch', 'wristwatch']}) + "\n"
+        + json.dumps({'theme': 'Time for a change', 'special_word': 'clockworks',
+                      'words': ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']}) + "\n"
+    )
+    assert len(CorpusWordGenerator(str(path))) == 2
+    corpus = CorpusWordGenerator(str(path), BoardGenerator(spangram=True).min_special_lengths())
+    assert [word_set['special_word'] for word_set in corpus.word_sets] == ['clockworks']
+
+def test_generate_from_corpus_without_key(client, monkeypatch):
+    monkeypatch.setattr(game, "WORD_SOURCES", ["corpus"])
+    monkeypatch.setattr(game, "word_corpus", CorpusWordGenerator())
+    response = client.post("/api/game/generate", json={"seed_word": "birds"})
+    assert response.status_code == 200
+    assert response.json()['special_word'] == "birdwatching"
+
+def test_corpus_falls_back_to_llm(client, monkeypatch, llm_server):
+    llm_server.completions = ["""Theme: Time for a change
+Special Word: clockworks
+Words: gear, dial, hands, tick, chime, wind"""]
+    monkeypatch.setattr(game, "WORD_SOURCES", ["corpus", "llm"])
+    monkeypatch.setattr(game, "word_corpus", CorpusWordGenerator())
+    response = client.post(
+        "/api/game/generate",
+        json={"seed_word": "xylophonist"},
+        headers={"Authorization": "Bearer test-key"}
+    )
+    assert response.status_code == 200
+    assert response.json()['special_word'] == "clockworks"
+    assert len(llm_server.requests) == 1
+
+def test_falls_back_to_corpus_when_source_returns_nothing():
+    class EmptySource:
+        async def agenerate_word_set(self, seed_word=None, fanout=1, stream=False):
+            return None
+
+    word_set = asyncio.run(game.generate_word_set([EmptySource(), CorpusWordGenerator()], "planets"))
+    assert word_set['special_word'] == "telescopesights"
+    with pytest.raises(ValueError, match="EmptySource returned no word set"):
+        asyncio.run(game.generate_word_set([EmptySource()], "planets"))
@@ -0,0 +1,50 @@
+import asyncio
+import json
+from app.game import worker_pool
+from app.game.batch import generate_pack
+from app.game.board_generator import BoardGenerator
+from app.game.difficulty import count_readings, letter_cells, path_stats, score_board
+
+def test_count_readings():
+    letters = list("catxtac") + list("atxxxxx")
+    cells = letter_cells(letters)
+    # Three readings start at the c in (0, 0) and one at the c in (0, 6)
+    assert count_readings(cells, 2, 7, "cat") == 4
+    assert count_readings(cells, 2, 7, "dog") == 0
+
+def test_count_readings_does_not_reuse_cells():
+    # "kiwi" would need to step back onto the i it just left
+    assert count_readings(letter_cells(list("kiwxxxxxx")), 3, 3, "kiwi") == 0
+    # k-i-w-i with a second i next to the w: the only reading
+    assert count_readings(letter_cells(list("kiwxxixxx")), 3, 3, "kiwi") == 1
+
+def test_answer_path_is_one_reading():
+    board = [list("papaya"), list("xxxxxx")]
+    assert count_readings(letter_cells([l for row in board for l in row]), 2, 6, "papaya") == 1
+
+def test_path_stats():
+    straight = [(0, 0), (0, 1), (0, 2)]
+    zigzag = [(1, 0), (0, 1), (1, 2)]
+    crossing = [(0, 0), (1, 1)]
+    other = [(0, 1), (1, 0)]
+    stats = path_stats([straight, zigzag])
+    assert stats[0] == {'turns': 0, 'sharp_turns': 0, 'crossings': 0}
+    assert stats[1] == {'turns': 1, 'sharp_turns': 1, 'crossings': 0}
+    assert [s['crossings'] for s in path_stats([crossing, other])] == [1, 1]
+
+def test_score_board():
+    words = ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']
+    board, placement_info = BoardGenerator().generate_board('clockworks', words)
+    result = score_board(board, placement_info)
+    assert result['level'] in ('easy', 'medium', 'hard')
+    assert [w['word'] for w in result['words']] == ['clockworks'] + words
+    assert all(w['readings'] >= 1 for w in result['words'])
+
+def test_pack_includes_difficulty(tmp_path):
+    word_set = {'theme': 'Time for a change', 'special_word': 'clockworks',
+                'words': ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']}
+    output = tmp_path / "pack.jsonl"
+    with worker_pool.create_board_pool(BoardGenerator(), 1) as executor:
+        asyncio.run(generate_pack([word_set], str(output), executor, difficulty=True))
+    game = json.loads(output.read_text())
+    assert game['difficulty']['level'] in ('easy', 'medium', 'hard')
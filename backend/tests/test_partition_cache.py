@@ -0,0 +1,87 @@
+import asyncio
+from app.game.board_generator import BoardGenerator
+from app.game.partition_cache import PartitionCache
+
+def make_cache(**kwargs):
+    return PartitionCache(BoardGenerator().valid_sizes, **kwargs)
+
+def solved_paths(lengths):
+    """Paths for lengths in key (longest first) order."""
+    _, placement_info = BoardGenerator().generate_board_with_lengths(list(lengths))
+    return placement_info['paths']
+
+def test_miss_queues_refill():
+    cache = make_cache()
+    assert cache.take([10, 12, 14]) is None
+    assert (14, 12, 10) in cache._low
+
+def test_take_maps_paths_to_original_order():
+    cache = make_cache()
+    cache.take([10, 12, 14])
+    cache.put((14, 12, 10), solved_paths((14, 12, 10)))
+
+    board, placement_info = cache.take([10, 14, 12])
+    assert [len(path) for path in placement_info['paths']] == [10, 14, 12]
+    for idx, path in enumerate(placement_info['paths']):
+        for (r, c) in path:
+            assert board[r][c] == idx + 1
+    assert len(cache) == 0
+
+def test_evicts_least_recently_used_key():
+    cache = make_cache(max_keys=2)
+    cache.take([18, 18])
+    cache.take([12, 12, 12])
+    cache.take([18, 18])
+    cache.take([6, 30])
+    assert list(cache._pools) == [(18, 18), (30, 6)]
+
+def test_generate_board_uses_cached_partition():
+    generator = BoardGenerator()
+    cache = make_cache()
+    words = ["clockworks", "gear", "dial", "hands", "tick", "chime", "wind"]
+    lengths = [len(word) for word in words]
+    cache.take(lengths)
+    cache.put(PartitionCache.key_for(lengths), solved_paths(PartitionCache.key_for(lengths)))
+
+    board, placement_info = generator.generate_board(words[0], words[1:], cache.take(lengths))
+    for entry in [placement_info['special_word']] + placement_info['words']:
+        assert "".join(board[r][c] for r, c in entry['path']) == entry['word']
+
+def test_run_refills_low_pools():
+    cache = make_cache(pool_size=3)
+
+    async def solve(lengths):
+        return BoardGenerator().generate_board_with_lengths(lengths)
+
+    async def run():
+        task = asyncio.create_task(cache.run(solve))
+        cache.take([12, 12, 12])
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(cache) == 3:
+                break
+        task.cancel()
+        return len(cache)
+
+    assert asyncio.run(run()) == 3
+
+def test_put_variants_adds_every_symmetry():
+    cache = make_cache(pool_size=16)
+    cache.take([12, 12, 12])
+    cache.put_variants((12, 12, 12), solved_paths((12, 12, 12)))
+    assert len(cache) == 8  # 6x6 is square
+
+def test_spanning_keys_keep_the_first_length():
+    cache = make_cache(spanning=True)
+    lengths = [10, 14, 12]
+    key = PartitionCache.key_for(lengths, spanning=True)
+    assert key == (10, 14, 12)
+    cache.take(lengths)
+    generator = BoardGenerator(spangram=True)
+    cache.put(key, generator.generate_board_with_lengths(list(key))[1]['paths'])
+
+    _, placement_info = cache.take([10, 12, 14])
+    assert [len(path) for path in placement_info['paths']] == [10, 12, 14]
+    rows = {r for r, _ in placement_info['paths'][0]}
+    cols = {c for _, c in placement_info['paths'][0]}
+    assert {0, 5} <= rows or {0, 5} <= cols
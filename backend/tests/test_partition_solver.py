@@ -0,0 +1,136 @@
+import random
+import pytest
+from app.game.partition_solver import PartitionSolver, SolveStats, SolverTimeout, iter_bits, luby, subset_sums
+
+def test_iter_bits():
+    assert iter_bits(0) == []
+    assert iter_bits(0b101001) == [0, 3, 5]
+
+def test_neighbor_masks():
+    solver = PartitionSolver(6, 7)
+    # Corner (0, 0) touches (0, 1), (1, 0) and (1, 1)
+    assert iter_bits(solver.neighbor_masks[0]) == [1, 7, 8]
+    # Interior cells have all 8 neighbors
+    assert bin(solver.neighbor_masks[2 * 7 + 3]).count('1') == 8
+
+def test_subset_sums():
+    reachable = subset_sums((4, 5, 5))
+    assert [s for s in range(15) if reachable >> s & 1] == [0, 4, 5, 9, 10, 14]
+
+def test_free_regions_split_by_wall():
+    solver = PartitionSolver(6, 6)
+    wall = sum(1 << (r * 6 + 2) for r in range(6))  # column 2 fully occupied
+    regions = solver.free_regions(solver.full_mask & ~wall)
+    assert sorted(bin(region).count('1') for region in regions) == [12, 18]
+
+def test_regions_feasible_rejects_dead_pocket():
+    solver = PartitionSolver(6, 6)
+    # Occupy (0, 2), (1, 0), (1, 1), (1, 2): cells (0, 0), (0, 1) become a 2-cell pocket
+    occupied = (1 << 2) | (1 << 6) | (1 << 7) | (1 << 8)
+    free = solver.full_mask & ~occupied
+    assert not solver.regions_feasible(free, subset_sums((4, 5, 5, 18)))
+    assert solver.regions_feasible(free, subset_sums((2, 5, 5, 20)))
+
+def test_solve_partitions_whole_board():
+    solver = PartitionSolver(6, 7)
+    lengths = [12, 5, 7, 6, 4, 8]  # sum = 42
+    paths = solver.solve(lengths)
+    assert paths is not None
+
+    covered = 0
+    for path, length in zip(paths, lengths):
+        assert len(path) == length
+        for prev, cell in zip(path, path[1:]):
+            assert solver.neighbor_masks[prev] >> cell & 1, "Paths must be contiguous"
+        for cell in path:
+            assert not covered >> cell & 1, "Paths should not overlap"
+            covered |= 1 << cell
+    assert covered == solver.full_mask
+
+def test_solve_rejects_wrong_total():
+    solver = PartitionSolver(6, 6)
+    with pytest.raises(ValueError):
+        solver.solve([10, 10])
+
+def test_to_board():
+    solver = PartitionSolver(6, 6)
+    paths = [list(range(0, 18)), list(range(18, 36))]
+    board, placement_info = solver.to_board(paths)
+    assert board[0][0] == 1
+    assert board[5][5] == 2
+    assert placement_info['paths'][1][0] == (3, 0)
+
+def test_constrained_ordering_solves_large_board():
+    solver = PartitionSolver(10, 10)
+    lengths = [15, 8, 8, 8, 8, 8, 8, 7, 7, 7, 6, 10]  # sum = 100
+    paths = solver.solve(lengths, 'constrained')
+    assert paths is not None
+    assert sorted(cell for path in paths for cell in path) == list(range(100))
+
+def test_solve_rejects_unknown_ordering():
+    solver = PartitionSolver(6, 6)
+    with pytest.raises(ValueError):
+        solver.solve([18, 18], 'alphabetical')
+
+def test_luby_sequence():
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+def test_solve_restarts_with_tiny_node_budget():
+    solver = PartitionSolver(10, 10)
+    lengths = [15, 8, 8, 8, 8, 8, 8, 7, 7, 7, 6, 10]
+    # Far too few nodes for one attempt, so later Luby attempts have to finish it
+    paths = solver.solve(lengths, 'random', node_budget=10, time_limit=30)
+    assert sorted(cell for path in paths for cell in path) == list(range(100))
+
+def test_solve_raises_timeout_after_deadline():
+    solver = PartitionSolver(10, 10)
+    with pytest.raises(SolverTimeout):
+        solver.solve([15, 8, 8, 8, 8, 8, 8, 7, 7, 7, 6, 10], time_limit=-1)
+
+def test_solve_counts_nodes_and_attempts():
+    solver = PartitionSolver(10, 10)
+    lengths = [15, 8, 8, 8, 8, 8, 8, 7, 7, 7, 6, 10]
+    stats = SolveStats()
+    solver.solve(lengths, 'random', node_budget=10, time_limit=30, rng=random.Random(3), stats=stats)
+    # Every attempt but the last ran out of its budget
+    assert stats.attempts > 1
+    assert stats.nodes >= 100 + 10 * sum(luby(i) for i in range(1, stats.attempts))
+
+    assert stats.restarts == stats.attempts - 1
+    assert stats.max_depth == 100
+    assert len(stats.backtracks) == len(lengths) and sum(stats.backtracks) > 0
+
+    again = SolveStats()
+    solver.solve(lengths, 'random', node_budget=10, time_limit=30, rng=random.Random(3), stats=again)
+    assert again.to_dict() == stats.to_dict()
+
+def test_solve_stats_merge():
+    stats = SolveStats()
+    stats.merge({'nodes': 40, 'attempts': 2, 'restarts': 1, 'backtracks': [3, 0], 'max_depth': 30,
+                 'phase_ms': {'partition': 2.0}, 'sources': {'solve': 1}})
+    stats.merge({'nodes': 36, 'attempts': 1, 'restarts': 0, 'backtracks': [1, 2, 5], 'max_depth': 36,
+                 'phase_ms': {'partition': 1.0, 'fill': 0.5}, 'sources': {'solve': 1, 'cache': 1}})
+    assert stats.to_dict() == {'nodes': 76, 'attempts': 3, 'restarts': 1, 'backtracks': [4, 2, 5],
+                               'max_depth': 36, 'phase_ms': {'partition': 3.0, 'fill': 0.5},
+                               'sources': {'solve': 2, 'cache': 1}}
+
+def spans(solver, path):
+    rows = {solver.cells[cell][0] for cell in path}
+    cols = {solver.cells[cell][1] for cell in path}
+    return {0, solver.rows - 1} <= rows or {0, solver.cols - 1} <= cols
+
+def test_span_path_runs_edge_to_edge():
+    solver = PartitionSolver(8, 10)
+    lengths = [5, 7, 12, 8, 6, 7, 6, 5, 8, 8, 8]  # sum = 80
+    for _ in range(20):
+        paths = solver.solve(lengths, 'constrained', span=2)
+        assert spans(solver, paths[2])
+        assert sorted(cell for path in paths for cell in path) == list(range(80))
+
+def test_span_starts_need_enough_length():
+    solver = PartitionSolver(6, 8)
+    # 6 cells reach from the top row to the bottom one but not across 8 columns
+    starts = solver.span_starts(6)
+    assert starts & solver.edges[0] == solver.edges[0]
+    assert not starts & solver.edges[2] & ~solver.edges[0] & ~solver.edges[1]
+    assert solver.solve([5] + [43], span=0) is None
@@ -0,0 +1,74 @@
+import base64
+import random
+import pytest
+from app.game.board_generator import BoardGenerator
+from app.game.puzzle_id import decode_puzzle_id, encode_puzzle_id
+
+WORDS = ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']
+
+def test_round_trip():
+    puzzle_id = encode_puzzle_id('clockworks', WORDS, 2**32 - 1, (6, 6), 'Time for a change')
+    puzzle = decode_puzzle_id(puzzle_id)
+    assert puzzle.special_word == 'clockworks'
+    assert puzzle.words == WORDS
+    assert puzzle.seed == 2**32 - 1
+    assert puzzle.shape == (6, 6)
+    assert puzzle.theme == 'Time for a change'
+    # 36 letters pack into 23 bytes, the whole ID stays short
+    assert len(encode_puzzle_id('clockworks', WORDS, 7, (6, 6))) <= 48
+
+def test_spangram_flag_round_trips():
+    assert not decode_puzzle_id(encode_puzzle_id('clockworks', WORDS, 1, (6, 6))).spangram
+    assert decode_puzzle_id(encode_puzzle_id('clockworks', WORDS, 1, (6, 6), spangram=True)).spangram
+
+def test_decodes_version_1_ids():
+    # Version 1 IDs have no flags byte
+    data = bytearray(base64.urlsafe_b64decode(encode_puzzle_id('clockworks', WORDS, 5, (6, 6), 'Clocks') + '=='))
+    data[0] = 1
+    del data[2]
+    puzzle = decode_puzzle_id(base64.urlsafe_b64encode(bytes(data)).rstrip(b'=').decode('ascii'))
+    assert puzzle == ('clockworks', WORDS, 5, (6, 6), 'Clocks', False)
+
+def test_rejects_unencodable_and_malformed():
+    with pytest.raises(ValueError):
+        encode_puzzle_id('Clock Works', WORDS, 1, (6, 6))
+    with pytest.raises(ValueError):
+        decode_puzzle_id('not-a-puzzle')
+    puzzle_id = encode_puzzle_id('clockworks', WORDS, 1, (6, 6))
+    with pytest.raises(ValueError):
+        decode_puzzle_id(puzzle_id[:10])
+
+def test_same_seed_same_board():
+    generator = BoardGenerator()
+    first = generator.generate_board('clockworks', WORDS, rng=random.Random(42))
+    random.random()
+    second = generator.generate_board('clockworks', WORDS, rng=random.Random(42))
+    assert first == second
+    assert first != generator.generate_board('clockworks', WORDS, rng=random.Random(43))
+
+def test_seeded_board_on_transposed_shape():
+    generator = BoardGenerator()
+    words = ['marjoram', 'mint', 'basil', 'rosemary', 'thyme', 'parsley']
+    board, _ = generator.generate_board('gardenherbs', words, rng=random.Random(1), shape=(6, 8))
+    assert (len(board), len(board[0])) == (6, 8)
+    board, _ = generator.generate_board('gardenherbs', words, rng=random.Random(1), shape=(8, 6))
+    assert (len(board), len(board[0])) == (8, 6)
+    with pytest.raises(ValueError):
+        generator.generate_board('gardenherbs', words, rng=random.Random(1), shape=(7, 7))
+
+def test_generated_puzzle_id_replays(client, monkeypatch, stub_word_generator):
+    from app.routes import game
+    monkeypatch.setattr(game, "PUZZLE_IDS", True)
+    generated = client.post("/api/game/generate", json={}, headers={"Authorization": "Bearer test-key"}).json()
+    assert generated['puzzle_id']
+
+    replayed = client.get(f"/api/game/puzzle/{generated['puzzle_id']}")
+    assert replayed.status_code == 200
+    assert replayed.json() == generated
+    assert client.get("/api/game/puzzle/garbage").status_code == 400
+
+def test_replay_rejects_other_spangram_setting(client):
+    puzzle_id = encode_puzzle_id('clockworks', WORDS, 1, (6, 6), spangram=True)
+    response = client.get(f"/api/game/puzzle/{puzzle_id}")
+    assert response.status_code == 422
+    assert "SPANGRAM" in response.json()['detail']
@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor
+import threading
+import pytest
+from app.game.board_generator import BoardGenerator
+from app.game.partition_solver import PartitionSolver, SolverCancelled
+from app.game.racing import BoardRacer
+
+def test_solve_stops_when_event_is_set():
+    stop = threading.Event()
+    stop.set()
+    with pytest.raises(SolverCancelled):
+        PartitionSolver(10, 10).solve([15, 8, 8, 8, 8, 8, 8, 7, 7, 7, 6, 10], stop=stop)
+
+def test_shapes_for_includes_transpose():
+    generator = BoardGenerator()
+    assert generator.shapes_for(36) == [(6, 6)]
+    assert generator.shapes_for(42) == [(6, 7), (7, 6)]
+
+def test_race_returns_valid_partition():
+    generator = BoardGenerator()
+    lengths = [13, 5, 5, 5, 4, 4, 6]  # sum = 42
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        racer = BoardRacer(executor, generator, racers=4, allow_alternative_shapes=True)
+        try:
+            board, placement_info = racer.race(lengths)
+        finally:
+            racer.close()
+
+    assert (len(board), len(board[0])) in [(6, 7), (7, 6)]
+    assert [len(path) for path in placement_info['paths']] == lengths
+    for idx, path in enumerate(placement_info['paths']):
+        for (r, c) in path:
+            assert board[r][c] == idx + 1
+
+def test_concurrent_races_share_one_manager(monkeypatch):
+    from app.game import racing
+    started = []
+
+    class SlowManager:
+        def __init__(self):
+            started.append(self)
+            threading.Event().wait(0.05)
+
+        def Event(self):
+            return threading.Event()
+
+        def shutdown(self):
+            pass
+
+    monkeypatch.setattr(racing.multiprocessing, 'Manager', SlowManager)
+    racer = BoardRacer(None, BoardGenerator(), racers=2)
+    threads = [threading.Thread(target=racer._stop_event) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    racer.close()
+    assert len(started) == 1
+
+def test_solve_board_samples_atlas_before_racing(monkeypatch):
+    import asyncio
+    from types import SimpleNamespace
+    from app.game.partition_solver import SolveStats
+    from app.routes import game
+
+    words = ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']
+    lengths = [10] + [len(word) for word in words]
+    solved = BoardGenerator().generate_board_with_lengths(lengths)
+
+    class StubAtlas:
+        def sample(self, lengths):
+            return solved
+
+    class FailingRacer:
+        async def arace(self, lengths):
+            raise AssertionError("raced an atlas hit")
+
+    monkeypatch.setattr(game.board_generator, 'atlas', StubAtlas())
+    app = SimpleNamespace(state=SimpleNamespace(partition_cache=None, board_racer=FailingRacer()))
+    stats = SolveStats()
+    _, placement_info = asyncio.run(game.solve_board(app, 'clockworks', words, stats=stats))
+    assert placement_info['special_word']['path'] == solved[1]['paths'][0]
+    assert stats.sources == {'atlas': 1}
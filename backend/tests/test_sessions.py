@@ -0,0 +1,67 @@
+import time
+from app.game.board_generator import BoardGenerator
+from app.game.sessions import SessionStore
+
+WORDS = ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']
+
+def make_game():
+    board, placement_info = BoardGenerator().generate_board('clockworks', WORDS)
+    return board, 'clockworks', WORDS, placement_info
+
+def test_guesses_match_forward_and_reverse_paths():
+    store = SessionStore()
+    board, special_word, words, placement_info = make_game()
+    session = store.get(store.create(board, special_word, words, placement_info))
+
+    path = placement_info['words'][0]['path']
+    result = session.guess(list(reversed(path)))
+    assert result['correct'] and result['word'] == 'gear' and not result['special']
+    assert session.guess(path)['already_found']
+    assert not session.guess(path[:-1])['correct']
+    assert not session.guess([(99, 0)])['correct']
+
+    session.guess(placement_info['special_word']['path'])
+    for entry in placement_info['words'][1:]:
+        result = session.guess(entry['path'])
+    assert result['complete']
+
+def test_ttl_and_lru_eviction(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    store = SessionStore(ttl=10.0, max_size=2)
+    game = make_game()
+    first, second = store.create(*game), store.create(*game)
+    now[0] = 5.0
+    assert store.get(first) is not None
+    store.create(*game)
+    assert store.get(second) is None and len(store) == 2
+    now[0] = 20.0
+    assert store.get(first) is None and len(store) == 0
+
+def test_session_game_hides_answers(client, stub_word_generator):
+    from app.routes import game
+
+    response = client.post("/api/game/generate", json={"session": True},
+                           headers={"Authorization": "Bearer test-key"})
+    data = response.json()
+    assert data['placement_info'] == {} and data['session_id']
+
+    # Take the "gear" path from the server-side session, since the response no longer has it
+    session = game.game_sessions.get(data['session_id'])
+    path = next(key for key, word in session.answers.items() if word == 'gear')
+    cells = [list(divmod(cell, session.cols)) for cell in path]
+    guess = client.post("/api/game/guess", json={"session_id": data['session_id'], "path": cells}).json()
+    assert guess['correct'] and guess['found'] == ['gear']
+    assert client.post("/api/game/guess", json={"session_id": "nope", "path": cells}).status_code == 404
+
+def test_session_game_has_no_puzzle_id_or_shared_copy(client, monkeypatch, stub_word_generator):
+    from app.routes import game
+    monkeypatch.setattr(game, "PUZZLE_IDS", True)
+    headers = {"Authorization": "Bearer test-key"}
+    data = client.post("/api/game/generate", json={"seed_word": "clocks", "session": True}, headers=headers).json()
+    assert data['placement_info'] == {} and data['puzzle_id'] is None
+
+    # A plain request for the same seed word gets a game of its own, not the session's
+    assert len(game.game_flights) == 0
+    plain = client.post("/api/game/generate", json={"seed_word": "clocks"}, headers=headers).json()
+    assert plain['puzzle_id'] is not None
@@ -0,0 +1,86 @@
+import asyncio
+import time
+import pytest
+from app.game.single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_run():
+    flights = SingleFlight(ttl=30.0)
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def run():
+        return await asyncio.gather(*(flights.do("music", work) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    # Served from the cache afterwards
+    assert asyncio.run(flights.do("music", work)) is results[0]
+    assert calls == 1
+
+def test_results_expire_and_failures_are_not_cached(monkeypatch):
+    flights = SingleFlight(ttl=5.0)
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    outcomes = [ValueError("bad completion"), "first", "second"]
+
+    async def work():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with pytest.raises(ValueError):
+        asyncio.run(flights.do("key", work))
+    assert asyncio.run(flights.do("key", work)) == "first"
+    now[0] += 4.0
+    assert asyncio.run(flights.do("key", work)) == "first"
+    now[0] += 2.0
+    assert asyncio.run(flights.do("key", work)) == "second"
+
+def test_size_bound_evicts_least_recently_used():
+    flights = SingleFlight(ttl=30.0, max_size=2)
+
+    async def value(v):
+        return v
+
+    async def run():
+        for key in ["a", "b", "a", "c"]:
+            await flights.do(key, lambda key=key: value(key))
+
+    asyncio.run(run())
+    assert len(flights) == 2
+    assert set(flights._results) == {"a", "c"}
+
+def test_cancelled_caller_does_not_cancel_others():
+    flights = SingleFlight(ttl=0)
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(flights.do("key", work))
+        second = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
+    assert len(flights) == 0
+
+def test_identical_seeded_requests_reuse_one_game(client, stub_word_generator):
+    headers = {"Authorization": "Bearer test-key"}
+    first = client.post("/api/game/generate", json={"seed_word": "Clocks"}, headers=headers)
+    second = client.post("/api/game/generate", json={"seed_word": "clocks "}, headers=headers)
+    other_key = client.post("/api/game/generate", json={"seed_word": "clocks"},
+                            headers={"Authorization": "Bearer other-key"})
+    unseeded = client.post("/api/game/generate", json={}, headers=headers)
+    assert first.json() == second.json()
+    assert other_key.status_code == unseeded.status_code == 200
+    assert stub_word_generator.seed_words == ["Clocks", "clocks", None]
@@ -0,0 +1,86 @@
+from app.game import worker_pool
+from app.game.board_generator import BoardGenerator
+from app.game.solver_metrics import SolverMetrics
+
+WORDS = ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']
+
+def stats(nodes, backtracks, restarts=0, ms=1.0, source='solve'):
+    return {'nodes': nodes, 'attempts': restarts + 1, 'restarts': restarts, 'backtracks': backtracks,
+            'max_depth': 36, 'phase_ms': {'partition': ms, 'letters': 0.1, 'fill': 0.1}, 'sources': {source: 1}}
+
+def test_records_by_length_profile():
+    metrics = SolverMetrics()
+    metrics.record([10, 4, 4, 5, 4, 5, 4], stats(40, [1, 0, 0, 2, 0, 0, 0]))
+    # Same profile, other word order
+    metrics.record([4, 5, 10, 4, 4, 5, 4], stats(60, [0, 3, 1, 0, 0, 0, 0], restarts=1))
+    metrics.record([12, 6, 6, 6, 6], stats(36, [0] * 5))
+
+    summary = metrics.summary()
+    assert summary['games'] == 3
+    assert summary['max_nodes'] == 60
+    assert summary['restarts'] == 1
+    worst = summary['profiles'][0]
+    assert worst['lengths'] == [10, 5, 5, 4, 4, 4, 4]
+    assert worst['games'] == 2 and worst['mean_nodes'] == 50 and worst['mean_restarts'] == 0.5
+    assert worst['backtracks_by_length'] == {'5': 5, '10': 2}
+    assert worst['mean_phase_ms'] == {'partition': 1.0, 'letters': 0.1, 'fill': 0.1}
+
+def test_cached_partitions_do_not_dilute_solver_counts():
+    metrics = SolverMetrics()
+    metrics.record([30, 6], stats(80, [2, 0], restarts=1))
+    metrics.record([30, 6], stats(0, [], source='cache'))
+    metrics.record([30, 6], stats(0, [], source='race', ms=5.0))
+
+    summary = metrics.summary()
+    assert (summary['games'], summary['solves']) == (3, 1)
+    assert summary['sources'] == {'solve': 1, 'cache': 1, 'race': 1}
+    assert summary['mean_nodes'] == 80
+    profile = summary['profiles'][0]
+    assert profile['mean_nodes'] == 80 and profile['mean_restarts'] == 1
+    # Wall time still counts every game
+    assert profile['mean_phase_ms']['partition'] == round(7.0 / 3, 3)
+
+def test_keeps_recent_profiles():
+    metrics = SolverMetrics(max_profiles=2)
+    for lengths in ([30, 6], [26, 10], [30, 6], [20, 16]):
+        metrics.record(lengths, stats(36, [0, 0]))
+    assert len(metrics) == 2
+    assert {tuple(p['lengths']) for p in metrics.summary()['profiles']} == {(30, 6), (20, 16)}
+
+def test_sort_and_limit():
+    metrics = SolverMetrics()
+    metrics.record([30, 6], stats(36, [0, 0], ms=9.0))
+    metrics.record([26, 10], stats(90, [4, 0], ms=1.0))
+    assert [p['lengths'] for p in metrics.summary('max_ms', limit=1)['profiles']] == [[30, 6]]
+    assert [p['lengths'] for p in metrics.summary('mean_nodes')['profiles']] == [[26, 10], [30, 6]]
+
+def test_generate_returns_stats_on_request(client, stub_word_generator):
+    headers = {"Authorization": "Bearer test-key"}
+
+    data = client.post("/api/game/generate", json={'stats': True}, headers=headers).json()
+    assert data['stats']['nodes'] >= 36
+    assert data['stats']['sources'] == {'solve': 1}
+    assert set(data['stats']['phase_ms']) == {'partition', 'letters', 'fill'}
+    assert len(data['stats']['backtracks']) == 7
+
+    assert client.post("/api/game/generate", json={}, headers=headers).json()['stats'] is None
+
+def test_pool_worker_returns_stats():
+    worker_pool._init_worker(BoardGenerator())
+    board, placement_info, stats = worker_pool.generate_board_with_stats('clockworks', WORDS, seed=5)
+    assert (board, placement_info) == worker_pool.generate_board('clockworks', WORDS, seed=5)
+    assert stats['nodes'] >= 36
+
+def test_stats_endpoint_aggregates_games(client, monkeypatch, stub_word_generator):
+    from app.routes import game
+    monkeypatch.setattr(game, "SOLVER_STATS", True)
+    monkeypatch.setattr(game, "solver_metrics", SolverMetrics())
+    headers = {"Authorization": "Bearer test-key"}
+    for _ in range(2):
+        client.post("/api/game/generate", json={}, headers=headers)
+
+    data = client.get("/api/game/stats").json()
+    assert data['enabled'] and data['games'] == 2
+    assert data['solves'] == data['sources'].get('solve', 0)
+    assert data['profiles'][0]['lengths'] == [10, 5, 5, 4, 4, 4, 4]
+    assert client.get("/api/game/stats?sort=bogus").status_code == 400
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from app.game.stream_parser import IncrementalResponseParser
+
+VALID_SIZES = {36, 42, 48, 49, 54, 56, 60, 63, 64, 70, 72, 77, 80, 81, 90, 100}
+
+def feed_all(parser, text, chunk_size=7):
+    for i in range(0, len(text), chunk_size):
+        if parser.feed(text[i:i + chunk_size]):
+            return True
+    return False
+
+def test_stops_after_valid_words_line():
+    parser = IncrementalResponseParser(VALID_SIZES)
+    text = ("Theme: Time for a change\nSpecial Word: clockworks\n"
+            "Words: gear, dial, hands, tick, chime, wind\nAlternates: alarm\n[Total: 36 letters]\n")
+    assert feed_all(parser, text)
+    assert parser.words == ["gear", "dial", "hands", "tick", "chime", "wind"]
+    assert "Alternates" not in parser.text
+
+def test_waits_for_alternates_when_total_is_invalid():
+    parser = IncrementalResponseParser(VALID_SIZES)
+    text = ("Theme: Time for a change\nSpecial Word: clockworks\n"
+            "Words: gear, dial, hands, tick, chime, wind, bells\nAlternates: alarm\nmore text\n")
+    assert feed_all(parser, text)
+    assert parser.text.rstrip().endswith("Alternates: alarm")
+
+def test_spanning_waits_for_alternates_when_board_is_too_wide():
+    from app.game.board_generator import BoardGenerator
+    parser = IncrementalResponseParser(VALID_SIZES,
+                                       min_special_lengths=BoardGenerator(spangram=True).min_special_lengths())
+    # 81 letters is a 9x9 board, which an 8-letter special word cannot span
+    text = ("Theme: Keeping time\nSpecial Word: pendulum\n"
+            "Words: grandfather, cuckooclock, chronometer, hourglasses, timepieces, stopwatch, wristwatch\n"
+            "Alternates: alarm\nmore text\n")
+    assert feed_all(parser, text)
+    assert 81 not in parser.valid_sizes
+    assert parser.text.rstrip().endswith("Alternates: alarm")
+
+def test_aborts_on_short_special_word():
+    parser = IncrementalResponseParser(VALID_SIZES)
+    with pytest.raises(ValueError, match="too short"):
+        feed_all(parser, "Theme: Clocks\nSpecial Word: clock\nWords: gear")
+
+def test_aborts_when_total_cannot_reach_valid_size():
+    parser = IncrementalResponseParser(VALID_SIZES)
+    long_words = ", ".join(["pneumonoultramicroscopic"] * 5)
+    with pytest.raises(ValueError, match="can no longer reach"):
+        # The Words: line is still unfinished when the check fires
+        feed_all(parser, f"Theme: Long\nSpecial Word: clockworks\nWords: {long_words}, more")
+
+def test_streamed_word_set_stops_reading_early(llm_server):
+    from anthropic import AsyncAnthropic
+    from app.game.client_pool import AsyncClientPool
+    from app.game.word_generator import AnthropicWordGenerator
+
+    llm_server.stream_delay = 0.02
+    llm_server.completions = ["Theme: Time for a change\nSpecial Word: clockworks\n"
+                              "Words: gear, dial, hands, tick, chime, wind\n" + "[padding]\n" * 20]
+
+    async def run():
+        pool = AsyncClientPool(lambda api_key: AsyncAnthropic(api_key=api_key))
+        generator = AnthropicWordGenerator(api_key="test-key", client_pool=pool)
+        result = await generator.agenerate_word_set(stream=True)
+        await pool.aclose()
+        return result
+
+    result = asyncio.run(run())
+    assert result['special_word'] == "clockworks"
+    assert llm_server.requests[0]["stream"] is True
+    assert llm_server.events_sent < 10
@@ -0,0 +1,42 @@
+from app.game.board_generator import BoardGenerator
+from app.game.symmetry import SYMMETRIES, solution_variants, symmetries_for, transform_solution
+
+def assert_valid_solution(board, placement_info):
+    rows, cols = len(board), len(board[0])
+    seen = set()
+    for idx, path in enumerate(placement_info['paths']):
+        for (r, c), (nr, nc) in zip(path, path[1:]):
+            assert max(abs(r - nr), abs(c - nc)) == 1, "Paths must stay contiguous"
+        for (r, c) in path:
+            assert 0 <= r < rows and 0 <= c < cols
+            assert board[r][c] == idx + 1
+            seen.add((r, c))
+    assert len(seen) == rows * cols
+
+def test_symmetry_counts():
+    assert len(symmetries_for(8, 8)) == 8
+    assert len(symmetries_for(6, 9)) == 4
+
+def test_square_variants_are_valid_and_distinct():
+    board, placement_info = BoardGenerator().generate_board_with_lengths([14, 12, 10])
+    variants = list(solution_variants(board, placement_info))
+    assert len(variants) == 8
+    for variant in variants:
+        assert_valid_solution(*variant)
+    assert len({str(variant_board) for variant_board, _ in variants}) == 8
+
+def test_rectangular_variants_keep_shape():
+    board, placement_info = BoardGenerator().generate_board_with_lengths([15, 15, 12])  # 6x7
+    variants = list(solution_variants(board, placement_info))
+    assert len(variants) == 4
+    for variant_board, variant_info in variants:
+        assert len(variant_board) == 6 and len(variant_board[0]) == 7
+        assert_valid_solution(variant_board, variant_info)
+
+def test_letter_board_transform_keeps_words():
+    words = ["clockworks", "gear", "dial", "hands", "tick", "chime", "wind"]
+    board, placement_info = BoardGenerator().generate_board(words[0], words[1:])
+    for symmetry in SYMMETRIES:
+        new_board, new_info = transform_solution(board, placement_info, symmetry)
+        for entry in [new_info['special_word']] + new_info['words']:
+            assert "".join(new_board[r][c] for r, c in entry['path']) == entry['word']
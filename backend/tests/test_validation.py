@@ -0,0 +1,65 @@
+import copy
+import random
+from app.game.board_generator import BoardGenerator
+from app.game.validation import validate_boards, validate_layouts
+
+WORDS = ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']
+
+def make_boards(count):
+    generator = BoardGenerator()
+    return [generator.generate_board('clockworks', WORDS, rng=random.Random(seed)) for seed in range(count)]
+
+def test_generated_boards_are_valid():
+    boards, placements = zip(*make_boards(5))
+    result = validate_boards(boards, placements)
+    assert result.valid.all()
+    assert [result.errors(i) for i in range(5)] == [[]] * 5
+
+def test_each_check_catches_its_fault():
+    boards, placements = map(list, zip(*make_boards(5)))
+    boards = copy.deepcopy(boards)
+    placements = copy.deepcopy(placements)
+
+    # 1: a wrong letter on the special word's path
+    r, c = placements[1]['special_word']['path'][0]
+    boards[1][r][c] = 'z' if boards[1][r][c] != 'z' else 'y'
+    # 2: two paths share a cell, so another cell is on none
+    placements[2]['words'][0]['path'][0] = placements[2]['words'][1]['path'][0]
+    # 3: a path jumps across the board, also leaving a cell uncovered
+    path = placements[3]['words'][0]['path']
+    path[-1] = (path[-2][0], path[-2][1] + 2) if path[-2][1] + 2 < 6 else (path[-2][0], path[-2][1] - 2)
+    # 4: ragged rows
+    boards[4][0] = boards[4][0][:-1]
+
+    result = validate_boards(boards, placements)
+    assert result.errors(0) == []
+    assert result.errors(1) == ['letters']
+    assert 'coverage' in result.errors(2)
+    assert 'contiguity' in result.errors(3)
+    assert result.errors(4) == ['shape', 'coverage', 'contiguity', 'letters']
+
+def test_path_length_must_match_word():
+    board, placement_info = copy.deepcopy(make_boards(1)[0])
+    placement_info['words'][0]['word'] = 'gears'
+    assert validate_boards([board], [placement_info]).errors(0) == ['letters']
+
+def test_json_paths_and_uppercase_letters():
+    board, placement_info = make_boards(1)[0]
+    board = [[letter.upper() for letter in row] for row in board]
+    placement_info = {
+        'special_word': {'word': 'CLOCKWORKS', 'path': [list(cell) for cell in placement_info['special_word']['path']]},
+        'words': [{'word': entry['word'], 'path': [list(cell) for cell in entry['path']]}
+                  for entry in placement_info['words']]
+    }
+    assert validate_boards([board], [placement_info]).valid.all()
+
+def test_layouts_mixed_shapes():
+    generator = BoardGenerator()
+    lengths = [[10, 15, 11], [20, 12, 10, 6], [8, 8, 8, 8, 8, 8]]
+    layouts, placements = zip(*(generator.generate_board_with_lengths(profile, rng=random.Random(1))
+                                for profile in lengths))
+    assert validate_layouts(layouts, placements, lengths).valid.all()
+
+    wrong = [[10, 15, 11], [20, 12, 10, 6], [8, 8, 8, 8, 8, 9]]
+    assert validate_layouts(layouts, placements, wrong).errors(2) == ['letters']
+    assert validate_layouts(layouts, placements, wrong).valid.tolist() == [True, True, False]
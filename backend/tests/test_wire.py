@@ -0,0 +1,36 @@
+import json
+from app.game.board_generator import BoardGenerator
+from app.game.wire import COMPACT_MEDIA_TYPE, compact_game, expand_game, wants_compact
+
+WORDS = ['gear', 'dial', 'hands', 'tick', 'chime', 'wind']
+
+def test_compact_round_trip_is_smaller():
+    board, placement_info = BoardGenerator().generate_board('clockworks', WORDS)
+    game = {'theme': 'Time for a change', 'special_word': 'clockworks', 'words': WORDS,
+            'board': board, 'placement_info': placement_info}
+    compact = compact_game(**game)
+    assert len(compact['board']) == 36
+    assert json.loads(json.dumps(expand_game(compact))) == json.loads(json.dumps(game))
+    assert len(json.dumps(compact)) < len(json.dumps(game)) * 0.6
+
+def test_negotiation():
+    assert wants_compact('compact', None)
+    assert not wants_compact('json', COMPACT_MEDIA_TYPE)
+    assert wants_compact(None, f"{COMPACT_MEDIA_TYPE}, application/json")
+    assert not wants_compact(None, "application/json")
+
+def test_generate_returns_compact_on_request(client, stub_word_generator):
+    headers = {"Authorization": "Bearer test-key"}
+    response = client.post("/api/game/generate?format=compact", json={}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith(COMPACT_MEDIA_TYPE)
+    data = response.json()
+    assert data['format'] == 'compact' and (data['rows'], data['cols']) == (6, 6)
+    assert expand_game(data)['placement_info']['special_word']['word'] == 'clockworks'
+
+    response = client.post("/api/game/generate", json={}, headers={**headers, "Accept": COMPACT_MEDIA_TYPE})
+    assert response.json()['format'] == 'compact'
+    assert response.headers['vary'] == 'Accept'
+    default = client.post("/api/game/generate", json={}, headers=headers)
+    assert 'format' not in default.json()
+    assert default.headers['vary'] == 'Accept'
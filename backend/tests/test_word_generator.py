@@ -1,6 +1,7 @@
 import pytest
 import os
-from app.game.word_generator import WordGenerator
+import asyncio
+from app.game.word_generator import WordGenerator, BaseWordGenerator
 
 @pytest.mark.usefixtures("requires_openai")
 def test_word_generator_initialization():
@@ -23,4 +24,49 @@ def test_generate_theme_words():
     assert len(words) > 0
     for word in words:
         assert isinstance(word, str)
-        assert len(word) > 0 
\ No newline at end of file
+        assert len(word) > 0
+
+class ScriptedGenerator(BaseWordGenerator):
+    """Offline generator whose completions arrive after scripted delays."""
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self.cancelled = 0
+
+    def generate_completion(self, prompt):
+        raise NotImplementedError
+
+    async def agenerate_completion(self, prompt):
+        delay, response = self.script.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return response
+
+VALID_RESPONSE = """Theme: Time for a change
+Special Word: clockworks
+Words: gear, dial, hands, tick, chime, wind"""
+
+def test_fanout_returns_first_valid_and_cancels_rest():
+    generator = ScriptedGenerator([
+        (0.0, "Theme: Broken\nWords: nope"),
+        (0.01, VALID_RESPONSE),
+        (5.0, VALID_RESPONSE),
+    ])
+    result = asyncio.run(generator.agenerate_word_set("clocks", fanout=3))
+    assert result['special_word'] == "clockworks"
+    assert generator.cancelled == 1
+
+def test_raises_when_every_total_is_invalid():
+    # 10 + 10 letters, too short for any board and too few words to repair
+    short = "Theme: Clocks\nSpecial Word: clockworks\nWords: gear, dial, hands, tick, x"
+    generator = ScriptedGenerator([(0.0, short)] * 5)
+    with pytest.raises(Exception, match="after 5 attempts: no completion had a valid letter total"):
+        asyncio.run(generator.agenerate_word_set())
+
+def test_fanout_raises_when_every_wave_fails():
+    generator = ScriptedGenerator([(0.0, "Theme: Broken")] * 6)
+    with pytest.raises(Exception, match="after 6 attempts"):
+        asyncio.run(generator.agenerate_word_set(fanout=3))
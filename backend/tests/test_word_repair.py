@@ -0,0 +1,64 @@
+from app.game.word_repair import repair_word_set
+
+VALID_SIZES = {36, 42, 48, 49, 54, 56, 60, 63, 64, 70, 72, 77, 80, 81, 90, 100}
+
+def total_letters(special_word, words):
+    return len(special_word) + sum(len(word) for word in words)
+
+def test_drops_one_word():
+    # clockworks (10) + 31 letters = 41; dropping one 5-letter word gives 36
+    words = ["gear", "dial", "hands", "tick", "chime", "wind", "bells"]
+    repaired = repair_word_set("clockworks", words, VALID_SIZES)
+    assert total_letters("clockworks", repaired) == 36
+    assert len(repaired) == 6
+    assert [word for word in words if word in repaired] == repaired
+
+def test_prefers_original_words():
+    # 10 + 36 = 46: keeping all seven needs +2, so one word is dropped instead
+    words = ["gear", "dial", "hands", "tick", "chime", "wind", "springs"]
+    repaired = repair_word_set("clockworks", words, VALID_SIZES, alternates=["go"])
+    assert total_letters("clockworks", repaired) in VALID_SIZES
+    assert "go" not in repaired
+
+def test_uses_alternate_when_dropping_is_not_enough():
+    # 10 + 25 = 35 with six words: only swapping in an alternate reaches a valid size
+    words = ["gear", "dial", "hands", "tick", "chime", "win"]
+    repaired = repair_word_set("clockworks", words, VALID_SIZES, alternates=["pendulum", "alarm"])
+    assert total_letters("clockworks", repaired) in VALID_SIZES
+    assert 5 <= len(repaired) <= 7
+    assert len(set(words) & set(repaired)) == 5
+
+def test_keeps_word_count_bounds():
+    repaired = repair_word_set("clockworks", ["gear", "dial", "hands", "tick", "chime"], {100})
+    assert repaired is None
+
+def test_parse_and_repair_response():
+    from app.game.word_generator import BaseWordGenerator
+
+    class OfflineGenerator(BaseWordGenerator):
+        def generate_completion(self, prompt):
+            return ("Theme: Time for a change\n"
+                    "Special Word: clockworks\n"
+                    "Words: gear, dial, hands, tick, chime, wind, bells\n"
+                    "Alternates: alarm, pendulum")
+
+    result = OfflineGenerator().generate_word_set()
+    assert 'alternates' not in result
+    assert len(result['special_word']) + sum(len(word) for word in result['words']) == 36
+
+def test_spanning_special_word_limits_sizes():
+    from app.game.board_generator import BoardGenerator
+    from app.game.word_generator import BaseWordGenerator
+
+    class OfflineGenerator(BaseWordGenerator):
+        def generate_completion(self, prompt):
+            # pendulum (8) + 73 = 81, a 9x9 board an 8-letter path cannot span
+            return ("Theme: Keeping time\n"
+                    "Special Word: pendulum\n"
+                    "Words: grandfather, cuckooclock, chronometer, hourglasses, timepieces, stopwatch, wristwatch\n")
+
+    assert total_letters("pendulum", OfflineGenerator().generate_word_set()['words']) == 81
+    generator = OfflineGenerator(BoardGenerator(spangram=True).min_special_lengths())
+    assert 81 not in generator.sizes_for("pendulum") and 72 in generator.sizes_for("pendulum")
+    result = generator.generate_word_set()
+    assert total_letters("pendulum", result['words']) in generator.sizes_for("pendulum")
@@ -11,6 +11,7 @@ import {
     IconButton,
 } from '@chakra-ui/react';
 import { PlacementInfo } from '../types/game';
+import { submitGuess } from '../services/api';
 import { FaEye, FaEyeSlash } from 'react-icons/fa';
 
 interface GameBoardProps {
@@ -18,6 +19,7 @@ interface GameBoardProps {
     words: string[];
     special_word: string;
     placementInfo: PlacementInfo;
+    sessionId?: string;  // when set, guesses are checked by the server
 }
 
 type Position = [number, number];
@@ -27,6 +29,7 @@ export const GameBoard: React.FC<GameBoardProps> = ({
     words,
     special_word,
     placementInfo,
+    sessionId,
 }) => {
     const [selectedCells, setSelectedCells] = useState<Position[]>([]);
     const [foundWords, setFoundWords] = useState<Set<string>>(new Set());
@@ -81,7 +84,8 @@ export const GameBoard: React.FC<GameBoardProps> = ({
         setSelectedCells([...selectedCells, clickedPos]);
     };
 
-    const checkForWord = (cells: Position[]) => {
+    // The word a selected path spells, checked locally against placementInfo
+    const findLocalWord = (cells: Position[]): string | null => {
         const selectedWord = cells
             .map(([row, col]) => board[row][col])
             .join('');
@@ -100,11 +104,32 @@ export const GameBoard: React.FC<GameBoardProps> = ({
                 (pathStr === correctPathStr || pathStr === correctPathStr.split('|').reverse().join('|'))
             );
         });
+        return foundPlacement ? foundPlacement.word : null;
+    };
+
+    const checkForWord = async (cells: Position[]) => {
+        setSelectedCells([]);
 
-        if (foundPlacement && !foundWords.has(foundPlacement.word)) {
+        let word: string | null;
+        try {
+            word = sessionId
+                ? (await submitGuess(sessionId, cells)).word
+                : findLocalWord(cells);
+        } catch (error) {
+            toast({
+                title: 'Error',
+                description: error instanceof Error ? error.message : 'Failed to check guess',
+                status: 'error',
+                duration: 3000,
+                isClosable: true,
+            });
+            return;
+        }
+
+        if (word && !foundWords.has(word)) {
             // Mark word as found
             const newFoundWords = new Set(foundWords);
-            newFoundWords.add(foundPlacement.word);
+            newFoundWords.add(word);
             setFoundWords(newFoundWords);
 
             // Mark cells as found
@@ -114,15 +139,15 @@ export const GameBoard: React.FC<GameBoardProps> = ({
 
             toast({
                 title: 'Word Found!',
-                description: foundPlacement.word === special_word 
+                description: word === special_word 
                     ? 'Congratulations! You found the special word!' 
-                    : `You found "${foundPlacement.word}"!`,
+                    : `You found "${word}"!`,
                 status: 'success',
                 duration: 2000,
                 isClosable: true,
             });
 
-            if (newFoundWords.size === allPlacements.length) {
+            if (newFoundWords.size === words.length + 1) {
                 toast({
                     title: 'Congratulations!',
                     description: 'You found all the words!',
@@ -142,8 +167,6 @@ export const GameBoard: React.FC<GameBoardProps> = ({
                 });
             }
         }
-
-        setSelectedCells([]);
     };
 
     const getCellStyle = (row: number, col: number) => {
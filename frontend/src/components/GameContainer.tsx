@@ -73,6 +73,7 @@ const GameContainer: React.FC = () => {
                             words={gameState.words}
                             special_word={gameState.special_word}
                             placementInfo={gameState.placement_info}
+                            sessionId={gameState.session_id}
                         />
                     </VStack>
                 )}
@@ -1,8 +1,11 @@
 import axios from 'axios';
-import { GameState } from '../types/game';
+import { CompactGame, GameState, GuessResult, Position, decodeCompactGame } from '../types/game';
 
 const API_URL = 'http://localhost:8000/api';
 const ANTHROPIC_API_KEY = import.meta.env.VITE_ANTHROPIC_API_KEY;
+// Check guesses on the server (POST /game/guess), so answers never reach the browser.
+// Sessions live in one backend process, so only enable this against a single worker.
+const GAME_SESSIONS = import.meta.env.VITE_GAME_SESSIONS === 'true';
 
 export const generateGame = async (seedWord?: string): Promise<GameState> => {
     try {
@@ -10,14 +13,16 @@ export const generateGame = async (seedWord?: string): Promise<GameState> => {
             throw new Error('Anthropic API key is not configured');
         }
 
-        const response = await axios.post(`${API_URL}/game/generate`, {
-            seed_word: seedWord
+        const response = await axios.post<CompactGame>(`${API_URL}/game/generate`, {
+            seed_word: seedWord,
+            session: GAME_SESSIONS
         }, {
+            params: { format: 'compact' },
             headers: {
                 'Authorization': `Bearer ${ANTHROPIC_API_KEY}`
             }
         });
-        return response.data;
+        return decodeCompactGame(response.data);
     } catch (error) {
         if (axios.isAxiosError(error)) {
             const errorMessage = error.response?.data?.detail || 'Failed to generate game';
@@ -26,4 +31,21 @@ export const generateGame = async (seedWord?: string): Promise<GameState> => {
         }
         throw error;
     }
-}; 
\ No newline at end of file
+};
+
+export const submitGuess = async (sessionId: string, path: Position[]): Promise<GuessResult> => {
+    try {
+        const response = await axios.post<GuessResult>(`${API_URL}/game/guess`, {
+            session_id: sessionId,
+            path
+        });
+        return response.data;
+    } catch (error) {
+        if (axios.isAxiosError(error)) {
+            const errorMessage = error.response?.data?.detail || 'Failed to check guess';
+            console.error('Guess error:', errorMessage);
+            throw new Error(errorMessage);
+        }
+        throw error;
+    }
+};
@@ -16,4 +16,52 @@ export type GameState = {
     words: string[];
     board: string[][];
     placement_info: PlacementInfo;
-}; 
\ No newline at end of file
+    puzzle_id?: string;
+    session_id?: string;  // set for server-checked games, whose placement_info is empty
+};
+
+export type GuessResult = {
+    correct: boolean;
+    word: string | null;
+    special: boolean;
+    already_found: boolean;
+    found: string[];
+    complete: boolean;
+};
+
+// Compact wire format, requested with ?format=compact (see backend/app/game/wire.py)
+export type CompactGame = {
+    format: 'compact';
+    theme: string;
+    special_word: string;
+    words: string[];
+    rows: number;
+    cols: number;
+    board: string;       // row-major, one character per cell
+    paths: number[][];   // cell indices (row * cols + col), special word first
+    puzzle_id?: string;
+    session_id?: string;
+};
+
+export const decodeCompactGame = (game: CompactGame): GameState => {
+    const { rows, cols } = game;
+    const board: string[][] = [];
+    for (let r = 0; r < rows; r++) {
+        board.push(game.board.slice(r * cols, (r + 1) * cols).split(''));
+    }
+    const paths = game.paths.map((path) =>
+        path.map((cell): Position => [Math.floor(cell / cols), cell % cols])
+    );
+    return {
+        theme: game.theme,
+        special_word: game.special_word,
+        words: game.words,
+        board,
+        placement_info: paths.length ? {
+            special_word: { word: game.special_word, path: paths[0] },
+            words: game.words.map((word, i) => ({ word, path: paths[i + 1] })),
+        } : { special_word: { word: game.special_word, path: [] }, words: [] },
+        puzzle_id: game.puzzle_id,
+        session_id: game.session_id,
+    };
+};